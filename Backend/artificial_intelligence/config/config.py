@@ -63,6 +63,8 @@ class MediaConfig:
 class RuntimeConfig:
     enable_gpu: bool = False
     log_level: str = "INFO"
+    # 导入模型时生成并挂载 LOD 链（首次导入需要简化网格，默认关闭）
+    enable_lods: bool = False
 
 
 @dataclass(frozen=True)
@@ -72,6 +74,7 @@ class PathsConfig:
     frontend_dist: Path
     script_dir: Path
     autosave_dir: Path
+    cache_dir: Path
 
 
 @dataclass(frozen=True)
@@ -122,6 +125,7 @@ def _apply_env_overrides(data: Dict[str, Any]) -> None:
     overrides = {
         ("runtime", "enable_gpu"): os.getenv("CORONA_ENABLE_GPU"),
         ("runtime", "log_level"): os.getenv("CORONA_LOG_LEVEL"),
+        ("runtime", "enable_lods"): os.getenv("CORONA_ENABLE_LODS"),
         ("llm", "chat", "model"): os.getenv("CORONA_LLM_MODEL"),
         ("llm", "chat", "provider"): os.getenv("CORONA_LLM_PROVIDER"),
     }
@@ -132,7 +136,7 @@ def _apply_env_overrides(data: Dict[str, Any]) -> None:
         for part in path[:-1]:
             section = section.setdefault(part, {})
         key = path[-1]
-        if key == "enable_gpu":
+        if key in ("enable_gpu", "enable_lods"):
             section[key] = str(value).strip().lower() in {"1", "true", "yes", "on"}
         else:
             section[key] = value
@@ -232,12 +236,14 @@ def _build_app_config() -> AppConfig:
     backend_root = repo_root / "Backend"
     autosave_dir = repo_root / "autosave"
     autosave_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = repo_root / "cache"
     paths = PathsConfig(
         repo_root=repo_root,
         backend_root=backend_root,
         frontend_dist=repo_root / "Frontend" / "dist" / "index.html",
         script_dir=backend_root / "script",
         autosave_dir=autosave_dir,
+        cache_dir=cache_dir,
     )
 
     providers = _load_providers(raw.get("providers"))
@@ -262,6 +268,7 @@ def _build_app_config() -> AppConfig:
     runtime = RuntimeConfig(
         enable_gpu=_as_bool(runtime_data.get("enable_gpu"), False),
         log_level=str(runtime_data.get("log_level", "INFO")).upper(),
+        enable_lods=_as_bool(runtime_data.get("enable_lods"), False),
     )
 
     return AppConfig(
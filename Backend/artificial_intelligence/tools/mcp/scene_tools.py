@@ -10,10 +10,25 @@ if TYPE_CHECKING:
     from Backend.utils.scene_service import SceneApplicationService
 
 
+SceneQueryType = Literal["list_models", "get_model_by_name", "nearest_models", "models_in_range", "models_in_view"]
+
+
 class SceneQueryInput(BaseModel):
     scene_name: str = Field(default="MainScene", description="要查询的场景名称")
-    query: Literal["list_models", "get_model_by_name"] = Field(description="查询类型")
-    name: str | None = Field(default=None, description="当 query=get_model_by_name 时需要提供模型名")
+    query: SceneQueryType = Field(
+        description="查询类型：list_models 列出全部模型；get_model_by_name 按名称查找；"
+        "nearest_models 查找最近的 k 个模型；models_in_range 查找半径内的模型；models_in_view 查找相机视野内的模型",
+    )
+    name: str | None = Field(
+        default=None,
+        description="当 query=get_model_by_name 时需要提供模型名；nearest_models/models_in_range 时可作为查询中心",
+    )
+    position: Tuple[float, float, float] | None = Field(
+        default=None,
+        description="nearest_models/models_in_range 的查询中心坐标 (x,y,z)，未提供 name 时使用",
+    )
+    k: int = Field(default=1, ge=1, description="当 query=nearest_models 时返回的模型数量")
+    radius: float | None = Field(default=None, gt=0, description="当 query=models_in_range 时的查询半径")
 
 
 class TransformModelInput(BaseModel):
@@ -35,20 +50,31 @@ def _build_scene_query_tool(scene_service: "SceneApplicationService") -> Structu
     def _query_scene(
         *,
         scene_name: str = "MainScene",
-        query: Literal["list_models", "get_model_by_name"],
+        query: SceneQueryType,
         name: str | None = None,
+        position: Tuple[float, float, float] | None = None,
+        k: int = 1,
+        radius: float | None = None,
     ) -> str:
-        data = SceneQueryInput(scene_name=scene_name, query=query, name=name)
+        data = SceneQueryInput(scene_name=scene_name, query=query, name=name, position=position, k=k, radius=radius)
         scene = scene_service.scene_manager.get_scene(data.scene_name)
         if scene is None:
             return json.dumps({"scene": data.scene_name, "actors": []}, ensure_ascii=False)
 
         if data.query == "list_models":
             actors = [actor.name for actor in scene.get_actors()]
-            return json.dumps({"scene": data.scene_name, "actors": actors}, ensure_ascii=False)
+            batches = [{"name": batch.name, "count": batch.count} for batch in scene.get_batches()]
+            return json.dumps({"scene": data.scene_name, "actors": actors, "batches": batches}, ensure_ascii=False)
 
         if data.query == "get_model_by_name":
             actor = scene_service._find_actor(scene, data.name or "")
+            batch = scene.get_batch(data.name or "") if actor is None else None
+            if batch is not None:
+                return json.dumps(
+                    {"scene": data.scene_name, "batch": batch.name, "path": batch.path, "count": batch.count,
+                     "found": True},
+                    ensure_ascii=False,
+                )
             if actor is None:
                 return json.dumps(
                     {"scene": data.scene_name, "actor": None, "found": False},
@@ -59,11 +85,26 @@ def _build_scene_query_tool(scene_service: "SceneApplicationService") -> Structu
                 ensure_ascii=False,
             )
 
+        center = list(data.position) if data.position is not None else None
+        if data.query == "nearest_models":
+            actors = scene_service.nearest_actors(data.scene_name, actor_name=data.name, position=center, k=data.k)
+            return json.dumps({"scene": data.scene_name, "actors": actors}, ensure_ascii=False)
+
+        if data.query == "models_in_range":
+            if data.radius is None:
+                raise ValueError("models_in_range 查询需要提供 radius")
+            actors = scene_service.actors_in_range(data.scene_name, data.radius, actor_name=data.name, position=center)
+            return json.dumps({"scene": data.scene_name, "actors": actors}, ensure_ascii=False)
+
+        if data.query == "models_in_view":
+            actors = scene_service.actors_in_view(data.scene_name)
+            return json.dumps({"scene": data.scene_name, "actors": actors}, ensure_ascii=False)
+
         raise ValueError(f"Unsupported query type: {data.query}")
 
     return StructuredTool(
         name="scene_query",
-        description="查询场景中的模型，例如列出全部模型或按名称查找。",
+        description="查询场景中的模型，例如列出全部模型、按名称查找、查找最近/范围内/相机视野内的模型。",
         args_schema=SceneQueryInput,
         func=_query_scene,
     )
@@ -6,6 +6,7 @@ from .optics import Optics
 from .acoustics import Acoustics
 from .kinematics import Kinematics
 from .actor import Actor
+from .instance_batch import InstanceBatch
 from .camera import Camera
 from .environment import Environment
 from .viewport import Viewport
@@ -22,6 +23,7 @@ __all__ = [
     "Acoustics",
     "Kinematics",
     "Actor",
+    "InstanceBatch",
     "Camera",
     "Environment",
     "Viewport",
@@ -1,4 +1,4 @@
-﻿from typing import Any, Dict
+﻿from typing import Any, Dict, Tuple
 from .engine_import import load_corona_engine
 from .geometry import Geometry
 CoronaEngine = load_corona_engine()
@@ -13,10 +13,37 @@ class Acoustics:
         self.engine_obj = AcousticsCtor(geo_obj)
         self.name = name
         self.geometry = geometry
+        # 加入场景 SpatialAudio 后，音量为基础音量，实际推送值由听者距离衰减决定
+        self._audio = None
+        self._row = -1
+    def attach(self, audio: Any, row: int):
+        self._audio = audio
+        self._row = row
+    def detach(self):
+        self._audio = None
+        self._row = -1
+    @property
+    def is_spatial(self) -> bool:
+        return self._audio is not None
     def set_volume(self, volume: float):
+        if self._audio is not None:
+            self._audio.set_volume(self._row, volume)
+            return
         self.engine_obj.set_volume(volume)
     def get_volume(self) -> float:
+        if self._audio is not None:
+            return self._audio.get_volume(self._row)
         return self.engine_obj.get_volume()
+    def set_attenuation(self, ref_distance: float = 1.0, max_distance: float = 100.0, rolloff: float = 1.0):
+        """距离衰减参数：ref_distance 内不衰减，超过 max_distance 不再继续衰减"""
+        if self._audio is None:
+            raise RuntimeError('Acoustics 未加入空间音频，请先调用 Scene.add_audio_source')
+        self._audio.set_attenuation(self._row, ref_distance, max_distance, rolloff)
+    def get_effective(self) -> Tuple[float, float]:
+        """最近一帧推送给引擎的 (音量, 声像)"""
+        if self._audio is None:
+            return self.get_volume(), 0.0
+        return self._audio.effective(self._row)
     def to_dict(self) -> Dict[str, Any]:
         return {'name': self.name, 'engine_obj': self.engine_obj}
     def __repr__(self):
@@ -1,8 +1,11 @@
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List
 import os
+import sys
 
 from .geometry import Geometry
+from .obj_loader import MeshData
 from .mechanics import Mechanics
+from .acoustics import Acoustics
 from .kinematics import Kinematics
 from .optics import Optics
 from .engine_import import load_corona_engine
@@ -14,10 +17,26 @@ class Actor:
     """
     OOP API 包装：基于 CoronaEngine.Actor。
     - 构造可选传入模型路径：自动创建 Geometry + 默认组件，组装成 Profile 加入 Actor
+    - geometry_source：同一模型已加载的 Geometry，传入后新 Actor 共享其网格数据（实例化）
+    - mesh：同一模型已解析的 MeshData（引擎不支持实例化时由资源缓存共享），供包围盒/拾取等查询使用
     - move/rotate/scale 改为作用于 active profile 的 Geometry（不再调用原生的旧接口）
+    - LOD：每一级为额外的 Profile（独立 Geometry + Optics），set_lod 通过 set_active_profile 切换；
+      变换以基础 Geometry 为准，切换到 LOD 时同步到当前 LOD 的 Geometry
+    - 层级：get/set_position 等为相对父节点的局部变换；Geometry 中始终是世界变换。
+      无父节点时两者相同，直接写入 Geometry；有父节点时局部变换保存在 Actor 上，
+      由所属 Scene 的 SceneGraph 每帧批量计算世界变换后写回 Geometry
+    - 使用 __slots__（无实例 __dict__），名称与路径字符串驻留（sys.intern），大量 Actor 时降低 Python 侧内存
     """
 
-    def __init__(self, path: Optional[str] = None):
+    # 没有模型路径的 Actor 不设置 _geometry/_optics（hasattr 判断依赖于此）
+    __slots__ = (
+        'engine_obj', 'path', 'name', '_profile', '_lods', '_lod_level', 'lod_radius', 'materials',
+        '_transform_listeners', '_parent', '_children', '_local', '_kinematics', '_mechanics', '_acoustics',
+        '_geometry', '_optics', '__weakref__',
+    )
+
+    def __init__(self, path: Optional[str] = None, geometry_source: Optional[Geometry] = None,
+                 mesh: Optional[MeshData] = None):
         if CoronaEngine is None:
             raise RuntimeError("CoronaEngine 未初始化")
 
@@ -26,8 +45,25 @@ class Actor:
             raise RuntimeError("CoronaEngine 未提供 Actor 构造器")
 
         self.engine_obj = ActorCtor()
-        self.path = path or ""
-        self.name = os.path.basename(path) if path else "Actor"
+        self.path = sys.intern(os.fspath(path)) if path else ""
+        self.name = sys.intern(os.path.basename(self.path)) if path else "Actor"
+        self._profile = None
+        # ((Geometry, Optics, profile), ...)，下标 i 对应 LOD i+1；没有 LOD 的 Actor 共享空元组
+        self._lods: tuple = ()
+        self._lod_level = 0
+        self.lod_radius = 0.0
+        # 材质与纹理（ModelMaterials），由工厂在导入时挂载
+        self.materials = None
+        # 变换变化回调（空间索引等据此增量更新）
+        self._transform_listeners: List[Callable[["Actor"], None]] = []
+        # 层级关系（由 Scene.set_parent 维护）；有父节点时 _local 为局部 [位置, 旋转, 缩放]
+        self._parent: Optional["Actor"] = None
+        self._children: List["Actor"] = []
+        self._local: Optional[List[List[float]]] = None
+        # 动画 / 力学组件（首次访问 kinematics / mechanics 时创建）
+        self._kinematics: Optional[Kinematics] = None
+        self._mechanics: Optional[Mechanics] = None
+        self._acoustics: Optional[Acoustics] = None
 
         # 若提供了模型路径，则创建默认 Profile
         if path:
@@ -40,7 +76,7 @@ class Actor:
 
             # 使用包装类创建组件
             # 重要：必须保持对包装对象的引用，否则析构时会从 SharedDataHub 中移除
-            self._geometry = Geometry(path)
+            self._geometry = Geometry(path, source=geometry_source, mesh=mesh)
             self._optics = Optics(self._geometry)
             # 可选组件（按需创建）
             # self._mechanics = Mechanics(self._geometry)
@@ -58,55 +94,224 @@ class Actor:
             if stored is None:
                 raise RuntimeError("无法向 Actor 添加默认 Profile（几何/组件不一致）")
             self.engine_obj.set_active_profile(stored)
+            self._profile = stored
+
+    # ---- LOD ----
+    def add_lod(self, path: str, geometry_source: Optional[Geometry] = None,
+                mesh: Optional[MeshData] = None) -> Geometry:
+        """追加一级 LOD（按添加顺序为 1、2、...），返回该级的 Geometry；geometry_source / mesh 含义同构造参数"""
+        if self._profile is None:
+            raise RuntimeError("当前 Actor 没有默认 Profile，无法添加 LOD")
+        ActorProfile = getattr(CoronaEngine, 'ActorProfile', None)
+        geometry = Geometry(path, name=os.path.basename(path), source=geometry_source, mesh=mesh)
+        optics = Optics(geometry)
+        prof = ActorProfile()
+        prof.geometry = geometry.engine_obj
+        prof.optics = optics.engine_obj
+        stored = self.engine_obj.add_profile(prof)
+        if stored is None:
+            raise RuntimeError("无法向 Actor 添加 LOD Profile")
+        self._lods += ((geometry, optics, stored),)
+        return geometry
+
+    @property
+    def lod_count(self) -> int:
+        return len(self._lods)
+
+    @property
+    def lod_level(self) -> int:
+        return self._lod_level
+
+    def set_lod(self, level: int):
+        """切换 LOD 级别（0 为原始网格）"""
+        level = max(0, min(int(level), len(self._lods)))
+        if level == self._lod_level:
+            return
+        if level == 0:
+            self.engine_obj.set_active_profile(self._profile)
+        else:
+            self._sync_geometry(self._lods[level - 1][0])
+            self.engine_obj.set_active_profile(self._lods[level - 1][2])
+        self._lod_level = level
+
+    def _sync_geometry(self, geometry: Geometry):
+        geometry.set_position(self._geometry.get_position())
+        geometry.set_rotation(self._geometry.get_rotation())
+        geometry.set_scale(self._geometry.get_scale())
+
+    def _sync_lod(self):
+        if self._lod_level:
+            self._sync_geometry(self._lods[self._lod_level - 1][0])
+
+    # ---- 动画 ----
+    @property
+    def kinematics(self) -> Kinematics:
+        """动画组件：首次访问时创建并挂到默认 Profile，播放状态由共享动画时钟推进"""
+        if self._kinematics is None:
+            if not hasattr(self, '_geometry'):
+                raise RuntimeError("当前 Actor 没有 Geometry")
+            self._kinematics = Kinematics(self._geometry)
+            if self._profile is not None:
+                self._profile.kinematics = self._kinematics.engine_obj
+        return self._kinematics
+
+    @property
+    def mechanics(self) -> Mechanics:
+        """力学组件：首次访问时创建并挂到默认 Profile；刚体状态由 Scene.add_rigid_body 绑定的 PhysicsWorld 维护"""
+        if self._mechanics is None:
+            if not hasattr(self, '_geometry'):
+                raise RuntimeError("当前 Actor 没有 Geometry")
+            self._mechanics = Mechanics(self._geometry)
+            if self._profile is not None:
+                self._profile.mechanics = self._mechanics.engine_obj
+        return self._mechanics
+
+    @property
+    def acoustics(self) -> Acoustics:
+        """声学组件：首次访问时创建并挂到默认 Profile；Scene.add_audio_source 后按听者距离衰减"""
+        if self._acoustics is None:
+            if not hasattr(self, '_geometry'):
+                raise RuntimeError("当前 Actor 没有 Geometry")
+            self._acoustics = Acoustics(self._geometry)
+            if self._profile is not None:
+                self._profile.acoustics = self._acoustics.engine_obj
+        return self._acoustics
+
+    # ---- 对象池回收 ----
+    def reset_for_reuse(self):
+        """
+        归还对象池前重置运行时状态（调用方须先将其移出场景）：LOD 回到 0 级，动画暂停并回到 0 秒、速度恢复为 1，
+        清空变换监听，丢弃力学/声学组件（下次访问时重新创建）；变换由取出方重新设置
+        """
+        self.set_lod(0)
+        if self._kinematics is not None:
+            self._kinematics.stop_animation()
+            self._kinematics.seek(0.0)
+            self._kinematics.set_speed(1.0)
+        if self._mechanics is not None:
+            self._mechanics.detach()
+            self._mechanics = None
+            if self._profile is not None:
+                self._profile.mechanics = None
+        if self._acoustics is not None:
+            self._acoustics.detach()
+            self._acoustics = None
+            if self._profile is not None:
+                self._profile.acoustics = None
+        self._transform_listeners.clear()
+
+    # ---- 变换监听 ----
+    def add_transform_listener(self, callback: Callable[["Actor"], None]):
+        if callback not in self._transform_listeners:
+            self._transform_listeners.append(callback)
+
+    def remove_transform_listener(self, callback: Callable[["Actor"], None]):
+        if callback in self._transform_listeners:
+            self._transform_listeners.remove(callback)
 
-    # 兼容编辑器的变换操作：直接作用于几何体
+    def _transform_changed(self):
+        self._sync_lod()
+        for callback in self._transform_listeners:
+            callback(self)
+
+    # ---- 层级 ----
+    @property
+    def parent(self) -> Optional["Actor"]:
+        return self._parent
+
+    @property
+    def children(self) -> List["Actor"]:
+        return list(self._children)
+
+    def _set_local(self, slot: int, value: List[float]):
+        self._local[slot] = [float(value[0]), float(value[1]), float(value[2])]
+
+    # 兼容编辑器的变换操作：作用于局部变换
     def scale(self, v: List[float]):
-        if not hasattr(self, '_geometry'):
-            raise RuntimeError("当前 Actor 没有 Geometry")
-        self._geometry.set_scale(v)
+        self.set_scale(v)
 
     def move(self, v: List[float]):
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
-        pos = self._geometry.get_position()
-        new_pos = [pos[0] + v[0], pos[1] + v[1], pos[2] + v[2]]
-        print(f"[Actor.move] {self.name}: {pos} → {new_pos}")
-        self._geometry.set_position(new_pos)
+        if self._local is not None:
+            pos = self._local[0]
+            self._set_local(0, [pos[0] + v[0], pos[1] + v[1], pos[2] + v[2]])
+        else:
+            self._geometry.translate(v)
+        self._transform_changed()
 
     def rotate(self, euler: List[float]):
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
-        rot = self._geometry.get_rotation()
-        self._geometry.set_rotation([rot[0] + euler[0], rot[1] + euler[1], rot[2] + euler[2]])
+        if self._local is not None:
+            rot = self._local[1]
+            self._set_local(1, [rot[0] + euler[0], rot[1] + euler[1], rot[2] + euler[2]])
+        else:
+            self._geometry.rotate_by(euler)
+        self._transform_changed()
+
+    def resync_transform(self):
+        """原生代码直接修改了几何体变换后，调用此方法刷新包装层缓存"""
+        if hasattr(self, '_geometry'):
+            self._geometry.resync()
+            self._transform_changed()
 
     def set_position(self, position: List[float]):
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
-        self._geometry.set_position(position)
+        if self._local is not None:
+            self._set_local(0, position)
+        else:
+            self._geometry.set_position(position)
+        self._transform_changed()
 
     def get_position(self) -> List[float]:
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
+        if self._local is not None:
+            return list(self._local[0])
         return self._geometry.get_position()
 
     def set_rotation(self, euler: List[float]):
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
-        self._geometry.set_rotation(euler)
+        if self._local is not None:
+            self._set_local(1, euler)
+        else:
+            self._geometry.set_rotation(euler)
+        self._transform_changed()
 
     def get_rotation(self) -> List[float]:
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
+        if self._local is not None:
+            return list(self._local[1])
         return self._geometry.get_rotation()
 
     def set_scale(self, scale: List[float]):
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
-        self._geometry.set_scale(scale)
+        if self._local is not None:
+            self._set_local(2, scale)
+        else:
+            self._geometry.set_scale(scale)
+        self._transform_changed()
 
     def get_scale(self) -> List[float]:
         if not hasattr(self, '_geometry'):
             raise RuntimeError("当前 Actor 没有 Geometry")
+        if self._local is not None:
+            return list(self._local[2])
+        return self._geometry.get_scale()
+
+    # 世界变换（Geometry 中的值；有父节点时在 SceneGraph 刷新后才是最新的）
+    def get_world_position(self) -> List[float]:
+        return self._geometry.get_position()
+
+    def get_world_rotation(self) -> List[float]:
+        return self._geometry.get_rotation()
+
+    def get_world_scale(self) -> List[float]:
         return self._geometry.get_scale()
 
     def to_dict(self) -> Dict[str, Any]:
@@ -0,0 +1,95 @@
+"""
+Actor 对象池（克隆积木的运行时基础）
+
+- 按模型路径（规范化后）分池：同一模型的 Actor 包装、Geometry/Optics 与引擎 Actor/Profile 回收后原样复用，
+  避免克隆频繁创建/销毁时重复构造引擎对象
+- 每个模型最多保留 max_idle 个空闲对象（池上限），超出的归还对象直接丢弃，交给引擎析构
+- 统计：在用数量（live）、空闲数量、命中（hits）、未命中（misses，即新建）与丢弃次数
+"""
+from typing import Callable, Dict, List
+import logging
+
+from .actor import Actor
+from .actor_registry import normalize_actor_path
+
+logger = logging.getLogger(__name__)
+
+# 每个模型默认保留的空闲 Actor 数
+DEFAULT_POOL_MAX_IDLE = 64
+
+
+class ActorPool:
+    def __init__(self, max_idle: int = DEFAULT_POOL_MAX_IDLE):
+        self.max_idle = max(int(max_idle), 0)
+        # 规范化模型路径 -> 空闲 Actor（栈，后进先出以复用最近还回、仍在缓存中的对象）
+        self._idle: Dict[str, List[Actor]] = {}
+        # id(actor) -> 所属池键：由本池发出且尚未归还的 Actor
+        self._live: Dict[int, str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._discarded = 0
+
+    def set_max_idle(self, max_idle: int) -> None:
+        """调整每个模型的池上限，立即丢弃超出部分"""
+        self.max_idle = max(int(max_idle), 0)
+        for idle in self._idle.values():
+            excess = len(idle) - self.max_idle
+            if excess > 0:
+                del idle[:excess]
+                self._discarded += excess
+
+    def acquire(self, path: str, create: Callable[[str], Actor]) -> Actor:
+        """取出 path 模型的 Actor：优先复用空闲对象，否则调用 create(path) 新建"""
+        key = normalize_actor_path(path)
+        idle = self._idle.get(key)
+        if idle:
+            actor = idle.pop()
+            self._hits += 1
+        else:
+            actor = create(path)
+            self._misses += 1
+        self._live[id(actor)] = key
+        return actor
+
+    def owns(self, actor: Actor) -> bool:
+        return id(actor) in self._live
+
+    def release(self, actor: Actor) -> bool:
+        """
+        归还 Actor（调用方须先将其移出场景）。按 Actor.reset_for_reuse 重置 LOD、动画、变换监听与力学/声学组件后
+        放回空闲栈；池已满或重置失败时丢弃。返回是否放回池中。
+        """
+        key = self._live.pop(id(actor), None)
+        if key is None:
+            raise ValueError(f"Actor {actor.name} 不是由该对象池分配的")
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self.max_idle:
+            self._discarded += 1
+            return False
+        try:
+            actor.reset_for_reuse()
+        except Exception as e:
+            logger.warning("重置 Actor 失败，不放回对象池 %s: %s", actor.name, e)
+            self._discarded += 1
+            return False
+        idle.append(actor)
+        return True
+
+    def clear(self) -> None:
+        """丢弃全部空闲对象（在用对象不受影响）"""
+        self._discarded += sum(len(idle) for idle in self._idle.values())
+        self._idle.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "live": len(self._live),
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "models": len(self._idle),
+            "max_idle": self.max_idle,
+            "hits": self._hits,
+            "misses": self._misses,
+            "discarded": self._discarded,
+        }
+
+
+__all__ = ["DEFAULT_POOL_MAX_IDLE", "ActorPool"]
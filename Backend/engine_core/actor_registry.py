@@ -0,0 +1,132 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+from .actor import Actor
+
+
+def normalize_actor_name(name: str) -> str:
+    """统一 Actor 名称：去除首尾空白/引号、转小写并去掉扩展名"""
+    value = name.strip().strip('"').strip("'")
+    return os.path.splitext(value.lower())[0]
+
+
+def normalize_actor_path(path: str) -> str:
+    """统一模型路径，便于不同写法（相对/绝对、大小写）命中同一条目"""
+    return os.path.normcase(os.path.abspath(path)) if path else ""
+
+
+class ActorRegistry:
+    """
+    Actor 索引表：按 id / 名称 / 规范化名称 / 资源路径提供 O(1) 查询。
+    - 主表为 dict，保留插入顺序，用于快照导出
+    - 二级索引的值也是 dict（id -> Actor），同名 Actor 时按插入顺序返回第一个，删除为 O(1)
+    """
+
+    def __init__(self):
+        self._actors: Dict[int, Actor] = {}
+        self._by_name: Dict[str, Dict[int, Actor]] = {}
+        self._by_normalized: Dict[str, Dict[int, Actor]] = {}
+        self._by_path: Dict[str, Dict[int, Actor]] = {}
+        # 记录登记时使用的键，避免 Actor 改名后无法从旧索引中移除
+        self._keys: Dict[int, tuple] = {}
+
+    @staticmethod
+    def _index_add(index: Dict[str, Dict[int, Actor]], key: str, actor_id: int, actor: Actor) -> None:
+        if key:
+            index.setdefault(key, {})[actor_id] = actor
+
+    @staticmethod
+    def _index_remove(index: Dict[str, Dict[int, Actor]], key: str, actor_id: int) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(actor_id, None)
+        if not bucket:
+            del index[key]
+
+    @staticmethod
+    def _first(index: Dict[str, Dict[int, Actor]], key: str) -> Optional[Actor]:
+        bucket = index.get(key)
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def add(self, actor: Actor) -> bool:
+        actor_id = id(actor)
+        if actor_id in self._actors:
+            return False
+        self._actors[actor_id] = actor
+        self._index(actor_id, actor)
+        return True
+
+    def remove(self, actor: Actor) -> bool:
+        actor_id = id(actor)
+        if self._actors.pop(actor_id, None) is None:
+            return False
+        self._unindex(actor_id)
+        return True
+
+    def reindex(self, actor: Actor) -> None:
+        """Actor 的 name/path 变更后调用，刷新二级索引"""
+        actor_id = id(actor)
+        if actor_id not in self._actors:
+            return
+        self._unindex(actor_id)
+        self._index(actor_id, actor)
+
+    def _index(self, actor_id: int, actor: Actor) -> None:
+        name = actor.name or ""
+        normalized = normalize_actor_name(name) if name else ""
+        path = normalize_actor_path(actor.path)
+        self._keys[actor_id] = (name, normalized, path)
+        self._index_add(self._by_name, name, actor_id, actor)
+        self._index_add(self._by_normalized, normalized, actor_id, actor)
+        self._index_add(self._by_path, path, actor_id, actor)
+
+    def _unindex(self, actor_id: int) -> None:
+        name, normalized, path = self._keys.pop(actor_id)
+        self._index_remove(self._by_name, name, actor_id)
+        self._index_remove(self._by_normalized, normalized, actor_id)
+        self._index_remove(self._by_path, path, actor_id)
+
+    def clear(self) -> None:
+        self._actors.clear()
+        self._by_name.clear()
+        self._by_normalized.clear()
+        self._by_path.clear()
+        self._keys.clear()
+
+    # 查询
+    def __contains__(self, actor: Actor) -> bool:
+        return id(actor) in self._actors
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def __iter__(self) -> Iterator[Actor]:
+        return iter(self._actors.values())
+
+    def values(self) -> List[Actor]:
+        return list(self._actors.values())
+
+    def get_by_id(self, actor_id: int) -> Optional[Actor]:
+        return self._actors.get(actor_id)
+
+    def get_by_name(self, name: str) -> Optional[Actor]:
+        return self._first(self._by_name, name)
+
+    def get_by_normalized_name(self, name: str) -> Optional[Actor]:
+        return self._first(self._by_normalized, normalize_actor_name(name))
+
+    def get_by_path(self, path: str) -> Optional[Actor]:
+        return self._first(self._by_path, normalize_actor_path(path))
+
+    def find(self, key: str) -> Optional[Actor]:
+        """依次按精确名称、规范化名称、资源路径查找"""
+        if not key:
+            return None
+        return (
+            self.get_by_name(key)
+            or self.get_by_normalized_name(key)
+            or self.get_by_path(key)
+        )
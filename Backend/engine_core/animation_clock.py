@@ -0,0 +1,177 @@
+"""
+动画时钟：所有 Kinematics 组件共享的向量化播放状态
+
+- 每个 Kinematics 占用一行（SoA）：当前时间、播放速度、片段长度、是否播放、是否循环
+- advance(dt) 每帧一次：对全部正在播放的行做一次 NumPy 运算推进时间（循环片段取模，非循环片段到末尾停止）
+- 播放/暂停/跳转/变速只改对应行；引擎侧只在这些操作发生时同步，逐帧推进不产生引擎调用
+  （非循环片段播放结束时调用该行注册的结束回调，由 Kinematics 通知引擎停止）
+- 所有操作接受单个行号或行号数组，便于上千个角色同时控制
+"""
+from typing import Callable, Dict, List, Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AnimationClock:
+    def __init__(self, capacity: int = 256):
+        capacity = max(int(capacity), 1)
+        self._time = np.zeros(capacity, dtype=np.float64)
+        self._speed = np.ones(capacity, dtype=np.float64)
+        # 片段长度（秒）；<= 0 表示未知，时间不回绕
+        self._length = np.zeros(capacity, dtype=np.float64)
+        self._playing = np.zeros(capacity, dtype=bool)
+        self._loop = np.ones(capacity, dtype=bool)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._free: List[int] = []
+        # 行号 -> 非循环片段播放结束时的回调
+        self._on_finished: Dict[int, Callable[[], object]] = {}
+        self._size = 0
+        self._frames = 0
+        self._last_playing = 0
+        self._finished = 0
+
+    def _grow(self) -> None:
+        capacity = self._time.shape[0] * 2
+        for name, fill in (('_time', 0.0), ('_speed', 1.0), ('_length', 0.0),
+                           ('_playing', False), ('_loop', True), ('_alive', False)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+
+    # ---- 行管理 ----
+    def allocate(self, clip_length: float = 0.0, loop: bool = True) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size >= self._time.shape[0]:
+                self._grow()
+            slot = self._size
+            self._size += 1
+        self._time[slot] = 0.0
+        self._speed[slot] = 1.0
+        self._length[slot] = float(clip_length)
+        self._playing[slot] = False
+        self._loop[slot] = bool(loop)
+        self._alive[slot] = True
+        return slot
+
+    def release(self, slot: int) -> None:
+        if 0 <= slot < self._size and self._alive[slot]:
+            self._alive[slot] = False
+            self._playing[slot] = False
+            self._on_finished.pop(slot, None)
+            self._free.append(slot)
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    # ---- 控制（slots 可为单个行号或数组） ----
+    def play(self, slots, speed: Optional[float] = None) -> None:
+        if speed is not None:
+            self._speed[slots] = speed
+        self._playing[slots] = True
+
+    def pause(self, slots) -> None:
+        self._playing[slots] = False
+
+    def seek(self, slots, time) -> None:
+        """跳转到指定时间（按片段长度回绕或截断）"""
+        time = np.asarray(time, dtype=np.float64)
+        length = self._length[slots]
+        bounded = length > 0
+        self._time[slots] = np.where(bounded & self._loop[slots], np.mod(time, np.where(bounded, length, 1.0)),
+                                     np.clip(time, 0.0, np.where(bounded, length, np.inf)))
+
+    def set_speed(self, slots, speed) -> None:
+        self._speed[slots] = speed
+
+    def set_clip(self, slots, length, loop: bool = True) -> None:
+        self._length[slots] = length
+        self._loop[slots] = loop
+
+    def set_finished_callback(self, slot: int, callback: Optional[Callable[[], object]]) -> None:
+        """注册该行片段播放结束（非循环片段到达端点）时的回调"""
+        if callback is None:
+            self._on_finished.pop(slot, None)
+        else:
+            self._on_finished[slot] = callback
+
+    # ---- 查询 ----
+    def time(self, slot: int) -> float:
+        return float(self._time[slot])
+
+    def speed(self, slot: int) -> float:
+        return float(self._speed[slot])
+
+    def is_playing(self, slot: int) -> bool:
+        return bool(self._playing[slot])
+
+    def is_looping(self, slot: int) -> bool:
+        return bool(self._loop[slot])
+
+    def playing_count(self) -> int:
+        return int(np.count_nonzero(self._playing[:self._size]))
+
+    def times(self, slots) -> np.ndarray:
+        return self._time[slots].copy()
+
+    # ---- 推进 ----
+    def advance(self, dt: float) -> int:
+        """所有正在播放的行前进 dt·speed 秒，返回本帧播放中的行数"""
+        self._frames += 1
+        n = self._size
+        playing = np.flatnonzero(self._playing[:n])
+        self._last_playing = int(playing.size)
+        if not playing.size or dt <= 0.0:
+            return self._last_playing
+        speed = self._speed[playing]
+        time = self._time[playing] + speed * dt
+        length = self._length[playing]
+        bounded = length > 0
+        looping = bounded & self._loop[playing]
+        # 循环片段回绕（负速度倒放时 mod 同样落在 [0, length)）
+        time = np.where(looping, np.mod(time, np.where(looping, length, 1.0)), time)
+        # 非循环片段到达端点后停止
+        ended = bounded & ~self._loop[playing] & (((speed > 0) & (time >= length)) | ((speed < 0) & (time <= 0.0)))
+        time = np.where(ended, np.clip(time, 0.0, length), time)
+        self._time[playing] = time
+        if ended.any():
+            finished = playing[ended]
+            self._playing[finished] = False
+            self._finished += int(finished.size)
+            for slot in finished.tolist():
+                callback = self._on_finished.get(slot)
+                if callback is None:
+                    continue
+                try:
+                    callback()
+                except Exception as e:
+                    logger.warning("动画结束回调失败 (行 %d): %s", slot, e)
+        return self._last_playing
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "components": len(self),
+            "playing": self.playing_count(),
+            "last_advanced": self._last_playing,
+            "finished": self._finished,
+            "frames": self._frames,
+        }
+
+
+_default_clock: Optional[AnimationClock] = None
+
+
+def default_animation_clock() -> AnimationClock:
+    """进程级动画时钟（SceneManager.tick 每帧推进一次）"""
+    global _default_clock
+    if _default_clock is None:
+        _default_clock = AnimationClock()
+    return _default_clock
+
+
+__all__ = ["AnimationClock", "default_animation_clock"]
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK = 1 << 20
+# (绝对路径, 大小, mtime) -> 内容哈希，避免同一文件重复读取
+_content_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_content_hash(path: str) -> str:
+    """计算文件内容的 SHA-1；文件未变化（大小/mtime 相同）时直接返回缓存结果"""
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    memo_key = (abs_path, st.st_size, st.st_mtime_ns)
+    digest = _content_hash_memo.get(memo_key)
+    if digest is None:
+        sha1 = hashlib.sha1()
+        with open(abs_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                sha1.update(chunk)
+        digest = sha1.hexdigest()
+        _content_hash_memo[memo_key] = digest
+    return digest
+
+
+class CacheEntry:
+    """缓存条目：值 + 字节数 + 引用计数；引用为 0 时仍保留（热数据），直到预算不足被淘汰"""
+
+    def __init__(self, key: str, path: str, value: Any, byte_size: int):
+        self.key = key
+        self.path = path
+        self.value = value
+        self.byte_size = int(byte_size)
+        self.refs = 0
+
+    def __repr__(self):
+        return f"CacheEntry(path={self.path}, refs={self.refs}, bytes={self.byte_size})"
+
+
+class AssetCache:
+    """
+    内容寻址的资源缓存：
+    - 键为文件内容哈希（经 (绝对路径, 大小, mtime) 记忆化），同名不同文件不会冲突，同内容不同路径共享
+    - 有字节预算；超出时按 LRU 顺序淘汰引用计数为 0 的条目
+    - 统计命中/未命中/淘汰次数
+    """
+
+    def __init__(self, budget_bytes: int = 512 * 1024 * 1024):
+        self._budget = int(budget_bytes)
+        self._entries: Dict[str, CacheEntry] = {}
+        # 未被引用的条目，按最近使用排序（队首最旧）
+        self._lru: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self._budget = int(budget_bytes)
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    def entries(self) -> List[CacheEntry]:
+        return list(self._entries.values())
+
+    def acquire(self, path: str, loader: Callable[[str], Tuple[Any, int]]) -> CacheEntry:
+        """
+        获取资源并增加引用计数；未命中时调用 loader(abs_path) -> (value, byte_size) 加载。
+        使用完毕后必须调用 release(entry.key)。
+        """
+        key = file_content_hash(path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._lru.pop(key, None)
+        else:
+            self._misses += 1
+            abs_path = os.path.abspath(path)
+            value, byte_size = loader(abs_path)
+            entry = CacheEntry(key, abs_path, value, byte_size)
+            self._entries[key] = entry
+            self._bytes += entry.byte_size
+            logger.debug("资源缓存加载 %s (%s, %d bytes)", abs_path, key, entry.byte_size)
+        entry.refs += 1
+        self._evict()
+        return entry
+
+    def release(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry.refs <= 0:
+            return
+        entry.refs -= 1
+        if entry.refs == 0:
+            self._lru[key] = entry
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self._budget and self._lru:
+            key, entry = self._lru.popitem(last=False)
+            del self._entries[key]
+            self._bytes -= entry.byte_size
+            self._evictions += 1
+            logger.debug("资源缓存淘汰 %s (%d bytes)", entry.path, entry.byte_size)
+
+    def clear(self, include_referenced: bool = False) -> None:
+        """清空未被引用的条目；include_referenced=True 时全部清空"""
+        keys = list(self._entries) if include_referenced else list(self._lru)
+        for key in keys:
+            entry = self._entries.pop(key)
+            self._lru.pop(key, None)
+            self._bytes -= entry.byte_size
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "referenced": len(self._entries) - len(self._lru),
+            "bytes": self._bytes,
+            "budget_bytes": self._budget,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
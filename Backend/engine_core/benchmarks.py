@@ -0,0 +1,276 @@
+"""
+engine_core 性能基准（开发用，不参与运行时）
+
+用法：
+    python -m Backend.engine_core.benchmarks obj [网格边长]
+    python -m Backend.engine_core.benchmarks pick [网格边长]
+    python -m Backend.engine_core.benchmarks physics [刚体数]
+    python -m Backend.engine_core.benchmarks memory [Actor 数] [基线 git 版本]
+"""
+import io
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_grid_obj(size: int, with_attributes: bool = True) -> bytes:
+    """生成 size×size 顶点的网格平面 OBJ 文本（约 2·(size-1)² 个三角形），面格式为 v/vt/vn"""
+    ys, xs = np.mgrid[0:size, 0:size].astype(np.float64)
+    zs = np.sin(xs * 0.1) * np.cos(ys * 0.1)
+    positions = np.stack([xs.ravel(), zs.ravel(), ys.ravel()], axis=1)
+    lines: List[str] = ["# synthetic grid", "o grid"]
+    lines.extend(f"v {x:.6f} {y:.6f} {z:.6f}" for x, y, z in positions)
+    if with_attributes:
+        lines.extend(f"vt {u:.6f} {v:.6f}" for u, v in positions[:, [0, 2]] / max(1, size - 1))
+        lines.append("vn 0 1 0")
+    grid = np.arange(size * size).reshape(size, size) + 1
+    a = grid[:-1, :-1].ravel()
+    b = grid[:-1, 1:].ravel()
+    c = grid[1:, 1:].ravel()
+    d = grid[1:, :-1].ravel()
+    if with_attributes:
+        lines.extend(f"f {i}/{i}/1 {j}/{j}/1 {k}/{k}/1 {m}/{m}/1" for i, j, k, m in zip(a, b, c, d))
+    else:
+        lines.extend(f"f {i} {j} {k} {m}" for i, j, k, m in zip(a, b, c, d))
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+
+def bench_obj_parse(size: int = 1000, workers_list=(1, 2, 4, 8), repeat: int = 3) -> List[Dict[str, float]]:
+    """对比单进程与多进程分块解析合成网格的耗时，并校验结果一致"""
+    from . import obj_loader
+
+    data = synthetic_grid_obj(size)
+    reference = obj_loader.build_mesh(obj_loader.parse_obj_bytes(data))
+    results = []
+    for workers in workers_list:
+        # 预热进程池，避免把进程启动时间计入解析
+        obj_loader.parse_obj_data(data, workers)
+        seconds = _best_of(lambda: obj_loader.build_mesh(obj_loader.parse_obj_data(data, workers)), repeat)
+        mesh = obj_loader.build_mesh(obj_loader.parse_obj_data(data, workers))
+        if not (np.array_equal(mesh.indices, reference.indices) and np.array_equal(mesh.positions, reference.positions)):
+            raise RuntimeError(f"workers={workers} 的解析结果与单进程不一致")
+        results.append({
+            "workers": workers,
+            "megabytes": len(data) / 1e6,
+            "triangles": mesh.triangle_count,
+            "seconds": seconds,
+        })
+    obj_loader.shutdown_parse_pool()
+    return results
+
+
+def synthetic_grid_arrays(size: int):
+    """与 synthetic_grid_obj 相同的起伏网格平面，直接返回 (positions, indices)"""
+    ys, xs = np.mgrid[0:size, 0:size].astype(np.float64)
+    zs = np.sin(xs * 0.1) * np.cos(ys * 0.1)
+    positions = np.stack([xs.ravel(), zs.ravel(), ys.ravel()], axis=1).astype(np.float32)
+    grid = np.arange(size * size).reshape(size, size)
+    a, b = grid[:-1, :-1].ravel(), grid[:-1, 1:].ravel()
+    c, d = grid[1:, 1:].ravel(), grid[1:, :-1].ravel()
+    indices = np.concatenate([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)]).astype(np.uint32)
+    return positions, indices
+
+
+def _brute_force_ray(positions: np.ndarray, indices: np.ndarray, origin: np.ndarray, direction: np.ndarray):
+    p = positions.astype(np.float64)
+    v0, v1, v2 = p[indices[:, 0]], p[indices[:, 1]], p[indices[:, 2]]
+    e1, e2, s = v1 - v0, v2 - v0, origin - v0
+    h = np.cross(direction, e2)
+    det = np.einsum('ij,ij->i', e1, h)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = np.einsum('ij,ij->i', s, h) / det
+        q = np.cross(s, e1)
+        v = (q @ direction) / det
+        t = np.einsum('ij,ij->i', e2, q) / det
+    hit = (np.abs(det) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 1e-9)
+    return float(t[hit].min()) if hit.any() else None
+
+
+def bench_pick(size: int = 708, rays: int = 1000, verify: int = 20) -> Dict[str, float]:
+    """约 2·(size-1)² 个三角形的网格上，测量 BVH 构建与单条像素射线拾取耗时，并抽样与暴力求交比对"""
+    from .picking import TriangleBVH
+    from .transform_math import pixel_ray
+
+    positions, indices = synthetic_grid_arrays(size)
+    start = time.perf_counter()
+    bvh = TriangleBVH(positions, indices)
+    build = time.perf_counter() - start
+
+    eye = [size * 0.5, size * 0.4, -size * 0.2]
+    forward = [0.0, -0.6, 1.0]
+    rng = np.random.default_rng(0)
+    pixels = rng.uniform([0, 0], [1280, 720], size=(rays, 2))
+    timings, hits = [], 0
+    for i, (x, y) in enumerate(pixels):
+        origin, direction = pixel_ray(eye, forward, [0.0, 1.0, 0.0], 60.0, x, y, 1280, 720)
+        start = time.perf_counter()
+        hit = bvh.intersect(origin, direction)
+        timings.append(time.perf_counter() - start)
+        hits += hit is not None
+        if i < verify:
+            expected = _brute_force_ray(positions, indices, origin, direction)
+            if (hit is None) != (expected is None) or (hit is not None and abs(hit[1] - expected) > 1e-6 * expected):
+                raise RuntimeError(f"像素 ({x:.1f}, {y:.1f}) 的拾取结果与暴力求交不一致")
+    timings = np.asarray(timings)
+    return {
+        "triangles": int(indices.shape[0]),
+        "build_seconds": build,
+        "hit_ratio": hits / rays,
+        "median_ms": float(np.median(timings) * 1000),
+        "p95_ms": float(np.percentile(timings, 95) * 1000),
+        "max_ms": float(timings.max() * 1000),
+    }
+
+
+def bench_physics(bodies: int = 10000, steps: int = 120) -> Dict[str, float]:
+    """bodies 个球体从网格上方落到静态地面并互相堆叠，测量每个固定子步的耗时（不含引擎写回）"""
+    from .physics import PhysicsWorld
+
+    world = PhysicsWorld(capacity=bodies + 1)
+    side = int(np.ceil(np.sqrt(bodies)))
+    world.add_body([side * 0.5, -0.5, side * 0.5], "box", [side, 0.5, side], mass=0.0)
+    rng = np.random.default_rng(0)
+    for i in range(bodies):
+        x, z = divmod(i, side)
+        # 相邻球体水平间距 1.0、半径 0.45，随机高度让一部分球体在下落过程中相互碰撞
+        world.add_body([x + 0.5, 1.0 + rng.uniform(0.0, 3.0), z + 0.5], "sphere", 0.45 + rng.uniform(0.0, 0.1))
+    timings, contacts = [], 0
+    for _ in range(steps):
+        start = time.perf_counter()
+        world.substep(world.fixed_dt)
+        timings.append(time.perf_counter() - start)
+        contacts = max(contacts, world.stats()["contacts"])
+    timings = np.asarray(timings)
+    return {
+        "bodies": bodies,
+        "steps": steps,
+        "max_contacts": contacts,
+        "median_ms": float(np.median(timings) * 1000),
+        "p95_ms": float(np.percentile(timings, 95) * 1000),
+    }
+
+
+def _without_slots(cls: type) -> type:
+    """与 cls 行为相同但去掉 __slots__ 的类（实例带 __dict__），用于单独衡量 __slots__ 的作用"""
+    slots = set(getattr(cls, '__slots__', ()))
+    namespace = {k: v for k, v in vars(cls).items() if k not in slots and k != '__slots__'}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def _load_baseline(revision: str):
+    """
+    把 git 版本 revision 中的 engine_core 导出到临时目录并以独立包名导入，返回其 engine_object_factory 模块。
+    没有原生引擎时，基线包使用它自带的同版本 fallback 引擎。
+    """
+    import atexit
+    import importlib
+    import shutil
+    import subprocess
+    import tarfile
+    import tempfile
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    archive = subprocess.run(["git", "-C", root, "archive", revision, "Backend/engine_core"],
+                             check=True, capture_output=True).stdout
+    target = tempfile.mkdtemp(prefix="engine_core_baseline_")
+    atexit.register(shutil.rmtree, target, True)
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    package = "_baseline_engine_core"
+    os.rename(os.path.join(target, "Backend", "engine_core"), os.path.join(target, package))
+    sys.path.insert(0, target)
+    try:
+        return importlib.import_module(f"{package}.engine_object_factory")
+    finally:
+        sys.path.remove(target)
+
+
+def bench_memory(actors: int = 2000, path: str = "assets/地板网格.obj",
+                 baseline: Optional[str] = None) -> Dict[str, float]:
+    """
+    创建 actors 个共享同一网格的 Actor，用 tracemalloc 统计每个 Actor 的 Python 分配字节数
+    （fallback 引擎下包含引擎对象本身）。after 为当前实现；no_slots 为去掉 __slots__ 的当前实现；
+    指定 baseline（git 版本）时，额外测量该版本的 Actor 包装层（before）；各版本按其自身的构造签名调用，
+    不支持 geometry_source 的版本每个 Actor 各自加载网格。
+    """
+    import contextlib
+    import gc
+    import inspect
+    import tracemalloc
+    from unittest import mock
+
+    from . import actor as actor_module
+    from .engine_object_factory import EngineObjectFactory
+
+    path = os.path.abspath(path)
+
+    def measure(factory, actor_cls: type) -> float:
+        shares_mesh = "geometry_source" in inspect.signature(actor_cls.__init__).parameters
+        with contextlib.redirect_stdout(io.StringIO()):
+            source = factory.create_actor(path)
+            kwargs = {"geometry_source": source._geometry} if shares_mesh else {}
+            gc.collect()
+            tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            created = [actor_cls(path, **kwargs) for _ in range(actors)]
+            used = tracemalloc.get_traced_memory()[0] - base
+            tracemalloc.stop()
+            del created
+        return used / actors
+
+    # 预热一轮：引擎变换表等一次性扩容不计入任何一方
+    measure(EngineObjectFactory, actor_module.Actor)
+    row: Dict[str, float] = {"actors": actors}
+    if baseline:
+        with contextlib.redirect_stdout(io.StringIO()):
+            baseline_factory = _load_baseline(baseline)
+        baseline_actor = sys.modules[baseline_factory.__package__ + ".actor"].Actor
+        measure(baseline_factory.EngineObjectFactory, baseline_actor)
+        row["before_bytes"] = measure(baseline_factory.EngineObjectFactory, baseline_actor)
+    row["after_bytes"] = measure(EngineObjectFactory, actor_module.Actor)
+    with mock.patch.object(actor_module, 'Geometry', _without_slots(actor_module.Geometry)), \
+            mock.patch.object(actor_module, 'Optics', _without_slots(actor_module.Optics)):
+        row["no_slots_bytes"] = measure(EngineObjectFactory, _without_slots(actor_module.Actor))
+    return row
+
+
+def main(argv: List[str]) -> None:
+    if not argv or argv[0] == "obj":
+        size = int(argv[1]) if len(argv) > 1 else 1000
+        for row in bench_obj_parse(size):
+            print(f"obj parse workers={row['workers']:<2} {row['megabytes']:.1f} MB "
+                  f"{row['triangles']} tris {row['seconds'] * 1000:.1f} ms")
+    elif argv[0] == "pick":
+        size = int(argv[1]) if len(argv) > 1 else 708
+        row = bench_pick(size)
+        print(f"pick {row['triangles']} tris build {row['build_seconds'] * 1000:.0f} ms "
+              f"hit {row['hit_ratio']:.0%} median {row['median_ms']:.3f} ms "
+              f"p95 {row['p95_ms']:.3f} ms max {row['max_ms']:.3f} ms")
+    elif argv[0] == "physics":
+        bodies = int(argv[1]) if len(argv) > 1 else 10000
+        row = bench_physics(bodies)
+        print(f"physics {row['bodies']} bodies {row['steps']} steps max contacts {row['max_contacts']} "
+              f"median {row['median_ms']:.2f} ms p95 {row['p95_ms']:.2f} ms")
+    elif argv[0] == "memory":
+        row = bench_memory(int(argv[1]) if len(argv) > 1 else 2000, baseline=argv[2] if len(argv) > 2 else None)
+        before = f"before {row['before_bytes']:.0f} B/actor " if "before_bytes" in row else ""
+        print(f"memory {row['actors']} actors {before}after {row['after_bytes']:.0f} B/actor "
+              f"(without __slots__ {row['no_slots_bytes']:.0f} B/actor)")
+    else:
+        raise SystemExit(f"未知基准: {argv[0]}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -8,8 +8,14 @@ CoronaEngine = load_corona_engine()
 class Camera:
     """
     OOP 相机包装：统一通过 set(...) 推送到引擎；包装层提供单项 setter 并维护本地缓存。
+    - 已加入场景（Scene.add_camera）时 setter 只更新缓存并标记 dirty，由场景每帧 flush_cameras() 统一推送；
+      未加入任何场景时 setter 立即推送（没有帧循环会替它推送），也可随时调用 flush() 主动推送
+    - getter 直接读取本地缓存，不再访问引擎
     """
 
+    # __weakref__：工厂的相机缓存为 WeakValueDictionary
+    __slots__ = ('engine_obj', 'name', '_pos', '_fwd', '_up', '_fov', '_dirty', '_owners', '__weakref__')
+
     def __init__(self, position: Optional[List[float]] = None, forward: Optional[List[float]] = None,
                  world_up: Optional[List[float]] = None, fov: Optional[float] = None, name: str = "Camera"):
         if CoronaEngine is None:
@@ -33,43 +39,68 @@ class Camera:
             self._fov = self.engine_obj.get_fov()
 
         self.name = name
-
-    # 单项 setter：更新缓存并统一调用 set
-    def _flush(self):
+        self._dirty = False
+        # 持有该相机的场景数（同名缓存相机可加入多个场景）；为 0 时修改立即推送
+        self._owners = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def flush(self) -> bool:
+        """若有未推送的修改，则一次性调用引擎 set；返回是否发生推送"""
+        if not self._dirty:
+            return False
         self.engine_obj.set(self._pos, self._fwd, self._up, self._fov)
+        self._dirty = False
+        return True
+
+    def _attach_scene(self):
+        self._owners += 1
 
+    def _detach_scene(self):
+        """离开场景：不再有帧循环推送，立即推送未提交的修改"""
+        self._owners = max(self._owners - 1, 0)
+        if not self._owners:
+            self.flush()
+
+    def _changed(self):
+        self._dirty = True
+        if not self._owners:
+            self.flush()
+
+    # 单项 setter：更新缓存并标记 dirty（不属于任何场景时立即推送）
     def set_position(self, position: List[float]):
         self._pos = list(position)
-        self._flush()
+        self._changed()
 
     def get_position(self) -> List[float]:
-        return self.engine_obj.get_position()
+        return list(self._pos)
 
     def set_forward(self, forward: List[float]):
         self._fwd = list(forward)
-        self._flush()
+        self._changed()
 
     def get_forward(self) -> List[float]:
-        return self.engine_obj.get_forward()
+        return list(self._fwd)
 
     def set_world_up(self, world_up: List[float]):
         self._up = list(world_up)
-        self._flush()
+        self._changed()
 
     def get_world_up(self) -> List[float]:
-        return self.engine_obj.get_world_up()
+        return list(self._up)
 
     def set_fov(self, fov: float):
         self._fov = float(fov)
-        self._flush()
+        self._changed()
 
     def get_fov(self) -> float:
-        return self.engine_obj.get_fov()
+        return self._fov
 
-    # 新接口直通
     def set(self, position: List[float], forward: List[float], world_up: List[float], fov: float):
         self._pos, self._fwd, self._up, self._fov = list(position), list(forward), list(world_up), float(fov)
-        self.engine_obj.set(self._pos, self._fwd, self._up, self._fov)
+        self._changed()
 
     def set_surface(self, surface: int):
         self.engine_obj.set_surface(surface)
@@ -0,0 +1,189 @@
+"""
+接触追踪：Blockly 侦测积木（碰到 / 距离）的逐帧缓存
+
+- update() 每帧一次（Scene.update 在空间索引刷新之后调用）：对全部 Actor 的世界包围盒做一次
+  分条排序扫描（physics.sweep_pairs），得到本帧所有相交对，并缓存每个 Actor 的包围盒中心
+- touching / contacts_of / distance 只查本帧缓存：一次字典查找，脚本在循环里逐帧调用不再扫描全部 Actor
+- 与上一帧比较得到 enter（开始接触）/ stay（持续接触）/ exit（结束接触）事件，分发给 on() 注册的回调
+- 接触以世界包围盒相交为准，允许 tolerance 的间隙：刚体碰撞体由包围盒生成且平面至少有 MIN_HALF_EXTENT
+  的半厚度，静止在平面网格上的物体与其可视包围盒之间会留有缝隙；帧内移动 Actor 后，结果要到下一帧 update 才会反映
+"""
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import logging
+import time
+
+import numpy as np
+
+from .physics import MIN_HALF_EXTENT, sweep_pairs
+
+logger = logging.getLogger(__name__)
+
+CONTACT_EVENTS = ("enter", "stay", "exit")
+# 包围盒间距不超过该值即视为接触（覆盖平面碰撞体向两侧加厚的部分）
+CONTACT_TOLERANCE = 2.0 * MIN_HALF_EXTENT
+
+# callback(event, actor, other)
+ContactCallback = Callable[[str, Any, Any], Any]
+PairKey = Tuple[int, int]
+
+
+def _pair_key(a: int, b: int) -> PairKey:
+    return (a, b) if a < b else (b, a)
+
+
+class ContactTracker:
+    def __init__(self, spatial_index, tolerance: float = CONTACT_TOLERANCE):
+        self._index = spatial_index
+        self.tolerance = max(float(tolerance), 0.0)
+        # 本帧相交对：键 -> (actor_a, actor_b)
+        self._pairs: Dict[PairKey, Tuple[Any, Any]] = {}
+        # id(actor) -> 与之接触的 Actor id
+        self._contacts: Dict[int, Set[int]] = {}
+        # id(actor) -> 本帧包围盒中心 / Actor
+        self._centers: Dict[int, np.ndarray] = {}
+        self._actors: Dict[int, Any] = {}
+        # id(actor) -> [(event, other 或 None, callback)]
+        self._handlers: Dict[int, List[Tuple[str, Optional[Any], ContactCallback]]] = {}
+        self._version = -1
+        self._frames = 0
+        self._last_entered = 0
+        self._last_exited = 0
+        self._last_seconds = 0.0
+
+    # ---- 每帧更新 ----
+    def update(self) -> int:
+        """重算本帧相交对并分发接触事件，返回相交对数"""
+        start_time = time.perf_counter()
+        self._frames += 1
+        index = self._index
+        index.refresh()
+        old_pairs = self._pairs
+        entered: List[Tuple[Any, Any]] = []
+        exited: List[Tuple[Any, Any]] = []
+        # 包围盒与成员都没变化时沿用上一帧结果（全部为 stay）
+        if index.version != self._version:
+            self._version = index.version
+            tree = index.tree
+            slots = np.flatnonzero(tree._alive[:tree._size])
+            lo, hi = tree._lo[slots], tree._hi[slots]
+            items = [tree._items[slot] for slot in slots]
+            centers = (lo + hi) * 0.5
+            self._centers = {id(actor): center for actor, center in zip(items, centers)}
+            self._actors = {id(actor): actor for actor in items}
+            pad = self.tolerance * 0.5
+            a, b = sweep_pairs(lo - pad, hi + pad)
+            pairs: Dict[PairKey, Tuple[Any, Any]] = {}
+            contacts: Dict[int, Set[int]] = {}
+            for i, j in zip(a.tolist(), b.tolist()):
+                actor_a, actor_b = items[i], items[j]
+                pairs[_pair_key(id(actor_a), id(actor_b))] = (actor_a, actor_b)
+                contacts.setdefault(id(actor_a), set()).add(id(actor_b))
+                contacts.setdefault(id(actor_b), set()).add(id(actor_a))
+            self._pairs = pairs
+            self._contacts = contacts
+            entered = [pairs[key] for key in pairs.keys() - old_pairs.keys()]
+            exited = [old_pairs[key] for key in old_pairs.keys() - pairs.keys()]
+
+        self._last_entered = len(entered)
+        self._last_exited = len(exited)
+        if self._handlers:
+            for a, b in exited:
+                self._dispatch("exit", a, b)
+                self._dispatch("exit", b, a)
+            for a, b in entered:
+                self._dispatch("enter", a, b)
+                self._dispatch("enter", b, a)
+            # stay 只遍历注册了回调的 Actor 的接触
+            for actor_id in list(self._handlers):
+                for other_id in self._contacts.get(actor_id, ()):
+                    key = _pair_key(actor_id, other_id)
+                    if key in old_pairs:
+                        a, b = self._pairs[key]
+                        self._dispatch("stay", *((a, b) if id(a) == actor_id else (b, a)))
+        self._last_seconds = time.perf_counter() - start_time
+        return len(self._pairs)
+
+    def _dispatch(self, event: str, actor: Any, other: Any) -> None:
+        handlers = self._handlers.get(id(actor))
+        if not handlers:
+            return
+        for kind, target, callback in list(handlers):
+            if kind != event or (target is not None and target is not other):
+                continue
+            try:
+                callback(event, actor, other)
+            except Exception:
+                logger.exception("接触回调失败 %s -> %s", getattr(actor, 'name', actor), getattr(other, 'name', other))
+
+    # ---- 查询（本帧缓存） ----
+    def touching(self, actor: Any, other: Any) -> bool:
+        return id(other) in self._contacts.get(id(actor), ())
+
+    def contacts_of(self, actor: Any) -> List[Any]:
+        return [self._actors[other] for other in self._contacts.get(id(actor), ())]
+
+    def center(self, actor: Any) -> Optional[np.ndarray]:
+        return self._centers.get(id(actor))
+
+    def distance(self, actor: Any, other: Any) -> Optional[float]:
+        """本帧包围盒中心距离；任一方不在缓存中（尚未经过 update）时返回 None"""
+        a = self._centers.get(id(actor))
+        b = self._centers.get(id(other))
+        if a is None or b is None:
+            return None
+        return float(np.linalg.norm(a - b))
+
+    # ---- 事件 ----
+    def on(self, actor: Any, event: str, callback: ContactCallback, other: Optional[Any] = None) -> None:
+        """注册 actor 的接触回调：event 为 enter/stay/exit，other 为空时对任意 Actor 生效"""
+        if event not in CONTACT_EVENTS:
+            raise ValueError(f"不支持的接触事件: {event}")
+        self._handlers.setdefault(id(actor), []).append((event, other, callback))
+
+    def off(self, actor: Any, callback: Optional[ContactCallback] = None) -> int:
+        """移除 actor 的接触回调（callback 为空时移除全部），返回移除数量"""
+        handlers = self._handlers.get(id(actor))
+        if not handlers:
+            return 0
+        kept = [h for h in handlers if callback is not None and h[2] is not callback]
+        removed = len(handlers) - len(kept)
+        if kept:
+            self._handlers[id(actor)] = kept
+        else:
+            del self._handlers[id(actor)]
+        return removed
+
+    def forget(self, actor: Any) -> None:
+        """Actor 离开场景：移除它注册的回调以及其他 Actor 以它为目标的回调"""
+        self._handlers.pop(id(actor), None)
+        for key in list(self._handlers):
+            kept = [h for h in self._handlers[key] if h[1] is not actor]
+            if kept:
+                self._handlers[key] = kept
+            else:
+                del self._handlers[key]
+
+    def has_handlers(self) -> bool:
+        return bool(self._handlers)
+
+    def clear(self) -> None:
+        self._pairs = {}
+        self._contacts = {}
+        self._centers = {}
+        self._actors = {}
+        self._handlers.clear()
+        self._version = -1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self._centers),
+            "pairs": len(self._pairs),
+            "entered": self._last_entered,
+            "exited": self._last_exited,
+            "handlers": sum(len(h) for h in self._handlers.values()),
+            "frames": self._frames,
+            "last_ms": round(self._last_seconds * 1000, 3),
+        }
+
+
+__all__ = ["CONTACT_EVENTS", "CONTACT_TOLERANCE", "ContactTracker"]
@@ -4,47 +4,195 @@ CoronaEngine Python Fallback（OOP 版）
 - 与 C++ 绑定导出的 API 形态对齐（顶层类：Geometry/Mechanics/Optics/Acoustics/Kinematics/ActorProfile/Actor/Camera/ImageEffects/Viewport/Environment/Scene）
 """
 from __future__ import annotations
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 import warnings
+import weakref
+
+import numpy as np
+
+from .obj_loader import MeshData, load_mesh
 
 # 一次性警告：仅在原生模块不可用时才会导入本模块
 warnings.warn("[CoronaEngine][Fallback] 使用 Python fallback（未找到原生 CoronaEngine 模块），功能受限，仅用于开发/占位。", RuntimeWarning, stacklevel=2)
 
 
+# ================================
+# TransformTable（SoA 变换表）
+# ================================
+class TransformTable:
+    """
+    以结构数组（SoA）形式集中存放所有 Geometry 的位置/旋转/缩放：
+    - 每个 Geometry 占用一行，Geometry 本身只是该行的视图
+    - 批量读写/增量操作全部向量化，便于无头仿真一次移动上万个对象
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._pos = np.zeros((capacity, 3), dtype=np.float64)
+        self._rot = np.zeros((capacity, 3), dtype=np.float64)  # Euler ZYX
+        self._scl = np.ones((capacity, 3), dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._free: List[int] = []
+        self._size = 0  # 已使用过的最大行号 + 1
+
+    @property
+    def capacity(self) -> int:
+        return self._pos.shape[0]
+
+    def __len__(self) -> int:
+        return int(self._size - len(self._free))
+
+    def _grow(self, min_capacity: int):
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        extra = capacity - self.capacity
+        self._pos = np.vstack([self._pos, np.zeros((extra, 3))])
+        self._rot = np.vstack([self._rot, np.zeros((extra, 3))])
+        self._scl = np.vstack([self._scl, np.ones((extra, 3))])
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+
+    def allocate(self) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = self._size
+            if row >= self.capacity:
+                self._grow(row + 1)
+            self._size += 1
+        self._pos[row] = 0.0
+        self._rot[row] = 0.0
+        self._scl[row] = 1.0
+        self._alive[row] = True
+        return row
+
+    def release(self, row: int):
+        if 0 <= row < self._size and self._alive[row]:
+            self._alive[row] = False
+            self._free.append(row)
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._alive[:self._size])
+
+    @staticmethod
+    def rows_of(geometries: Iterable["Geometry"]) -> np.ndarray:
+        return np.fromiter((geo._row for geo in geometries), dtype=np.intp)
+
+    # 批量读写
+    def get_positions(self, rows: Sequence[int]) -> np.ndarray:
+        return self._pos[np.asarray(rows, dtype=np.intp)]
+
+    def get_rotations(self, rows: Sequence[int]) -> np.ndarray:
+        return self._rot[np.asarray(rows, dtype=np.intp)]
+
+    def get_scales(self, rows: Sequence[int]) -> np.ndarray:
+        return self._scl[np.asarray(rows, dtype=np.intp)]
+
+    def set_positions(self, rows: Sequence[int], values) -> None:
+        self._pos[np.asarray(rows, dtype=np.intp)] = values
+
+    def set_rotations(self, rows: Sequence[int], values) -> None:
+        self._rot[np.asarray(rows, dtype=np.intp)] = values
+
+    def set_scales(self, rows: Sequence[int], values) -> None:
+        self._scl[np.asarray(rows, dtype=np.intp)] = values
+
+    # 批量增量（delta 可为单个 3 维向量或与 rows 对应的 N×3 数组）
+    def translate(self, rows: Sequence[int], delta) -> None:
+        self._pos[np.asarray(rows, dtype=np.intp)] += delta
+
+    def rotate(self, rows: Sequence[int], delta) -> None:
+        self._rot[np.asarray(rows, dtype=np.intp)] += delta
+
+    def scale_by(self, rows: Sequence[int], factor) -> None:
+        self._scl[np.asarray(rows, dtype=np.intp)] *= factor
+
+    def snapshot(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """导出 N×9 的 [pos, rot, scale] 数组（默认导出所有存活行）"""
+        rows = self.live_rows() if rows is None else np.asarray(rows, dtype=np.intp)
+        return np.hstack([self._pos[rows], self._rot[rows], self._scl[rows]])
+
+
+_default_table: Optional[TransformTable] = None
+
+
+def default_transform_table() -> TransformTable:
+    global _default_table
+    if _default_table is None:
+        _default_table = TransformTable()
+    return _default_table
+
+
 # ================================
 # Geometry
 # ================================
 class Geometry:
-    def __init__(self, model_path: str):
-        print(f"[Fallback][Geometry.__init__] model_path={model_path}")
+    def __init__(self, model_path: str, table: Optional[TransformTable] = None, source: Optional["Geometry"] = None):
+        print(f"[Fallback][Geometry.__init__] model_path={model_path}, shared={source is not None}")
         self._model_path = model_path
-        self._pos = [0.0, 0.0, 0.0]
-        self._rot = [0.0, 0.0, 0.0]  # Euler ZYX
-        self._scl = [1.0, 1.0, 1.0]
+        # 实例化：共享 source 的网格数据，只拥有独立的变换行
+        self._mesh_source = source._mesh_source if source is not None else self
+        self._mesh: Optional[MeshData] = None  # 首次访问时解析
+        self._table = table if table is not None else default_transform_table()
+        self._row = self._table.allocate()
+        weakref.finalize(self, self._table.release, self._row)
+
+    def instance(self) -> "Geometry":
+        """创建共享同一网格数据的新 Geometry（仅变换独立）"""
+        print(f"[Fallback][Geometry.instance] model_path={self._model_path}")
+        return Geometry(self._model_path, self._table, source=self)
+
+    # 网格数据（与原生引擎一致：同一网格的实例共享）
+    def get_mesh(self) -> MeshData:
+        owner = self._mesh_source
+        if owner._mesh is None:
+            owner._mesh = load_mesh(owner._model_path)
+        return owner._mesh
+
+    def get_vertex_buffer(self) -> np.ndarray:
+        return self.get_mesh().vertex_buffer
+
+    def get_index_buffer(self) -> np.ndarray:
+        return self.get_mesh().index_buffer
+
+    def get_bounds(self):
+        lo, hi = self.get_mesh().bounds()
+        return lo.tolist(), hi.tolist()
+
+    def triangle_count(self) -> int:
+        return self.get_mesh().triangle_count
+
+    @property
+    def transform_table(self) -> TransformTable:
+        return self._table
+
+    @property
+    def row(self) -> int:
+        return self._row
 
     def set_position(self, pos: List[float]):
         print(f"[Fallback][Geometry.set_position] pos={pos}")
-        self._pos = list(pos)
+        self._table._pos[self._row] = pos
 
     def set_rotation(self, euler: List[float]):
         print(f"[Fallback][Geometry.set_rotation] euler={euler}")
-        self._rot = list(euler)
+        self._table._rot[self._row] = euler
 
     def set_scale(self, scl: List[float]):
         print(f"[Fallback][Geometry.set_scale] scl={scl}")
-        self._scl = list(scl)
+        self._table._scl[self._row] = scl
 
     def get_position(self) -> List[float]:
         print("[Fallback][Geometry.get_position]")
-        return list(self._pos)
+        return self._table._pos[self._row].tolist()
 
     def get_rotation(self) -> List[float]:
         print("[Fallback][Geometry.get_rotation]")
-        return list(self._rot)
+        return self._table._rot[self._row].tolist()
 
     def get_scale(self) -> List[float]:
         print("[Fallback][Geometry.get_scale]")
-        return list(self._scl)
+        return self._table._scl[self._row].tolist()
 
 
 # ================================
@@ -359,6 +507,7 @@ class Scene:
 # Facade（保持与旧加载器兼容）
 # ================================
 class CoronaEngine:
+    TransformTable = TransformTable
     Geometry = Geometry
     Mechanics = Mechanics
     Optics = Optics
@@ -1,5 +1,6 @@
-from typing import Any, TypeVar, Callable, Dict
+from typing import Any, TypeVar, Callable, Dict, Optional
 import os
+import sys
 import weakref
 import logging
 
@@ -14,7 +15,14 @@ else:
     logger.info("使用 CoronaEngine / CoronaEngineFallback")
 
 from .actor import Actor
+from .actor_pool import ActorPool
 from .camera import Camera
+from .geometry import Geometry
+from .instance_batch import InstanceBatch
+from .asset_cache import AssetCache, CacheEntry
+from .obj_loader import MeshData, import_report, load_mesh
+from .lod import build_lod_chain
+from .materials import default_texture_cache, load_model_materials
 
 T = TypeVar('T')
 
@@ -22,8 +30,12 @@ T = TypeVar('T')
 class EngineObjectFactory:
     """引擎对象工厂，负责创建和缓存引擎对象"""
 
-    _actor_cache: Dict[str, Actor] = weakref.WeakValueDictionary()
     _camera_cache: Dict[str, Camera] = weakref.WeakValueDictionary()
+    # 内容寻址的网格缓存：引擎支持实例化时值为原型 Geometry（各 Actor 的 Geometry 作为其实例引用），
+    # 否则值为解析后的 MeshData（各 Actor 的包围盒/拾取/物理共享同一份网格数据）
+    _asset_cache = AssetCache()
+    # 按模型分池的 Actor 对象池（克隆积木使用）
+    _actor_pool = ActorPool()
 
     @staticmethod
     def _ensure_engine() -> None:
@@ -76,13 +88,15 @@ class EngineObjectFactory:
         return SceneCtor(light_field=light_field)
 
     @classmethod
-    def create_actor(cls, obj_path: str, use_cache: bool = True) -> Actor:
+    def create_actor(cls, obj_path: str, use_cache: bool = True, lods: bool = False) -> Actor:
         """
-        创建 Actor 对象
+        创建 Actor 对象（每次返回新的 Actor）
 
         Args:
             obj_path: 模型文件路径
-            use_cache: 是否使用缓存，默认 True
+            use_cache: 是否使用资源缓存，默认 True；同一内容的模型共享网格数据，仅创建独立变换
+            lods: 是否挂载自动生成的 LOD 链（默认 False，编辑器由应用配置 runtime.enable_lods 开启）；
+                首次生成需要解析与简化模型；各级网格与原始网格一样经资源缓存按模型共享
 
         Returns:
             Actor 包装对象
@@ -92,26 +106,177 @@ class EngineObjectFactory:
         if not os.path.exists(obj_path):
             raise FileNotFoundError(f"角色文件不存在: {obj_path}")
 
-        cache_key = os.path.basename(obj_path)
-
-        if not use_cache:
-            return cls._create_actor_internal(obj_path, cache_key)
-
-        return cls._get_or_create(
-            cls._actor_cache,
-            cache_key,
-            lambda: cls._create_actor_internal(obj_path, cache_key)
-        )
+        return cls._create_actor_internal(obj_path, os.path.basename(obj_path), use_cache, lods)
 
     @classmethod
-    def _create_actor_internal(cls, obj_path: str, name: str) -> Actor:
+    def _create_actor_internal(cls, obj_path: str, name: str, use_cache: bool = True, lods: bool = False) -> Actor:
         """内部方法：实际创建 Actor 对象（使用 OOP API）"""
+        entry = cls._acquire_mesh(obj_path) if use_cache else None
         try:
-            wrapper = Actor(obj_path)
-            wrapper.name = name
-            return wrapper
+            wrapper = Actor(obj_path, **cls._source_kwargs(entry))
+            wrapper.name = sys.intern(name)
         except Exception as e:
+            if entry is not None:
+                cls._asset_cache.release(entry.key)
             raise RuntimeError(f"无法创建 Actor: {e}") from e
+        if entry is not None:
+            weakref.finalize(wrapper._geometry, cls._asset_cache.release, entry.key)
+        if lods:
+            cls._attach_lods(wrapper, obj_path, use_cache)
+        cls._attach_materials(wrapper, obj_path)
+        return wrapper
+
+    @classmethod
+    def acquire_pooled_actor(cls, obj_path: str, lods: bool = False) -> Actor:
+        """
+        从对象池取出一个该模型的 Actor（无空闲对象时按 create_actor(obj_path, lods=lods) 新建）；
+        用完须 release_pooled_actor。复用的空闲对象保持其创建时的 LOD 设置
+        """
+        return cls._actor_pool.acquire(obj_path, lambda path: cls.create_actor(path, lods=lods))
+
+    @classmethod
+    def release_pooled_actor(cls, actor: Actor) -> bool:
+        """归还对象池分配的 Actor（须已移出场景），返回是否被池保留"""
+        return cls._actor_pool.release(actor)
+
+    @classmethod
+    def configure_actor_pool(cls, max_idle: int) -> None:
+        """设置对象池中每个模型最多保留的空闲 Actor 数"""
+        cls._actor_pool.set_max_idle(max_idle)
+
+    @classmethod
+    def actor_pool_stats(cls) -> Dict[str, int]:
+        """对象池统计：在用/空闲数量、命中/未命中/丢弃次数"""
+        return cls._actor_pool.stats()
+
+    @classmethod
+    def create_instance_batch(cls, obj_path: str, name: Optional[str] = None, use_cache: bool = True) -> InstanceBatch:
+        """
+        创建实例批次（一个共享 Geometry + 实例变换数组）
+
+        Args:
+            obj_path: 模型文件路径
+            name: 批次名称，默认取模型文件名
+            use_cache: 是否使用资源缓存（与同一模型的 Actor 共享网格数据）
+        """
+        cls._ensure_engine()
+
+        if not os.path.exists(obj_path):
+            raise FileNotFoundError(f"角色文件不存在: {obj_path}")
+
+        entry = cls._acquire_mesh(obj_path) if use_cache else None
+        try:
+            batch = InstanceBatch(obj_path, name=name, **cls._source_kwargs(entry))
+        except Exception as e:
+            if entry is not None:
+                cls._asset_cache.release(entry.key)
+            raise RuntimeError(f"无法创建 InstanceBatch: {e}") from e
+        if entry is not None:
+            weakref.finalize(batch.geometry, cls._asset_cache.release, entry.key)
+        return batch
+
+    @staticmethod
+    def _attach_materials(wrapper: Actor, obj_path: str) -> None:
+        """解析模型的 MTL 并从进程级纹理缓存获取贴图；失败只记录日志"""
+        try:
+            wrapper.materials = load_model_materials(obj_path)
+        except Exception as e:
+            logger.warning("加载材质失败 %s: %s", obj_path, e)
+
+    @classmethod
+    def _attach_lods(cls, wrapper: Actor, obj_path: str, use_cache: bool) -> None:
+        """
+        为 Actor 挂载 LOD Profile；生成失败只记录日志，Actor 仍以原始网格可用。
+        use_cache 时每级网格经资源缓存按模型只加载一次（支持实例化时共享原型 Geometry，否则共享 MeshData）
+        """
+        try:
+            chain = build_lod_chain(obj_path)
+        except Exception as e:
+            logger.warning("生成 LOD 失败 %s: %s", obj_path, e)
+            return
+        wrapper.lod_radius = chain.radius
+        for level in chain.levels:
+            entry = cls._acquire_mesh(level.path) if use_cache else None
+            try:
+                geometry = wrapper.add_lod(level.path, **cls._source_kwargs(entry))
+            except Exception as e:
+                if entry is not None:
+                    cls._asset_cache.release(entry.key)
+                logger.warning("挂载 LOD 失败 %s: %s", level.path, e)
+                return
+            if entry is not None:
+                weakref.finalize(geometry, cls._asset_cache.release, entry.key)
+
+    @classmethod
+    def _acquire_mesh(cls, obj_path: str) -> Optional[CacheEntry]:
+        """
+        从资源缓存获取共享网格（已增加引用计数）：引擎支持实例化时为原型 Geometry，否则为解析后的 MeshData；
+        模型无法由 Python 侧解析时返回 None（不使用缓存）
+        """
+        if Geometry.supports_instancing():
+            return cls._asset_cache.acquire(obj_path, cls._load_mesh_prototype)
+        try:
+            return cls._asset_cache.acquire(obj_path, cls._load_mesh_data)
+        except Exception as e:
+            logger.debug("无法解析网格 %s，跳过资源缓存: %s", obj_path, e)
+            return None
+
+    @staticmethod
+    def _source_kwargs(entry: Optional[CacheEntry]) -> Dict[str, Any]:
+        """把缓存条目转换为 Actor / InstanceBatch 的共享参数"""
+        if entry is None:
+            return {}
+        if isinstance(entry.value, MeshData):
+            return {"mesh": entry.value}
+        return {"geometry_source": entry.value}
+
+    @staticmethod
+    def _load_mesh_prototype(abs_path: str):
+        """原型 Geometry 与其网格的内存字节数（统计每次命中节省的内存）；网格无法解析时退回文件大小"""
+        prototype = Geometry(abs_path, name=os.path.basename(abs_path))
+        try:
+            byte_size = prototype.get_mesh().nbytes
+        except Exception as e:
+            logger.debug("无法读取网格大小 %s，按文件大小计: %s", abs_path, e)
+            byte_size = os.path.getsize(abs_path)
+        return prototype, byte_size
+
+    @staticmethod
+    def _load_mesh_data(abs_path: str):
+        mesh = load_mesh(abs_path)
+        return mesh, mesh.nbytes
+
+    @staticmethod
+    def configure_texture_cache(budget_bytes: int) -> None:
+        """设置纹理缓存的字节预算（含 mip 链），超出部分按 LRU 淘汰未被引用的纹理"""
+        default_texture_cache().set_budget(budget_bytes)
+
+    @staticmethod
+    def texture_stats() -> Dict[str, int]:
+        """进程级纹理缓存统计"""
+        return default_texture_cache().stats()
+
+    @classmethod
+    def configure_asset_cache(cls, budget_bytes: int) -> None:
+        """设置网格缓存的字节预算，超出部分按 LRU 淘汰未被引用的条目"""
+        cls._asset_cache.set_budget(budget_bytes)
+
+    @classmethod
+    def mesh_stats(cls) -> Dict[str, Any]:
+        """
+        共享网格统计：已加载网格数、实例数、节省的字节数、缓存命中/未命中/淘汰以及各资源的导入优化报告；
+        mode 为 instanced（引擎网格共享）或 mesh_data（引擎不支持实例化，只共享 Python 侧网格数据）
+        """
+        entries = cls._asset_cache.entries()
+        stats: Dict[str, Any] = cls._asset_cache.stats()
+        stats.update({
+            "mode": "instanced" if Geometry.supports_instancing() else "mesh_data",
+            "loaded_meshes": len(entries),
+            "instances": sum(e.refs for e in entries),
+            "bytes_saved": sum(max(e.refs - 1, 0) * e.byte_size for e in entries),
+            "assets": {e.path: report for e in entries if (report := import_report(e.path)) is not None},
+        })
+        return stats
 
     @classmethod
     def create_camera(cls, name: str = "MainCamera", use_cache: bool = True) -> Camera:
@@ -150,10 +315,15 @@ class EngineObjectFactory:
         清空缓存
 
         Args:
-            cache_type: 缓存类型 ("actor", "camera", "all")
+            cache_type: 缓存类型 ("camera", "mesh", "texture", "actor", "all")；mesh/texture 只清理未被引用的条目，
+                actor 只丢弃对象池中的空闲 Actor
         """
         if cache_type in ("actor", "all"):
-            cls._actor_cache.clear()
+            cls._actor_pool.clear()
+        if cache_type in ("mesh", "all"):
+            cls._asset_cache.clear()
+        if cache_type in ("texture", "all"):
+            default_texture_cache().clear()
         if cache_type in ("camera", "all"):
             cls._camera_cache.clear()
 
@@ -1,9 +1,27 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
+import os
+import sys
+
+import numpy as np
 
 from .engine_import import load_corona_engine
+from .obj_loader import MeshData, load_mesh
 
 CoronaEngine = load_corona_engine()
 
+# 变换镜像以元组保存；零向量与单位缩放是绝大多数对象的取值，所有 Geometry 共享同一个元组
+_ZERO3 = (0.0, 0.0, 0.0)
+_ONE3 = (1.0, 1.0, 1.0)
+
+
+def _vec3(values) -> tuple:
+    vec = (float(values[0]), float(values[1]), float(values[2]))
+    if vec == _ZERO3:
+        return _ZERO3
+    if vec == _ONE3:
+        return _ONE3
+    return vec
+
 
 class Geometry:
     """
@@ -15,13 +33,19 @@ class Geometry:
         geo.set_rotation([0, 0, 0])
     """
 
-    def __init__(self, model_path: str, name: str = "Geometry"):
+    # __weakref__：工厂用 weakref.finalize 在 Geometry 回收时释放共享资源
+    __slots__ = ('engine_obj', 'shared', 'name', 'model_path', '_pos', '_rot', '_scl', '_mesh', '__weakref__')
+
+    def __init__(self, model_path: str, name: str = "Geometry", source: Optional["Geometry"] = None,
+                 mesh: Optional[MeshData] = None):
         """
         创建 Geometry 对象
 
         Args:
             model_path: 模型文件路径
             name: 几何体名称
+            source: 可选的已加载 Geometry；引擎支持实例化时共享其网格数据，仅创建独立变换
+            mesh: 可选的已解析网格数据（资源缓存共享），包围盒/拾取等 Python 侧查询直接使用
         """
         if CoronaEngine is None:
             raise RuntimeError("CoronaEngine 未初始化")
@@ -30,51 +54,172 @@ class Geometry:
         if GeometryCtor is None:
             raise RuntimeError("CoronaEngine 未提供 Geometry 构造器")
 
-        self.engine_obj = GeometryCtor(model_path)
-        self.name = name
-        self.model_path = model_path
+        if source is not None and hasattr(source.engine_obj, 'instance'):
+            self.engine_obj = source.engine_obj.instance()
+            self.shared = True
+        else:
+            self.engine_obj = GeometryCtor(model_path)
+            self.shared = False
+        self.name = sys.intern(str(name))
+        self.model_path = sys.intern(os.fspath(model_path))
+
+        # 本地 TRS 镜像（元组）：读取直接走缓存，写入时一次性推送到引擎
+        self.resync()
+
+        self._mesh: Optional[MeshData] = mesh
+
+    # 网格数据：引擎提供时直接取用，否则由 Python 侧 OBJ 解析（同内容的模型只解析一次）
+    def get_mesh(self) -> MeshData:
+        if self._mesh is None:
+            get_mesh = getattr(self.engine_obj, 'get_mesh', None)
+            self._mesh = get_mesh() if get_mesh is not None else load_mesh(self.model_path)
+        return self._mesh
+
+    def get_vertex_buffer(self):
+        """顶点位置缓冲 (N, 3) float32"""
+        return self.get_mesh().vertex_buffer
+
+    def get_index_buffer(self):
+        """三角形索引缓冲 (3T,) uint32"""
+        return self.get_mesh().index_buffer
+
+    def get_bounds(self):
+        """局部空间包围盒 (min[x,y,z], max[x,y,z])"""
+        lo, hi = self.get_mesh().bounds()
+        return lo.tolist(), hi.tolist()
+
+    def triangle_count(self) -> int:
+        return self.get_mesh().triangle_count
+
+    @staticmethod
+    def supports_instancing() -> bool:
+        """当前引擎的 Geometry 是否支持共享网格实例化"""
+        GeometryCtor = getattr(CoronaEngine, 'Geometry', None)
+        return GeometryCtor is not None and hasattr(GeometryCtor, 'instance')
+
+    def resync(self):
+        """从引擎重新读取变换到本地镜像（原生代码修改了变换后调用）"""
+        try:
+            self._pos = _vec3(self.engine_obj.get_position())
+            self._rot = _vec3(self.engine_obj.get_rotation())
+            self._scl = _vec3(self.engine_obj.get_scale())
+        except Exception as e:
+            raise RuntimeError(f"Geometry.resync 失败: {e}") from e
 
     def set_position(self, position: List[float]):
         """设置局部位置 [x, y, z]"""
+        position = [float(position[0]), float(position[1]), float(position[2])]
         try:
             self.engine_obj.set_position(position)
         except Exception as e:
             raise RuntimeError(f"Geometry.set_position 失败: {e}") from e
+        self._pos = _vec3(position)
 
     def get_position(self) -> List[float]:
-        """获取局部位置 [x, y, z]"""
-        try:
-            return self.engine_obj.get_position()
-        except Exception as e:
-            raise RuntimeError(f"Geometry.get_position 失败: {e}") from e
+        """获取局部位置 [x, y, z]（读取本地镜像）"""
+        return list(self._pos)
 
     def set_rotation(self, euler: List[float]):
         """设置局部旋转（欧拉角 ZYX 顺序）[pitch, yaw, roll]"""
+        euler = [float(euler[0]), float(euler[1]), float(euler[2])]
         try:
             self.engine_obj.set_rotation(euler)
         except Exception as e:
             raise RuntimeError(f"Geometry.set_rotation 失败: {e}") from e
+        self._rot = _vec3(euler)
 
     def get_rotation(self) -> List[float]:
-        """获取局部旋转（欧拉角）[pitch, yaw, roll]"""
-        try:
-            return self.engine_obj.get_rotation()
-        except Exception as e:
-            raise RuntimeError(f"Geometry.get_rotation 失败: {e}") from e
+        """获取局部旋转（欧拉角）[pitch, yaw, roll]（读取本地镜像）"""
+        return list(self._rot)
 
     def set_scale(self, scale: List[float]):
         """设置局部缩放 [x, y, z]"""
+        scale = [float(scale[0]), float(scale[1]), float(scale[2])]
         try:
             self.engine_obj.set_scale(scale)
         except Exception as e:
             raise RuntimeError(f"Geometry.set_scale 失败: {e}") from e
+        self._scl = _vec3(scale)
 
     def get_scale(self) -> List[float]:
-        """获取局部缩放 [x, y, z]"""
+        """获取局部缩放 [x, y, z]（读取本地镜像）"""
+        return list(self._scl)
+
+    # 相对变换：基于本地镜像计算，只向引擎写入一次
+    def translate(self, delta: List[float]):
+        """位置增量 [dx, dy, dz]"""
+        pos = self._pos
+        self.set_position([pos[0] + delta[0], pos[1] + delta[1], pos[2] + delta[2]])
+
+    def rotate_by(self, delta: List[float]):
+        """旋转增量（欧拉角）"""
+        rot = self._rot
+        self.set_rotation([rot[0] + delta[0], rot[1] + delta[1], rot[2] + delta[2]])
+
+    def scale_by(self, factor: List[float]):
+        """按轴缩放倍率"""
+        scl = self._scl
+        self.set_scale([scl[0] * factor[0], scl[1] * factor[1], scl[2] * factor[2]])
+
+    @staticmethod
+    def _group_by_table(engine_objs: Sequence[Any]):
+        """按引擎变换表分组：返回 ([(table, 下标列表)], 无变换表的下标列表)"""
+        groups: Dict[int, tuple] = {}
+        single: List[int] = []
+        for i, obj in enumerate(engine_objs):
+            table = getattr(obj, 'transform_table', None)
+            if table is None or not hasattr(table, 'set_positions'):
+                single.append(i)
+                continue
+            group = groups.get(id(table))
+            if group is None:
+                group = groups[id(table)] = (table, [])
+            group[1].append(i)
+        return list(groups.values()), single
+
+    @staticmethod
+    def set_transforms_batch(geometries: Sequence["Geometry"], positions, rotations, scales):
+        """
+        批量写入 N 个 Geometry 的变换（(N, 3) 数组）。
+        引擎 Geometry 暴露 transform_table/row（SoA 变换表）时按表一次性写入，否则逐个调用引擎。
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        rotations = np.asarray(rotations, dtype=np.float64).reshape(-1, 3)
+        scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+        pos_list, rot_list, scl_list = positions.tolist(), rotations.tolist(), scales.tolist()
+        engine_objs = [geo.engine_obj for geo in geometries]
+        try:
+            groups, single = Geometry._group_by_table(engine_objs)
+            for i in single:
+                engine_objs[i].set_position(pos_list[i])
+                engine_objs[i].set_rotation(rot_list[i])
+                engine_objs[i].set_scale(scl_list[i])
+            for table, index in groups:
+                rows = [engine_objs[i].row for i in index]
+                table.set_positions(rows, positions[index])
+                table.set_rotations(rows, rotations[index])
+                table.set_scales(rows, scales[index])
+        except Exception as e:
+            raise RuntimeError(f"Geometry.set_transforms_batch 失败: {e}") from e
+        for geo, pos, rot, scl in zip(geometries, pos_list, rot_list, scl_list):
+            geo._pos, geo._rot, geo._scl = _vec3(pos), _vec3(rot), _vec3(scl)
+
+    @staticmethod
+    def set_positions_batch(geometries: Sequence["Geometry"], positions):
+        """批量只写入位置（(N, 3) 数组），写入方式同 set_transforms_batch"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        pos_list = positions.tolist()
+        engine_objs = [geo.engine_obj for geo in geometries]
         try:
-            return self.engine_obj.get_scale()
+            groups, single = Geometry._group_by_table(engine_objs)
+            for i in single:
+                engine_objs[i].set_position(pos_list[i])
+            for table, index in groups:
+                table.set_positions([engine_objs[i].row for i in index], positions[index])
         except Exception as e:
-            raise RuntimeError(f"Geometry.get_scale 失败: {e}") from e
+            raise RuntimeError(f"Geometry.set_positions_batch 失败: {e}") from e
+        for geo, pos in zip(geometries, pos_list):
+            geo._pos = _vec3(pos)
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典表示"""
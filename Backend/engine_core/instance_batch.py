@@ -0,0 +1,246 @@
+"""
+实例批次：一个共享 Geometry + 每实例变换数组
+
+- 草地、人群、碎片等大量同模型对象不再各自创建 Actor 包装与引擎对象：整个批次只有一个引擎 Actor，
+  实例变换保存在 (N, 10) 数组中，每行为 [px, py, pz, qx, qy, qz, qw, sx, sy, sz]（世界空间，四元数已归一化）
+- 增删改均为批量 NumPy 操作；修改只标记 dirty，Scene.update() 时一次性上传给引擎
+- 引擎 Geometry 提供 set_instance_transforms 时按 float32 (N, 10) 上传；否则只在 Python 层维护
+  （拾取、统计与快照仍然可用）
+- 拾取：实例世界包围盒做射线宽相，按进入距离由近到远在实例局部空间中对共享网格的 BVH 求交
+"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+import logging
+import math
+import os
+
+import numpy as np
+
+from .actor import Actor
+from .geometry import Geometry
+from .obj_loader import MeshData
+from .picking import PickResult, closest_hit
+from .transform_math import euler_to_quats, quat_trs_matrices, ray_aabbs, transform_aabbs
+
+logger = logging.getLogger(__name__)
+
+# 每个实例一行：位置 3 + 四元数 4 + 缩放 3
+INSTANCE_STRIDE = 10
+_IDENTITY = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0])
+
+
+class InstanceBatch:
+    """
+    实例批次包装类。
+
+    使用方式：
+        batch = EngineObjectFactory.create_instance_batch("grass.obj")
+        batch.add_trs(positions)                 # (N, 3)，旋转/缩放可选
+        scene.add_batch(batch)
+        batch.set_positions(range(10), new_pos)  # 批量修改，下一帧统一上传
+    """
+
+    def __init__(self, path: str, name: Optional[str] = None, geometry_source: Optional[Geometry] = None,
+                 capacity: int = 64, mesh: Optional[MeshData] = None):
+        # 整个批次只持有一个引擎 Actor（共享网格），实例不创建任何引擎对象
+        self._actor = Actor(path, geometry_source=geometry_source, mesh=mesh)
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self._data = np.tile(_IDENTITY, (max(int(capacity), 1), 1))
+        self._count = 0
+        self._dirty = True
+        # 实例世界包围盒缓存（变换修改后失效）
+        self._bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._uploads = 0
+
+    @property
+    def engine_obj(self) -> Any:
+        return self._actor.engine_obj
+
+    @property
+    def geometry(self) -> Geometry:
+        return self._actor._geometry
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def transforms(self) -> np.ndarray:
+        """(N, 10) 实例变换的只读视图；修改请使用 update/set_positions"""
+        view = self._data[:self._count]
+        view.flags.writeable = False
+        return view
+
+    # ---- 增删改 ----
+    def _normalize(self, transforms) -> np.ndarray:
+        transforms = np.array(transforms, dtype=np.float64, ndmin=2)
+        if transforms.shape[1] != INSTANCE_STRIDE:
+            raise ValueError(f"实例变换必须为 (N, {INSTANCE_STRIDE}) 数组，实际为 {transforms.shape}")
+        norm = np.linalg.norm(transforms[:, 3:7], axis=1, keepdims=True)
+        if np.any(norm == 0.0):
+            raise ValueError("实例四元数不能为零")
+        transforms[:, 3:7] /= norm
+        return transforms
+
+    def _indices(self, indices) -> np.ndarray:
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        if indices.size and (indices.min() < -self._count or indices.max() >= self._count):
+            raise IndexError(f"实例下标越界（共 {self._count} 个实例）")
+        return indices % max(self._count, 1)
+
+    def _touch(self) -> None:
+        self._dirty = True
+        self._bounds = None
+
+    def add(self, transforms) -> np.ndarray:
+        """追加 (M, 10) 实例变换，返回新实例的下标"""
+        transforms = self._normalize(transforms)
+        start, end = self._count, self._count + transforms.shape[0]
+        if end > self._data.shape[0]:
+            capacity = self._data.shape[0]
+            while capacity < end:
+                capacity *= 2
+            data = np.tile(_IDENTITY, (capacity, 1))
+            data[:self._count] = self._data[:self._count]
+            self._data = data
+        self._data[start:end] = transforms
+        self._count = end
+        self._touch()
+        return np.arange(start, end)
+
+    def add_trs(self, positions, rotations=None, scales=None) -> np.ndarray:
+        """按 (M, 3) 位置、欧拉角（弧度，与 Actor 相同约定）与缩放追加实例，旋转/缩放缺省为单位变换"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        transforms = np.tile(_IDENTITY, (positions.shape[0], 1))
+        transforms[:, 0:3] = positions
+        if rotations is not None:
+            transforms[:, 3:7] = euler_to_quats(rotations)
+        if scales is not None:
+            transforms[:, 7:10] = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+        return self.add(transforms)
+
+    def remove(self, indices) -> int:
+        """删除实例，其后的实例下标依次前移（保持相对顺序），返回删除数量"""
+        indices = np.unique(self._indices(indices))
+        if not indices.size:
+            return 0
+        keep = np.ones(self._count, dtype=bool)
+        keep[indices] = False
+        remaining = int(keep.sum())
+        self._data[:remaining] = self._data[:self._count][keep]
+        self._data[remaining:self._count] = _IDENTITY
+        self._count = remaining
+        self._touch()
+        return int(indices.size)
+
+    def clear(self) -> None:
+        self._data[:self._count] = _IDENTITY
+        self._count = 0
+        self._touch()
+
+    def update(self, indices, transforms) -> None:
+        """覆盖指定实例的完整变换 (M, 10)"""
+        indices = self._indices(indices)
+        self._data[indices] = self._normalize(transforms)
+        self._touch()
+
+    def set_positions(self, indices, positions) -> None:
+        """只修改指定实例的位置 (M, 3)（或一个位置广播到全部指定实例）"""
+        self._data[self._indices(indices), 0:3] = np.asarray(positions, dtype=np.float64)
+        self._touch()
+
+    def translate(self, indices, delta) -> None:
+        """指定实例的位置增量（单个向量或 (M, 3)）"""
+        self._data[self._indices(indices), 0:3] += np.asarray(delta, dtype=np.float64)
+        self._touch()
+
+    # ---- 查询 ----
+    def matrices(self) -> np.ndarray:
+        """(N, 4, 4) 实例局部到世界矩阵"""
+        data = self._data[:self._count]
+        return quat_trs_matrices(data[:, 0:3], data[:, 3:7], data[:, 7:10])
+
+    def world_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """各实例的世界包围盒 (N, 3) lo/hi（缓存到下一次修改）"""
+        if self._bounds is None:
+            lo, hi = self.geometry.get_bounds()
+            count = self._count
+            self._bounds = transform_aabbs(np.tile(np.asarray(lo, dtype=np.float64), (count, 1)),
+                                           np.tile(np.asarray(hi, dtype=np.float64), (count, 1)),
+                                           self.matrices())
+        return self._bounds
+
+    def bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """整个批次的世界包围盒；没有实例时为 None"""
+        if not self._count:
+            return None
+        lo, hi = self.world_bounds()
+        return lo.min(axis=0), hi.max(axis=0)
+
+    def pick(self, origin: Sequence[float], direction: Sequence[float],
+             max_distance: float = math.inf) -> Optional[PickResult]:
+        """世界空间射线拾取实例：返回 PickResult(actor=批次, instance=实例下标)，未命中返回 None"""
+        if not self._count:
+            return None
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+        lo, hi = self.world_bounds()
+        hit, t_near = ray_aabbs(origin, direction, lo, hi, max_distance)
+        candidates = np.flatnonzero(hit)
+        if not candidates.size:
+            return None
+        candidates = candidates[np.argsort(t_near[candidates], kind='stable')]
+        data = self._data[candidates]
+        matrices = quat_trs_matrices(data[:, 0:3], data[:, 3:7], data[:, 7:10])
+        mesh = self.geometry.get_mesh()
+        result = closest_hit(origin, direction, [(int(i), float(t_near[i])) for i in candidates], matrices,
+                             lambda _: mesh, max_distance)
+        if result is None:
+            return None
+        instance, triangle, t = result
+        point = origin + direction * t
+        return PickResult(self, triangle, float(t), (float(point[0]), float(point[1]), float(point[2])), instance)
+
+    # ---- 引擎同步 ----
+    def flush(self) -> bool:
+        """把 dirty 的实例变换一次性上传给引擎，返回是否上传"""
+        if not self._dirty:
+            return False
+        self._dirty = False
+        upload = getattr(self.geometry.engine_obj, 'set_instance_transforms', None)
+        if upload is None:
+            return False
+        try:
+            upload(np.ascontiguousarray(self._data[:self._count], dtype=np.float32))
+        except Exception as e:
+            raise RuntimeError(f"InstanceBatch.flush 失败: {e}") from e
+        self._uploads += 1
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """快照条目：整个批次为一项，附带实例数"""
+        return {
+            'name': self.name,
+            'path': self.path,
+            'count': self._count,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'count': self._count,
+            'capacity': int(self._data.shape[0]),
+            'bytes': int(self._data[:self._count].nbytes),
+            'uploads': self._uploads,
+            'dirty': self._dirty,
+        }
+
+    def __repr__(self):
+        return f"InstanceBatch(name={self.name}, path={self.path}, count={self._count})"
+
+
+__all__ = ["INSTANCE_STRIDE", "InstanceBatch"]
@@ -1,4 +1,6 @@
 ﻿from typing import Any, Dict
+import weakref
+from .animation_clock import default_animation_clock
 from .engine_import import load_corona_engine
 from .geometry import Geometry
 CoronaEngine = load_corona_engine()
@@ -13,16 +15,51 @@ class Kinematics:
         self.engine_obj = KinematicsCtor(geo_obj)
         self.name = name
         self.geometry = geometry
+        # 播放时间/速度保存在共享动画时钟的一行中，由 SceneManager.tick 每帧统一推进
+        self._clock = default_animation_clock()
+        self._slot = self._clock.allocate(self._engine_clip_length())
+        # 非循环片段播放到末尾时同步停止引擎侧播放
+        self._clock.set_finished_callback(self._slot, self.engine_obj.stop_animation)
+        weakref.finalize(self, self._clock.release, self._slot)
+    def _engine_clip_length(self) -> float:
+        """引擎提供片段长度时读取（未提供时为 0，需调用 set_clip_length，否则时间不回绕）"""
+        getter = getattr(self.engine_obj, 'get_animation_length', None)
+        if getter is None:
+            return 0.0
+        try:
+            return max(float(getter()), 0.0)
+        except Exception:
+            return 0.0
     def set_animation(self, animation_index: int):
         self.engine_obj.set_animation(animation_index)
+        length = self._engine_clip_length()
+        if length > 0:
+            self._clock.set_clip(self._slot, length, self._clock.is_looping(self._slot))
+        self._clock.seek(self._slot, 0.0)
+    def set_clip_length(self, length: float, loop: bool = True):
+        """当前动画片段长度（秒），循环时时间按长度回绕，否则播放到末尾停止"""
+        self._clock.set_clip(self._slot, float(length), loop)
     def play_animation(self, speed: float = 1.0):
         self.engine_obj.play_animation(speed)
+        self._clock.play(self._slot, float(speed))
     def stop_animation(self):
+        """停止（暂停）播放，保留当前时间"""
         self.engine_obj.stop_animation()
+        self._clock.pause(self._slot)
+    def seek(self, time: float):
+        self._clock.seek(self._slot, float(time))
+        if hasattr(self.engine_obj, 'set_current_time'):
+            self.engine_obj.set_current_time(self._clock.time(self._slot))
+    def set_speed(self, speed: float):
+        self._clock.set_speed(self._slot, float(speed))
+        if self._clock.is_playing(self._slot):
+            self.engine_obj.play_animation(float(speed))
+    def is_playing(self) -> bool:
+        return self._clock.is_playing(self._slot)
     def get_animation_index(self) -> int:
         return self.engine_obj.get_animation_index()
     def get_current_time(self) -> float:
-        return self.engine_obj.get_current_time()
+        return self._clock.time(self._slot)
     def to_dict(self) -> Dict[str, Any]:
         return {'name': self.name, 'engine_obj': self.engine_obj}
     def __repr__(self):
@@ -0,0 +1,306 @@
+"""
+LOD 链生成与按距离切换
+
+- 顶点聚类简化（NumPy 向量化）：按网格单元合并顶点，属性取均值，去除退化/重复三角形
+- 每一级写成 OBJ 文件缓存在磁盘（目录名 = 源文件内容哈希 + LOD_VERSION），原生引擎可直接按路径加载
+- LodSelector：按 相机距离 / 包围半径 一次性计算所有 Actor 的目标级别，带滞回，只对级别变化的 Actor 调用 set_active_profile
+"""
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+import json
+import logging
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from .asset_cache import file_content_hash
+from .mesh_cache import default_mesh_cache
+from .obj_loader import MeshData, load_mesh
+
+logger = logging.getLogger(__name__)
+
+# 简化算法或输出格式变化时递增，使磁盘上的 LOD 失效
+LOD_VERSION = 1
+# 各级聚类网格在最长轴上的单元数
+LOD_RESOLUTIONS = (64, 32, 16, 8)
+# 三角形数少于该值的模型不生成 LOD
+LOD_MIN_TRIANGLES = 512
+# 相邻两级三角形数至少缩减到该比例，否则停止生成
+LOD_MAX_RATIO = 0.75
+# 切换到第 i 级（1 基）的距离 = 包围半径 × LOD_DISTANCE_FACTORS[i-1]
+LOD_DISTANCE_FACTORS = (12.0, 24.0, 48.0, 96.0)
+
+_META_FILE = "lods.json"
+
+
+@dataclass(frozen=True)
+class LodLevel:
+    """一级 LOD：OBJ 文件路径与规模"""
+    path: str
+    triangles: int
+    vertices: int
+
+
+@dataclass(frozen=True)
+class LodChain:
+    """源模型的 LOD 链（不含原始网格本身）"""
+    source_path: str
+    radius: float
+    base_triangles: int
+    levels: List[LodLevel]
+
+
+def cluster_decimate(mesh: MeshData, resolution: int) -> MeshData:
+    """顶点聚类简化：最长轴划分为 resolution 个单元，同一单元内的顶点合并为其均值"""
+    positions = np.asarray(mesh.positions, dtype=np.float64)
+    indices = np.asarray(mesh.indices, dtype=np.int64)
+    lo, hi = positions.min(axis=0), positions.max(axis=0)
+    cell = float((hi - lo).max()) / resolution or 1.0
+    q = np.minimum(((positions - lo) / cell).astype(np.int64), resolution)
+    side = resolution + 1
+    cell_ids = (q[:, 0] * side + q[:, 1]) * side + q[:, 2]
+    _, cluster = np.unique(cell_ids, return_inverse=True)
+    cluster_count = int(cluster.max()) + 1
+    weights = np.bincount(cluster, minlength=cluster_count).astype(np.float64)[:, None]
+
+    def _mean(values: np.ndarray) -> np.ndarray:
+        return np.stack(
+            [np.bincount(cluster, weights=values[:, k], minlength=cluster_count) for k in range(values.shape[1])],
+            axis=1,
+        ) / weights
+
+    # 属性按顶点对齐时才能随顶点聚类（导入优化后的网格均满足）
+    vertex_aligned = mesh.uv_indices is None and mesh.normal_indices is None
+    new_positions = _mean(positions)
+    new_uvs = _mean(np.asarray(mesh.uvs, dtype=np.float64)) if vertex_aligned and mesh.uvs is not None else None
+    new_normals = None
+    if vertex_aligned and mesh.normals is not None:
+        new_normals = _mean(np.asarray(mesh.normals, dtype=np.float64))
+        lengths = np.linalg.norm(new_normals, axis=1, keepdims=True)
+        np.divide(new_normals, lengths, out=new_normals, where=lengths > 0)
+
+    tris = cluster[indices]
+    keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+    material_ids = np.zeros(indices.shape[0], dtype=np.int64)
+    for order, (_, start) in enumerate(mesh.material_ranges):
+        material_ids[start:] = order
+    tris, material_ids = tris[keep], material_ids[keep]
+    # 合并后可能出现顶点集合相同的重复三角形，保留第一次出现的
+    _, first = np.unique(np.sort(tris, axis=1), axis=0, return_index=True)
+    first.sort()
+    tris, material_ids = tris[first], material_ids[first]
+
+    used, remap = np.unique(tris, return_inverse=True)
+    material_ranges = [
+        (name, int(np.searchsorted(material_ids, order, side='left')))
+        for order, (name, _) in enumerate(mesh.material_ranges)
+    ]
+    return MeshData(
+        positions=new_positions[used].astype(np.float32),
+        indices=remap.reshape(-1, 3).astype(np.uint32),
+        uvs=new_uvs[used].astype(np.float32) if new_uvs is not None else None,
+        normals=new_normals[used].astype(np.float32) if new_normals is not None else None,
+        material_ranges=material_ranges,
+        mtllibs=list(mesh.mtllibs),
+        source_path=mesh.source_path,
+    )
+
+
+def write_obj(mesh: MeshData, path: str, mtl_dir: Optional[str] = None) -> None:
+    """把按顶点对齐的 MeshData 写成 OBJ；mtllib 以绝对路径引用源模型目录下的材质文件"""
+    buf = BytesIO()
+    buf.write(f"# LOD of {mesh.source_path}\n".encode("utf-8"))
+    for lib in mesh.mtllibs:
+        lib_path = os.path.join(mtl_dir, lib) if mtl_dir else lib
+        buf.write(f"mtllib {lib_path}\n".encode("utf-8"))
+    np.savetxt(buf, mesh.positions, fmt="v %.6f %.6f %.6f")
+    if mesh.uvs is not None:
+        np.savetxt(buf, mesh.uvs, fmt="vt %.6f %.6f")
+    if mesh.normals is not None:
+        np.savetxt(buf, mesh.normals, fmt="vn %.6f %.6f %.6f")
+
+    if mesh.uvs is not None and mesh.normals is not None:
+        corner, columns = "%d/%d/%d", 3
+    elif mesh.uvs is not None:
+        corner, columns = "%d/%d", 2
+    elif mesh.normals is not None:
+        corner, columns = "%d//%d", 2
+    else:
+        corner, columns = "%d", 1
+    faces = np.repeat(mesh.indices.astype(np.int64) + 1, columns, axis=1)
+    fmt = "f " + " ".join([corner] * 3)
+
+    ranges = list(mesh.material_ranges) or [("", 0)]
+    bounds = [start for _, start in ranges[1:]] + [mesh.triangle_count]
+    for (name, start), end in zip(ranges, bounds):
+        if name:
+            buf.write(f"usemtl {name}\n".encode("utf-8"))
+        if end > start:
+            np.savetxt(buf, faces[start:end], fmt=fmt)
+    with open(path, "wb") as f:
+        f.write(buf.getvalue())
+
+
+def _lod_root() -> Path:
+    return default_mesh_cache().root.parent / "lods"
+
+
+def _load_chain(entry: Path) -> Optional[LodChain]:
+    meta_path = entry / _META_FILE
+    if not meta_path.is_file():
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        levels = [LodLevel(str(entry / lvl["file"]), int(lvl["triangles"]), int(lvl["vertices"])) for lvl in meta["levels"]]
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("LOD 缓存条目损坏，重新生成 %s: %s", entry, exc)
+        return None
+    if not all(os.path.exists(level.path) for level in levels):
+        return None
+    return LodChain(meta["source_path"], float(meta["radius"]), int(meta["base_triangles"]), levels)
+
+
+def _invalidate_stale(root: Path, source_path: str, keep: str) -> None:
+    """删除同一源文件的旧 LOD 条目（源文件已修改或 LOD_VERSION 已升级）"""
+    for meta_path in root.glob(f"*/{_META_FILE}"):
+        if meta_path.parent.name == keep:
+            continue
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if meta.get("source_path") == source_path:
+            shutil.rmtree(meta_path.parent, ignore_errors=True)
+
+
+# (内容哈希) -> LodChain；进程内只查一次磁盘
+_chain_memo: Dict[str, LodChain] = {}
+
+
+def build_lod_chain(path: str, resolutions: Sequence[int] = LOD_RESOLUTIONS) -> LodChain:
+    """
+    生成（或从磁盘缓存读取）模型的 LOD 链。
+    三角形数不足 LOD_MIN_TRIANGLES 或简化收益不足时链可能为空。
+    """
+    abs_path = os.path.abspath(path)
+    content_hash = file_content_hash(abs_path)
+    chain = _chain_memo.get(content_hash)
+    if chain is not None:
+        return chain
+
+    root = _lod_root()
+    entry = root / f"{content_hash}-v{LOD_VERSION}"
+    chain = _load_chain(entry)
+    if chain is None:
+        chain = _generate_chain(abs_path, entry, resolutions)
+        _invalidate_stale(root, abs_path, entry.name)
+    _chain_memo[content_hash] = chain
+    return chain
+
+
+def _generate_chain(abs_path: str, entry: Path, resolutions: Sequence[int]) -> LodChain:
+    mesh = load_mesh(abs_path)
+    lo, hi = mesh.bounds()
+    radius = float(np.linalg.norm(np.asarray(hi, dtype=np.float64) - np.asarray(lo, dtype=np.float64)) / 2.0)
+    meta = {
+        "version": LOD_VERSION,
+        "source_path": abs_path,
+        "radius": radius,
+        "base_triangles": mesh.triangle_count,
+        "levels": [],
+    }
+
+    tmp = entry.parent / f".tmp-{uuid.uuid4().hex}"
+    try:
+        tmp.mkdir(parents=True, exist_ok=True)
+        previous = mesh.triangle_count
+        if previous >= LOD_MIN_TRIANGLES:
+            for level, resolution in enumerate(resolutions, start=1):
+                simplified = cluster_decimate(mesh, resolution)
+                if simplified.triangle_count == 0 or simplified.triangle_count > previous * LOD_MAX_RATIO:
+                    break
+                file_name = f"lod{level}.obj"
+                write_obj(simplified, str(tmp / file_name), os.path.dirname(abs_path))
+                meta["levels"].append({
+                    "file": file_name,
+                    "resolution": resolution,
+                    "triangles": simplified.triangle_count,
+                    "vertices": simplified.vertex_count,
+                })
+                previous = simplified.triangle_count
+        (tmp / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        if entry.exists():
+            shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+    except OSError as exc:
+        shutil.rmtree(tmp, ignore_errors=True)
+        chain = _load_chain(entry)
+        if chain is not None:
+            return chain
+        logger.warning("写入 LOD 缓存失败 %s: %s", entry, exc)
+        return LodChain(abs_path, radius, mesh.triangle_count, [])
+
+    logger.info(
+        "生成 LOD %s: %s", abs_path,
+        " -> ".join([str(mesh.triangle_count)] + [str(lvl["triangles"]) for lvl in meta["levels"]]),
+    )
+    return _load_chain(entry) or LodChain(abs_path, radius, mesh.triangle_count, [])
+
+
+class LodSelector:
+    """
+    按距离为一组 Actor 选择 LOD 级别。
+
+    级别阈值为 包围半径 × distance_factors（考虑 Actor 缩放），hysteresis 为切换滞回比例，
+    防止在阈值附近来回切换。
+    """
+
+    def __init__(self, distance_factors: Sequence[float] = LOD_DISTANCE_FACTORS, hysteresis: float = 0.1):
+        self.distance_factors = np.asarray(distance_factors, dtype=np.float64)
+        self.hysteresis = float(hysteresis)
+        self._last_switches = 0
+        self._total_switches = 0
+
+    def select(self, actors: Iterable, camera_position: Sequence[float]) -> int:
+        """计算并应用各 Actor 的 LOD 级别，返回本次切换的 Actor 数"""
+        candidates = [actor for actor in actors if actor.lod_count]
+        if not candidates:
+            self._last_switches = 0
+            return 0
+        positions = np.array([actor.get_world_position() for actor in candidates], dtype=np.float64)
+        scales = np.abs(np.array([actor.get_world_scale() for actor in candidates], dtype=np.float64)).max(axis=1)
+        radii = np.array([actor.lod_radius for actor in candidates], dtype=np.float64) * scales
+        current = np.array([actor.lod_level for actor in candidates], dtype=np.int64)
+        max_level = np.array([actor.lod_count for actor in candidates], dtype=np.int64)
+
+        distance = np.linalg.norm(positions - np.asarray(camera_position, dtype=np.float64), axis=1)
+        ratio = distance / np.maximum(radii, 1e-6)
+        coarser = np.searchsorted(self.distance_factors * (1.0 + self.hysteresis), ratio)
+        finer = np.searchsorted(self.distance_factors * (1.0 - self.hysteresis), ratio)
+        target = np.where(coarser > current, coarser, np.where(finer < current, finer, current))
+        target = np.minimum(target, max_level)
+
+        changed = np.flatnonzero(target != current)
+        for i in changed:
+            candidates[i].set_lod(int(target[i]))
+        self._last_switches = int(changed.size)
+        self._total_switches += self._last_switches
+        return self._last_switches
+
+    def stats(self) -> Dict[str, int]:
+        return {"last_switches": self._last_switches, "total_switches": self._total_switches}
+
+
+__all__ = [
+    "LOD_VERSION",
+    "LodLevel",
+    "LodChain",
+    "cluster_decimate",
+    "write_obj",
+    "build_lod_chain",
+    "LodSelector",
+]
@@ -0,0 +1,356 @@
+"""
+MTL 材质解析与进程级纹理缓存
+
+- parse_mtl_bytes / load_mtl：解析 Wavefront MTL（颜色、光泽度、透明度、各类贴图及其选项）
+- 纹理由 OpenCV 读取，同一图像内容在进程内只加载一次，供所有引用它的材质共享
+- 加载时预先生成逐级减半的 mip 链；纹理缓存有字节预算，超出时淘汰未被引用的纹理
+- ModelMaterials：一个模型引用的全部材质与纹理（持有引用计数），用于统计场景纹理内存
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import weakref
+
+import numpy as np
+
+from .asset_cache import AssetCache, CacheEntry, file_content_hash
+from .obj_loader import decode_name, load_mesh
+
+logger = logging.getLogger(__name__)
+
+# 贴图语句 -> Material.maps 中的键
+_MAP_KEYS = {
+    b'map_ka': 'ambient',
+    b'map_kd': 'diffuse',
+    b'map_ks': 'specular',
+    b'map_ke': 'emissive',
+    b'map_ns': 'shininess',
+    b'map_d': 'alpha',
+    b'map_bump': 'bump',
+    b'bump': 'bump',
+    b'norm': 'normal',
+    b'disp': 'displacement',
+    b'decal': 'decal',
+    b'refl': 'reflection',
+    b'map_pr': 'roughness',
+    b'map_pm': 'metallic',
+}
+# 贴图选项 -> 最多携带的参数个数
+_MAP_OPTIONS = {
+    b'-blendu': 1, b'-blendv': 1, b'-boost': 1, b'-cc': 1, b'-clamp': 1, b'-imfchan': 1,
+    b'-texres': 1, b'-type': 1, b'-bm': 1, b'-mm': 2, b'-o': 3, b'-s': 3, b'-t': 3,
+}
+
+
+@dataclass
+class Material:
+    """MTL 中的一个材质（newmtl）"""
+    name: str
+    ambient: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    diffuse: Tuple[float, float, float] = (0.8, 0.8, 0.8)
+    specular: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    emissive: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    shininess: float = 0.0
+    opacity: float = 1.0
+    illum: int = 2
+    # 贴图类型 -> 绝对路径
+    maps: Dict[str, str] = field(default_factory=dict)
+    # 贴图类型 -> 选项（如 {"-s": ["1", "1", "1"]}）
+    map_options: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+
+
+def _color(parts: List[bytes]) -> Tuple[float, float, float]:
+    values = [float(p) for p in parts[:3]] or [0.0]
+    while len(values) < 3:
+        values.append(values[-1])
+    return values[0], values[1], values[2]
+
+
+def _is_number(token: bytes) -> bool:
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _parse_map(body: bytes) -> Tuple[str, Dict[str, List[str]]]:
+    """解析贴图语句体：跳过 -o/-s/-bm 等选项，剩余部分为文件名（可含空格）"""
+    tokens = body.split()
+    options: Dict[str, List[str]] = {}
+    i = 0
+    while i < len(tokens) and tokens[i] in _MAP_OPTIONS:
+        name = tokens[i]
+        limit = _MAP_OPTIONS[name]
+        i += 1
+        args: List[str] = []
+        while i < len(tokens) and len(args) < limit and (_is_number(tokens[i]) or limit == 1 and i < len(tokens) - 1):
+            args.append(tokens[i].decode('ascii', 'replace'))
+            i += 1
+        options[name.decode('ascii')] = args
+    return decode_name(b' '.join(tokens[i:])), options
+
+
+def _resolve_texture(name: str, base_dir: str) -> str:
+    path = name.replace('\\', os.sep)
+    if not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+    return os.path.normpath(path)
+
+
+def parse_mtl_bytes(data: bytes, base_dir: str = "") -> Dict[str, Material]:
+    """解析 MTL 文本，返回 材质名 -> Material；贴图路径相对 base_dir 解析为绝对路径"""
+    materials: Dict[str, Material] = {}
+    current: Optional[Material] = None
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line.startswith(b'#'):
+            continue
+        head, _, body = line.partition(b' ')
+        key = head.lower()
+        if key == b'newmtl':
+            current = Material(decode_name(body))
+            materials[current.name] = current
+            continue
+        if current is None:
+            continue
+        parts = body.split()
+        try:
+            if key == b'ka':
+                current.ambient = _color(parts)
+            elif key == b'kd':
+                current.diffuse = _color(parts)
+            elif key == b'ks':
+                current.specular = _color(parts)
+            elif key == b'ke':
+                current.emissive = _color(parts)
+            elif key == b'ns':
+                current.shininess = float(parts[0])
+            elif key == b'd':
+                current.opacity = float(parts[-1])
+            elif key == b'tr':
+                current.opacity = 1.0 - float(parts[-1])
+            elif key == b'illum':
+                current.illum = int(float(parts[0]))
+            elif key in _MAP_KEYS:
+                name, options = _parse_map(body)
+                if name:
+                    slot = _MAP_KEYS[key]
+                    current.maps[slot] = _resolve_texture(name, base_dir)
+                    if options:
+                        current.map_options[slot] = options
+        except (ValueError, IndexError):
+            logger.debug("忽略无法解析的 MTL 语句: %r", line)
+    return materials
+
+
+# (内容哈希, 所在目录) -> 材质表；贴图相对路径依赖目录
+_mtl_memo: Dict[Tuple[str, str], Dict[str, Material]] = {}
+
+
+def load_mtl(path: str) -> Dict[str, Material]:
+    """读取 MTL 文件（同一内容同一目录只解析一次）"""
+    abs_path = os.path.abspath(path)
+    base_dir = os.path.dirname(abs_path)
+    memo_key = (file_content_hash(abs_path), base_dir)
+    materials = _mtl_memo.get(memo_key)
+    if materials is None:
+        with open(abs_path, 'rb') as f:
+            materials = parse_mtl_bytes(f.read(), base_dir)
+        _mtl_memo[memo_key] = materials
+    return materials
+
+
+# ================================
+# 纹理缓存
+# ================================
+class Texture:
+    """已解码的纹理：levels[0] 为原图，其后每级宽高减半直到 1×1（或达到 max_levels）"""
+
+    def __init__(self, path: str, levels: List[np.ndarray]):
+        self.path = path
+        self.levels = levels
+
+    @property
+    def width(self) -> int:
+        return int(self.levels[0].shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.levels[0].shape[0])
+
+    @property
+    def channels(self) -> int:
+        image = self.levels[0]
+        return 1 if image.ndim == 2 else int(image.shape[2])
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(level.nbytes for level in self.levels))
+
+    def level_for_size(self, max_extent: int) -> np.ndarray:
+        """返回最长边不超过 max_extent 的最大一级"""
+        for level in self.levels:
+            if max(level.shape[0], level.shape[1]) <= max_extent:
+                return level
+        return self.levels[-1]
+
+    def __repr__(self):
+        return f"Texture(path={self.path}, {self.width}x{self.height}x{self.channels}, levels={len(self.levels)})"
+
+
+def build_mip_chain(image: np.ndarray, max_levels: Optional[int] = None) -> List[np.ndarray]:
+    """逐级 INTER_AREA 缩小一半，生成 mip 链"""
+    import cv2
+
+    levels = [image]
+    while max(levels[-1].shape[0], levels[-1].shape[1]) > 1:
+        if max_levels is not None and len(levels) >= max_levels:
+            break
+        prev = levels[-1]
+        size = (max(1, prev.shape[1] // 2), max(1, prev.shape[0] // 2))
+        levels.append(cv2.resize(prev, size, interpolation=cv2.INTER_AREA))
+    return levels
+
+
+class TextureCache:
+    """
+    进程级纹理缓存：按图像内容寻址，引用计数 + 字节预算（LRU 淘汰未被引用的纹理）。
+    OpenCV 不可用时记录一次警告，纹理加载被跳过（材质参数仍可使用）。
+    """
+
+    def __init__(self, budget_bytes: int = 256 * 1024 * 1024, max_levels: Optional[int] = None):
+        self._cache = AssetCache(budget_bytes)
+        self.max_levels = max_levels
+        self._cv2_missing = False
+
+    def _load(self, abs_path: str) -> Tuple[Texture, int]:
+        import cv2
+
+        # imdecode + np.fromfile 兼容 Windows 下的非 ASCII 路径
+        image = cv2.imdecode(np.fromfile(abs_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"无法解码纹理: {abs_path}")
+        texture = Texture(abs_path, build_mip_chain(image, self.max_levels))
+        return texture, texture.nbytes
+
+    def acquire(self, path: str) -> Optional[CacheEntry]:
+        """获取纹理并增加引用计数；文件缺失、无法解码或 OpenCV 不可用时返回 None"""
+        if self._cv2_missing or not os.path.isfile(path):
+            return None
+        try:
+            return self._cache.acquire(path, self._load)
+        except ImportError:
+            self._cv2_missing = True
+            logger.warning("未安装 OpenCV (opencv-python)，跳过纹理加载")
+        except (OSError, ValueError) as exc:
+            logger.warning("加载纹理失败 %s: %s", path, exc)
+        return None
+
+    def release(self, key: str) -> None:
+        self._cache.release(key)
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self._cache.set_budget(budget_bytes)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+
+_texture_cache = TextureCache()
+
+
+def default_texture_cache() -> TextureCache:
+    return _texture_cache
+
+
+class ModelMaterials:
+    """
+    一个模型引用的材质和纹理。构造时从纹理缓存获取（增加引用计数），
+    release() 或对象被回收时归还。
+    """
+
+    def __init__(self, materials: Dict[str, Material], cache: Optional[TextureCache] = None):
+        self.materials = materials
+        self._cache = cache or default_texture_cache()
+        # 纹理绝对路径 -> 缓存条目
+        self.textures: Dict[str, CacheEntry] = {}
+        for material in materials.values():
+            for texture_path in material.maps.values():
+                if texture_path in self.textures:
+                    continue
+                entry = self._cache.acquire(texture_path)
+                if entry is not None:
+                    self.textures[texture_path] = entry
+
+    @property
+    def texture_bytes(self) -> int:
+        return sum(entry.byte_size for entry in self.textures.values())
+
+    def get_texture(self, material_name: str, slot: str = 'diffuse') -> Optional[Texture]:
+        material = self.materials.get(material_name)
+        if material is None or slot not in material.maps:
+            return None
+        entry = self.textures.get(material.maps[slot])
+        return entry.value if entry is not None else None
+
+    def release(self) -> None:
+        textures, self.textures = self.textures, {}
+        for entry in textures.values():
+            self._cache.release(entry.key)
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:
+            pass
+
+
+# OBJ 内容哈希 -> mtllib 列表：只为读取材质库名解析一次网格
+_mtllib_memo: Dict[str, Tuple[str, ...]] = {}
+# (OBJ 内容哈希, 模型目录, 纹理缓存) -> ModelMaterials：同一模型的 Actor 共享，全部回收后归还纹理引用
+_model_materials_memo: "weakref.WeakValueDictionary[Tuple[str, str, TextureCache], ModelMaterials]" = \
+    weakref.WeakValueDictionary()
+
+
+def load_model_materials(obj_path: str, cache: Optional[TextureCache] = None) -> ModelMaterials:
+    """
+    按 OBJ 的 mtllib 读取全部材质（相对模型目录解析），并从纹理缓存获取其贴图。
+    同一内容、同一目录的模型返回同一个 ModelMaterials（调用方不应对共享对象调用 release）
+    """
+    cache = cache or default_texture_cache()
+    content_hash = file_content_hash(obj_path)
+    base_dir = os.path.dirname(os.path.abspath(obj_path))
+    memo_key = (content_hash, base_dir, cache)
+    shared = _model_materials_memo.get(memo_key)
+    if shared is not None:
+        return shared
+    mtllibs = _mtllib_memo.get(content_hash)
+    if mtllibs is None:
+        mtllibs = _mtllib_memo[content_hash] = tuple(load_mesh(obj_path).mtllibs)
+    materials: Dict[str, Material] = {}
+    for lib in mtllibs:
+        mtl_path = _resolve_texture(lib, base_dir)
+        if not os.path.isfile(mtl_path):
+            logger.debug("材质库不存在: %s", mtl_path)
+            continue
+        materials.update(load_mtl(mtl_path))
+    shared = _model_materials_memo[memo_key] = ModelMaterials(materials, cache)
+    return shared
+
+
+__all__ = [
+    "Material",
+    "parse_mtl_bytes",
+    "load_mtl",
+    "Texture",
+    "build_mip_chain",
+    "TextureCache",
+    "default_texture_cache",
+    "ModelMaterials",
+    "load_model_materials",
+]
@@ -1,4 +1,4 @@
-﻿from typing import Any, Dict
+﻿from typing import Any, Dict, List, Sequence
 from .engine_import import load_corona_engine
 from .geometry import Geometry
 CoronaEngine = load_corona_engine()
@@ -13,6 +13,32 @@ class Mechanics:
         self.engine_obj = MechanicsCtor(geo_obj)
         self.name = name
         self.geometry = geometry
+        # 刚体状态保存在场景 PhysicsWorld 的数组中（Scene.add_rigid_body 时绑定）
+        self._world = None
+        self._row = -1
+    def attach(self, world: Any, row: int):
+        self._world = world
+        self._row = row
+    def detach(self):
+        self._world = None
+        self._row = -1
+    @property
+    def is_simulated(self) -> bool:
+        return self._world is not None
+    def _require_world(self):
+        if self._world is None:
+            raise RuntimeError('Mechanics 未加入物理世界，请先调用 Scene.add_rigid_body')
+        return self._world
+    def set_velocity(self, velocity: Sequence[float]):
+        self._require_world().set_velocity(self._row, velocity)
+    def get_velocity(self) -> List[float]:
+        return self._require_world().get_velocity(self._row)
+    def apply_impulse(self, impulse: Sequence[float]):
+        self._require_world().apply_impulse(self._row, impulse)
+    def set_mass(self, mass: float):
+        self._require_world().set_mass(self._row, mass)
+    def get_mass(self) -> float:
+        return self._require_world().get_mass(self._row)
     def to_dict(self) -> Dict[str, Any]:
         return {'name': self.name, 'engine_obj': self.engine_obj}
     def __repr__(self):
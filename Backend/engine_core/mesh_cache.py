@@ -0,0 +1,168 @@
+"""
+网格二进制磁盘缓存
+
+- 解析后的 MeshData 以 .npy 数组文件写入缓存目录，目录名 = 源文件内容哈希 + 解析器版本
+- 再次加载时用 np.load(mmap_mode='r') 内存映射，无需重新解析文本，冷启动基本只剩 I/O
+- 源文件内容变化 -> 哈希变化 -> 自动使用新目录；写入新条目时顺带清理同一源文件的旧条目
+- 解析逻辑变化时提升 obj_loader.PARSER_VERSION，旧缓存自然失效
+"""
+from pathlib import Path
+from typing import Dict, Optional, Union
+import json
+import logging
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_ARRAY_FIELDS = ("positions", "indices", "uvs", "normals", "uv_indices", "normal_indices")
+_META_FILE = "meta.json"
+
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "cache" / "meshes"
+
+
+class MeshDiskCache:
+    """以 (内容哈希, 解析器版本) 为键的网格缓存；读取的数组为只读内存映射"""
+
+    def __init__(self, root: Union[str, Path, None] = None, enabled: bool = True):
+        self._root = Path(root) if root is not None else _DEFAULT_CACHE_DIR
+        self.enabled = enabled
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._invalidated = 0
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def set_root(self, root: Union[str, Path]) -> None:
+        self._root = Path(root)
+
+    @staticmethod
+    def entry_key(content_hash: str, version: Union[int, str]) -> str:
+        return f"{content_hash}-v{version}"
+
+    def entry_dir(self, content_hash: str, version: Union[int, str]) -> Path:
+        return self._root / self.entry_key(content_hash, version)
+
+    def load(self, content_hash: str, version: Union[int, str], mesh_cls):
+        """命中时返回以内存映射数组构造的 mesh_cls 实例；未命中或条目损坏返回 None"""
+        if not self.enabled:
+            return None
+        entry = self.entry_dir(content_hash, version)
+        meta_path = entry / _META_FILE
+        if not meta_path.is_file():
+            self._misses += 1
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            arrays: Dict[str, Optional[np.ndarray]] = {}
+            for name in _ARRAY_FIELDS:
+                arrays[name] = np.load(entry / f"{name}.npy", mmap_mode='r') if name in meta["arrays"] else None
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("网格缓存条目损坏，忽略 %s: %s", entry, exc)
+            self._misses += 1
+            return None
+        self._hits += 1
+        return mesh_cls(
+            material_ranges=[(name, int(start)) for name, start in meta.get("material_ranges", [])],
+            mtllibs=list(meta.get("mtllibs", [])),
+            source_path=meta.get("source_path", ""),
+            import_stats=dict(meta.get("import_stats", {})),
+            **arrays,
+        )
+
+    def store(self, content_hash: str, version: Union[int, str], mesh) -> Optional[Path]:
+        """写入缓存条目（先写临时目录再原子改名），失败只记录日志不影响导入"""
+        if not self.enabled:
+            return None
+        entry = self.entry_dir(content_hash, version)
+        if (entry / _META_FILE).is_file():
+            return entry
+        tmp = self._root / f".tmp-{uuid.uuid4().hex}"
+        try:
+            tmp.mkdir(parents=True, exist_ok=True)
+            stored = []
+            for name in _ARRAY_FIELDS:
+                array = getattr(mesh, name)
+                if array is not None:
+                    np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+                    stored.append(name)
+            meta = {
+                "version": version,
+                "content_hash": content_hash,
+                "source_path": mesh.source_path,
+                "arrays": stored,
+                "material_ranges": [[name, int(start)] for name, start in mesh.material_ranges],
+                "mtllibs": list(mesh.mtllibs),
+                "import_stats": dict(mesh.import_stats),
+            }
+            # meta.json 最后写入，作为条目完整的标志
+            (tmp / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, entry)
+        except OSError as exc:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if (entry / _META_FILE).is_file():
+                # 其他进程已写入同一条目
+                return entry
+            logger.warning("写入网格缓存失败 %s: %s", entry, exc)
+            return None
+        self._writes += 1
+        self._invalidate_stale(mesh.source_path, entry.name)
+        return entry
+
+    def _invalidate_stale(self, source_path: str, keep: str) -> None:
+        """删除同一源文件的旧条目（源文件已修改或解析器版本已升级）"""
+        if not source_path:
+            return
+        for meta_path in self._root.glob(f"*/{_META_FILE}"):
+            entry = meta_path.parent
+            if entry.name == keep:
+                continue
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if meta.get("source_path") == source_path:
+                shutil.rmtree(entry, ignore_errors=True)
+                self._invalidated += 1
+                logger.debug("清理过期网格缓存 %s", entry)
+
+    def clear(self) -> None:
+        """删除全部缓存条目"""
+        if self._root.is_dir():
+            for entry in self._root.iterdir():
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        return {
+            "root": str(self._root),
+            "hits": self._hits,
+            "misses": self._misses,
+            "writes": self._writes,
+            "invalidated": self._invalidated,
+        }
+
+
+_default_cache = MeshDiskCache()
+
+
+def default_mesh_cache() -> MeshDiskCache:
+    return _default_cache
+
+
+def configure_mesh_cache(root: Union[str, Path, None] = None, enabled: Optional[bool] = None) -> MeshDiskCache:
+    """修改默认缓存目录或启用状态"""
+    if root is not None:
+        _default_cache.set_root(root)
+    if enabled is not None:
+        _default_cache.enabled = enabled
+    return _default_cache
+
+
+__all__ = ["MeshDiskCache", "default_mesh_cache", "configure_mesh_cache"]
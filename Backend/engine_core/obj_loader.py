@@ -0,0 +1,472 @@
+"""
+Wavefront OBJ 解析（NumPy 向量化）
+
+- 逐行分类只做一次 Python 循环，数值解析全部交给 NumPy；关键字为行首第一个空白分隔的 token
+  （允许缩进与制表符分隔）
+- 多边形按扇形三角化；支持 v / v/vt / v//vn / v/vt/vn 以及负（相对）索引
+- 解析结果为 MeshData：顶点/索引缓冲、包围盒、三角形数量、材质分段
+- 解析结果写入二进制磁盘缓存（mesh_cache），再次导入时直接内存映射
+- 大文件可按行边界切块，多进程并行解析后按元素偏移合并（仅调用方显式指定 workers 时启用，编辑器内默认单进程）
+- 导入时默认经 mesh_optimizer 焊接顶点、补全法线、重排三角形
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import re
+import weakref
+
+import numpy as np
+
+from .asset_cache import file_content_hash
+from .mesh_cache import default_mesh_cache
+
+logger = logging.getLogger(__name__)
+
+# 解析输出格式/语义变化时递增，使磁盘缓存失效
+PARSER_VERSION = 6
+
+# 指定多进程时，小于该大小的文件仍单进程解析（进程间传输的开销大于收益）
+PARALLEL_THRESHOLD_BYTES = 16 * 1024 * 1024
+# 每块最小字节数
+MIN_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+@dataclass(eq=False)
+class MeshData:
+    """
+    解析后的网格数据。
+
+    positions / indices 构成按位置索引的三角形网格；uvs、normals 为独立的属性池，
+    uv_indices / normal_indices 与 indices 形状一致（缺失的角为 -1）。
+    若 uv_indices / normal_indices 为 None 而 uvs / normals 不为 None，则属性按顶点对齐（与 positions 一一对应）。
+    """
+    positions: np.ndarray
+    indices: np.ndarray
+    uvs: Optional[np.ndarray] = None
+    normals: Optional[np.ndarray] = None
+    uv_indices: Optional[np.ndarray] = None
+    normal_indices: Optional[np.ndarray] = None
+    # (材质名, 起始三角形) 列表，按三角形顺序排列
+    material_ranges: List[Tuple[str, int]] = field(default_factory=list)
+    mtllibs: List[str] = field(default_factory=list)
+    source_path: str = ""
+    # 导入优化报告（顶点/索引缩减等），未经优化时为空
+    import_stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def vertex_count(self) -> int:
+        return int(self.positions.shape[0])
+
+    @property
+    def triangle_count(self) -> int:
+        return int(self.indices.shape[0])
+
+    @property
+    def vertex_buffer(self) -> np.ndarray:
+        return self.positions
+
+    @property
+    def index_buffer(self) -> np.ndarray:
+        return self.indices.reshape(-1)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.positions, self.indices, self.uvs, self.normals, self.uv_indices, self.normal_indices)
+        return int(sum(a.nbytes for a in arrays if a is not None))
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """局部空间轴对齐包围盒 (min, max)"""
+        if self.positions.shape[0] == 0:
+            zero = np.zeros(3, dtype=np.float32)
+            return zero, zero.copy()
+        return self.positions.min(axis=0), self.positions.max(axis=0)
+
+
+def decode_name(raw: bytes) -> str:
+    """材质名/文件名解码：优先 UTF-8，失败时按 GBK（部分资源由中文 Windows 工具导出）"""
+    raw = raw.strip()
+    for encoding in ('utf-8', 'gbk'):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode('utf-8', 'replace')
+
+
+def _parse_floats(parts: List[bytes], width: int) -> np.ndarray:
+    """把形如 b'x y z ...' 的行体解析为 (N, width) 数组；多余的分量（如顶点色/w）被丢弃"""
+    if not parts:
+        return np.zeros((0, width), dtype=np.float32)
+    columns = len(parts[0].split())
+    flat = np.fromstring(b' '.join(parts), dtype=np.float64, sep=' ')
+    if columns >= width and flat.size == columns * len(parts):
+        return flat.reshape(-1, columns)[:, :width].astype(np.float32)
+    # 列数不一致时逐行兜底
+    rows = [(p.split() + [b'0'] * width)[:width] for p in parts]
+    return np.array(rows, dtype=np.float64).astype(np.float32)
+
+
+def _parse_corners(tokens: List[bytes]) -> np.ndarray:
+    """把面角 token（v、v/vt、v//vn、v/vt/vn）解析为 (N, 3) int64，缺失分量为 0"""
+    n = len(tokens)
+    out = np.zeros((n, 3), dtype=np.int64)
+    if n == 0:
+        return out
+    blob = b' '.join(tokens)
+    first = tokens[0]
+    slashes = first.count(b'/')
+    double = b'//' in first
+    if slashes == 0 and blob.count(b'/') == 0:
+        out[:, 0] = np.fromstring(blob, dtype=np.int64, sep=' ')
+        return out
+    if slashes == 2 and double and blob.count(b'//') == n and blob.count(b'/') == 2 * n:
+        vals = np.fromstring(blob.replace(b'//', b' '), dtype=np.int64, sep=' ')
+        if vals.size == 2 * n:
+            out[:, 0::2] = vals.reshape(n, 2)
+            return out
+    elif slashes in (1, 2) and not double and blob.count(b'/') == slashes * n and b'//' not in blob:
+        vals = np.fromstring(blob.replace(b'/', b' '), dtype=np.int64, sep=' ')
+        if vals.size == (slashes + 1) * n:
+            out[:, :slashes + 1] = vals.reshape(n, slashes + 1)
+            return out
+    # 混合格式：逐 token 兜底
+    for i, tok in enumerate(tokens):
+        for j, part in enumerate(tok.split(b'/')[:3]):
+            if part:
+                out[i, j] = int(part)
+    return out
+
+
+def _resolve(index: np.ndarray, counts: np.ndarray, offset: int) -> np.ndarray:
+    """OBJ 1 基索引 -> 0 基；负索引相对该面之前已定义的元素数量。0 表示缺失，返回 -1"""
+    resolved = np.where(index > 0, index - 1, counts + index + offset)
+    return np.where(index == 0, -1, resolved)
+
+
+def parse_obj_bytes(data: bytes, v_offset: int = 0, vt_offset: int = 0, vn_offset: int = 0) -> dict:
+    """
+    解析一段 OBJ 文本，返回原始数组字典。
+
+    正索引按文件内绝对位置解释；负索引相对本段内已出现的元素，并加上 *_offset
+    （分段并行解析时传入前面各段的元素数量）。
+    """
+    v_parts: List[bytes] = []
+    vt_parts: List[bytes] = []
+    vn_parts: List[bytes] = []
+    f_parts: List[bytes] = []
+    f_counts: List[Tuple[int, int, int]] = []
+    materials: List[Tuple[str, int]] = []
+    mtllibs: List[str] = []
+
+    for line in data.splitlines():
+        # 常规导出文件的行以 "v " / "vt " / "vn " / "f " 开头，直接按前缀分类；
+        # 其余行（缩进、制表符分隔、usemtl 等）按第一个空白分隔的 token 分类
+        head = line[:3]
+        if head[:2] == b'v ':
+            v_parts.append(line[2:])
+            continue
+        if head[:2] == b'f ':
+            f_parts.append(line[2:])
+            f_counts.append((len(v_parts), len(vt_parts), len(vn_parts)))
+            continue
+        if head == b'vt ':
+            vt_parts.append(line[3:])
+            continue
+        if head == b'vn ':
+            vn_parts.append(line[3:])
+            continue
+        parts = line.split(None, 1)
+        # 空行与只有关键字的行不含数据
+        if len(parts) < 2:
+            continue
+        keyword, body = parts
+        if keyword == b'v':
+            v_parts.append(body)
+        elif keyword == b'f':
+            f_parts.append(body)
+            f_counts.append((len(v_parts), len(vt_parts), len(vn_parts)))
+        elif keyword == b'vt':
+            vt_parts.append(body)
+        elif keyword == b'vn':
+            vn_parts.append(body)
+        elif keyword == b'usemtl':
+            materials.append((decode_name(body), len(f_parts)))
+        elif keyword == b'mtllib':
+            mtllibs.append(decode_name(body))
+
+    positions = _parse_floats(v_parts, 3)
+    uvs = _parse_floats(vt_parts, 2)
+    normals = _parse_floats(vn_parts, 3)
+
+    face_tokens = [body.split() for body in f_parts]
+    corners_per_face = np.fromiter((len(t) for t in face_tokens), dtype=np.int64, count=len(face_tokens))
+    corners = _parse_corners(list(chain.from_iterable(face_tokens)))
+
+    # 负索引需要知道该面之前的元素数量
+    if (corners < 0).any():
+        counts = np.repeat(np.asarray(f_counts, dtype=np.int64).reshape(-1, 3), corners_per_face, axis=0)
+    else:
+        counts = np.zeros((corners.shape[0], 3), dtype=np.int64)
+    corners = np.stack([
+        _resolve(corners[:, 0], counts[:, 0], v_offset),
+        _resolve(corners[:, 1], counts[:, 1], vt_offset),
+        _resolve(corners[:, 2], counts[:, 2], vn_offset),
+    ], axis=1)
+
+    return {
+        "positions": positions,
+        "uvs": uvs,
+        "normals": normals,
+        "corners": corners,
+        "corners_per_face": corners_per_face,
+        "materials": materials,
+        "mtllibs": mtllibs,
+    }
+
+
+def _triangulate(corners_per_face: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """扇形三角化：返回每个三角形三个角在 corners 数组中的下标 (T, 3) 以及每个面的三角形数"""
+    tris_per_face = np.maximum(corners_per_face - 2, 0)
+    total = int(tris_per_face.sum())
+    if total == 0:
+        return np.zeros((0, 3), dtype=np.int64), tris_per_face
+    face_start = np.concatenate([[0], np.cumsum(corners_per_face)[:-1]])
+    first = np.repeat(face_start, tris_per_face)
+    # 每个三角形在所属面内的序号 0..k-3
+    tri_start = np.concatenate([[0], np.cumsum(tris_per_face)[:-1]])
+    local = np.arange(total) - np.repeat(tri_start, tris_per_face)
+    second = first + local + 1
+    return np.stack([first, second, second + 1], axis=1), tris_per_face
+
+
+def _check_indices(index: np.ndarray, count: int, kind: str, source_path: str, allow_missing: bool = True) -> None:
+    """面索引越界（或缺失顶点索引）时报错，避免转换为 uint32 后回绕成错误的顶点"""
+    low = -1 if allow_missing else 0
+    bad = (index < low) | (index >= count)
+    if bad.any():
+        value = int(index[bad][0])
+        detail = "缺失" if value == -1 else f"{value + 1}（共 {count} 个）"
+        raise ValueError(f"OBJ 面的{kind}索引无效: {detail} {source_path}".rstrip())
+
+
+def build_mesh(raw: dict, source_path: str = "") -> MeshData:
+    """把 parse_obj_bytes 的原始结果组装为 MeshData（三角化 + 属性索引 + 材质分段）"""
+    corner_idx, tris_per_face = _triangulate(raw["corners_per_face"])
+    tri_corners = raw["corners"][corner_idx]  # (T, 3, 3): 角 × (v, vt, vn)
+
+    _check_indices(tri_corners[:, :, 0], raw["positions"].shape[0], "顶点", source_path, allow_missing=False)
+    indices = tri_corners[:, :, 0].astype(np.uint32)
+    uvs = raw["uvs"] if raw["uvs"].shape[0] else None
+    normals = raw["normals"] if raw["normals"].shape[0] else None
+    if uvs is not None:
+        _check_indices(tri_corners[:, :, 1], uvs.shape[0], "纹理坐标", source_path)
+    if normals is not None:
+        _check_indices(tri_corners[:, :, 2], normals.shape[0], "法线", source_path)
+    uv_indices = tri_corners[:, :, 1].astype(np.int32) if uvs is not None else None
+    normal_indices = tri_corners[:, :, 2].astype(np.int32) if normals is not None else None
+
+    material_ranges: List[Tuple[str, int]] = []
+    if raw["materials"]:
+        tri_offsets = np.concatenate([[0], np.cumsum(tris_per_face)])
+        for name, face_index in raw["materials"]:
+            material_ranges.append((name, int(tri_offsets[min(face_index, len(tri_offsets) - 1)])))
+
+    return MeshData(
+        positions=raw["positions"],
+        indices=indices,
+        uvs=uvs,
+        normals=normals,
+        uv_indices=uv_indices,
+        normal_indices=normal_indices,
+        material_ranges=material_ranges,
+        mtllibs=list(raw["mtllibs"]),
+        source_path=source_path,
+    )
+
+
+# 行首可有缩进，关键字后必须跟空白（只有关键字的行不含数据，解析时同样跳过）
+_KEYWORD_LINES = {
+    keyword: re.compile(rb'^[ \t\x0b\x0c]*' + keyword + rb'[ \t\x0b\x0c]', re.MULTILINE)
+    for keyword in (b'v', b'vt', b'vn')
+}
+_IRREGULAR_SEPARATORS = (b'\t', b'\x0b', b'\x0c', b'\n ')
+
+
+def _count_lines(chunk: bytes, keyword: bytes) -> int:
+    """统计第一个 token 为 keyword 的行数（与 parse_obj_bytes 的行分类规则一致）"""
+    if chunk[:1].isspace() or any(sep in chunk for sep in _IRREGULAR_SEPARATORS):
+        # 含缩进或制表符的块逐行匹配（较慢，常规导出文件不会走到这里）
+        return sum(1 for _ in _KEYWORD_LINES[keyword].finditer(chunk))
+    prefix = keyword + b' '
+    return int(chunk.startswith(prefix)) + chunk.count(b'\n' + prefix)
+
+
+def split_obj_chunks(data: bytes, chunk_count: int) -> List[Tuple[bytes, int, int, int]]:
+    """
+    按行边界把 OBJ 文本切成约 chunk_count 块。
+    返回 [(块数据, v 偏移, vt 偏移, vn 偏移)]，偏移为该块之前出现的顶点/纹理坐标/法线数量，
+    供负（相对）索引换算为绝对索引。
+    """
+    size = len(data)
+    step = max(1, size // max(1, chunk_count))
+    chunks: List[Tuple[bytes, int, int, int]] = []
+    start = 0
+    v_offset = vt_offset = vn_offset = 0
+    while start < size:
+        end = data.find(b'\n', min(start + step, size) - 1)
+        end = size if end < 0 else end + 1
+        chunk = data[start:end]
+        chunks.append((chunk, v_offset, vt_offset, vn_offset))
+        v_offset += _count_lines(chunk, b'v')
+        vt_offset += _count_lines(chunk, b'vt')
+        vn_offset += _count_lines(chunk, b'vn')
+        start = end
+    return chunks
+
+
+def _parse_chunk(args: Tuple[bytes, int, int, int]) -> dict:
+    """进程池工作函数（需可被子进程按模块路径导入）"""
+    chunk, v_offset, vt_offset, vn_offset = args
+    return parse_obj_bytes(chunk, v_offset, vt_offset, vn_offset)
+
+
+def merge_raw(parts: List[dict]) -> dict:
+    """合并各块的解析结果：属性池直接拼接（面索引已是文件内绝对索引），材质的面序号加上前面各块的面数"""
+    if len(parts) == 1:
+        return parts[0]
+    materials: List[Tuple[str, int]] = []
+    mtllibs: List[str] = []
+    face_offset = 0
+    for part in parts:
+        materials.extend((name, face + face_offset) for name, face in part["materials"])
+        mtllibs.extend(part["mtllibs"])
+        face_offset += int(part["corners_per_face"].shape[0])
+    return {
+        "positions": np.concatenate([p["positions"] for p in parts]),
+        "uvs": np.concatenate([p["uvs"] for p in parts]),
+        "normals": np.concatenate([p["normals"] for p in parts]),
+        "corners": np.concatenate([p["corners"] for p in parts]),
+        "corners_per_face": np.concatenate([p["corners_per_face"] for p in parts]),
+        "materials": materials,
+        "mtllibs": mtllibs,
+    }
+
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+
+
+def _get_parse_pool(workers: int) -> ProcessPoolExecutor:
+    global _parse_pool, _parse_pool_workers
+    if _parse_pool is None or _parse_pool_workers < workers:
+        shutdown_parse_pool()
+        # 各平台统一用 spawn，行为与 Windows 一致（子进程不继承父进程的 Qt/引擎状态）
+        _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+        _parse_pool_workers = workers
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """关闭解析进程池（退出或测试时调用）"""
+    global _parse_pool, _parse_pool_workers
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True, cancel_futures=True)
+        _parse_pool = None
+        _parse_pool_workers = 0
+
+
+def parse_obj_data(data: bytes, workers: Optional[int] = None) -> dict:
+    """
+    解析整段 OBJ 文本。workers 缺省（或 <= 1）时单进程解析；workers > 1 且大于 PARALLEL_THRESHOLD_BYTES 时
+    分块多进程解析。
+    多进程只供非编辑器调用方（离线导入、基准测试）显式开启：spawn 子进程会重新导入入口模块，
+    而编辑器入口 Backend/main.py 在模块顶层执行 bootstrap 并创建主窗口。
+    """
+    if workers is None or workers <= 1:
+        return parse_obj_bytes(data)
+    chunk_count = min(workers, len(data) // MIN_CHUNK_BYTES)
+    if len(data) < PARALLEL_THRESHOLD_BYTES or chunk_count <= 1:
+        return parse_obj_bytes(data)
+    chunks = split_obj_chunks(data, chunk_count)
+    try:
+        parts = list(_get_parse_pool(chunk_count).map(_parse_chunk, chunks))
+    except Exception as exc:
+        # 进程池不可用（如被冻结打包的环境）时退回单进程
+        logger.warning("并行解析 OBJ 失败，改为单进程: %s", exc)
+        shutdown_parse_pool()
+        return parse_obj_bytes(data)
+    return merge_raw(parts)
+
+
+def parse_obj(path: str, workers: Optional[int] = None) -> MeshData:
+    """从磁盘读取并解析 OBJ 文件"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return build_mesh(parse_obj_data(data, workers), source_path=os.path.abspath(path))
+
+
+# (内容哈希, 是否优化) -> MeshData；只要还有 Geometry 持有网格就复用，不重复解析
+_mesh_memo: "weakref.WeakValueDictionary[Tuple[str, bool], MeshData]" = weakref.WeakValueDictionary()
+# 绝对路径 -> 最近一次导入的优化报告
+_import_reports: Dict[str, Dict[str, Any]] = {}
+
+
+def load_mesh(path: str, use_disk_cache: bool = True, optimize: bool = True) -> MeshData:
+    """
+    导入入口：同一内容的模型在进程内只解析一次。
+    进程内未命中时先查磁盘缓存（内存映射，只读数组），仍未命中才解析文本、优化并写回缓存。
+    """
+    key = file_content_hash(path)
+    mesh = _mesh_memo.get((key, optimize))
+    if mesh is not None:
+        return mesh
+    abs_path = os.path.abspath(path)
+    version = PARSER_VERSION if optimize else f"{PARSER_VERSION}raw"
+    disk_cache = default_mesh_cache() if use_disk_cache else None
+    if disk_cache is not None:
+        mesh = disk_cache.load(key, version, MeshData)
+    if mesh is None:
+        mesh = parse_obj(path)
+        if optimize:
+            from .mesh_optimizer import optimize_mesh
+            mesh = optimize_mesh(mesh)
+            stats = mesh.import_stats
+            logger.info(
+                "网格优化 %s: 顶点 %d -> %d, 退化三角形 %d, 生成法线=%s, 重排=%s",
+                abs_path, stats["input_vertices"], stats["vertices"], stats["degenerate_triangles"],
+                stats["generated_normals"], stats["reordered"],
+            )
+        if disk_cache is not None:
+            disk_cache.store(key, version, mesh)
+    else:
+        mesh.source_path = abs_path
+    if mesh.import_stats:
+        _import_reports[abs_path] = dict(mesh.import_stats)
+    _mesh_memo[(key, optimize)] = mesh
+    return mesh
+
+
+def import_report(path: str) -> Optional[Dict[str, Any]]:
+    """返回该模型最近一次导入的优化报告（未导入或未优化时为 None）"""
+    report = _import_reports.get(os.path.abspath(path))
+    return dict(report) if report is not None else None
+
+
+__all__ = [
+    "PARSER_VERSION",
+    "MeshData",
+    "decode_name",
+    "parse_obj_bytes",
+    "split_obj_chunks",
+    "merge_raw",
+    "parse_obj_data",
+    "build_mesh",
+    "parse_obj",
+    "load_mesh",
+    "import_report",
+    "shutdown_parse_pool",
+]
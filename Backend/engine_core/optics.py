@@ -3,6 +3,7 @@ from .engine_import import load_corona_engine
 from .geometry import Geometry
 CoronaEngine = load_corona_engine()
 class Optics:
+    __slots__ = ('engine_obj', 'name', 'geometry')
     def __init__(self, geometry: Geometry, name: str = 'Optics'):
         if CoronaEngine is None:
             raise RuntimeError('CoronaEngine 未初始化')
@@ -0,0 +1,419 @@
+"""
+刚体物理：Mechanics 组件的批量固定步长积分
+
+- PhysicsWorld 以 SoA NumPy 数组保存场景内全部刚体：位置、速度、逆质量、重力系数、恢复系数与碰撞体（球 / AABB）
+- 固定时间步长：step(dt) 累积帧时间，按 fixed_dt 执行整数个子步（上限 max_substeps，卡顿后丢弃多余时间）
+- 每个子步：半隐式欧拉一次积分全部动态刚体 → 分条排序扫描的宽相（sort and sweep）→
+  向量化窄相（球-球 / 球-盒 / 盒-盒）→ 若干次 Jacobi 迭代求解法向冲量与穿透修正
+- 只模拟平移：碰撞体不随旋转变化；质量为 0 的刚体为静态（地面、墙体）
+- 全部子步完成后，把位置变化的刚体一次性批量写回 Geometry，再通知空间索引等变换监听者
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import time
+
+import numpy as np
+
+from .geometry import Geometry
+from .transform_math import transform_aabbs, trs_matrices
+
+logger = logging.getLogger(__name__)
+
+SHAPE_SPHERE = 0
+SHAPE_BOX = 1
+_SHAPES = {"sphere": SHAPE_SPHERE, "box": SHAPE_BOX}
+
+# 允许的穿透深度与每次迭代修正的比例（避免静止接触抖动）
+PENETRATION_SLOP = 0.005
+CORRECTION_PERCENT = 0.8
+# 法向相对速度低于该值时不反弹（静止接触不再弹跳）
+RESTITUTION_THRESHOLD = 1.0
+# 位置变化小于该值的刚体不写回引擎
+WRITE_EPSILON = 1e-7
+# 由包围盒生成碰撞体时的最小半边长（平面网格的包围盒在法线方向厚度为 0）
+MIN_HALF_EXTENT = 0.01
+
+
+def sweep_pairs(lo: np.ndarray, hi: np.ndarray, axis: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    分条排序扫描宽相：返回包围盒相交的候选对 (a, b)，a != b 且每对只出现一次。
+    先沿次要轴把空间切成等宽条带（盒子登记到它覆盖的每个条带），再在每个条带内沿主轴
+    （默认取中心方差最大的轴）按下界排序扫描，最后用三轴重叠做向量化筛选。
+    单轴扫描在网格状分布下每个盒子会与整列盒子成为候选，分条后候选数接近真实邻居数。
+    """
+    n = lo.shape[0]
+    empty = np.empty(0, dtype=np.intp)
+    if n < 2:
+        return empty, empty
+    spread = (lo + hi).var(axis=0)
+    if axis is None:
+        axis = int(np.argmax(spread))
+    others = [k for k in range(3) if k != axis]
+    slab_axis = others[int(np.argmax(spread[others]))]
+
+    # 条带宽度：至少为典型盒子尺寸的两倍，且条带数不超过 √n
+    slab_lo, slab_hi = lo[:, slab_axis], hi[:, slab_axis]
+    base = float(slab_lo.min())
+    width = max(2.0 * float(np.median(slab_hi - slab_lo)), (float(slab_hi.max()) - base) / np.sqrt(n), 1e-9)
+    first = ((slab_lo - base) // width).astype(np.intp)
+    span = ((slab_hi - base) // width).astype(np.intp) - first + 1
+    total = int(span.sum())
+    entry = np.repeat(np.arange(n), span)
+    slab = np.repeat(first, span) + (np.arange(total) - np.repeat(np.cumsum(span) - span, span))
+    order = np.lexsort((lo[entry, axis], slab))
+    entry, slab = entry[order], slab[order]
+
+    # 条带号与主轴坐标合成单调键，一次 searchsorted 求出每项在本条带内的扫描终点
+    origin = float(lo[:, axis].min())
+    pad = float(hi[:, axis].max()) - origin + 1.0
+    key = slab * pad + (lo[entry, axis] - origin)
+    end = np.searchsorted(key, slab * pad + (hi[entry, axis] - origin), side='right')
+    count = np.maximum(end - np.arange(total) - 1, 0)
+    pairs = int(count.sum())
+    if not pairs:
+        return empty, empty
+    start = np.repeat(np.arange(total), count)
+    offset = np.arange(pairs) - np.repeat(np.cumsum(count) - count, count)
+    a = entry[start]
+    b = entry[start + 1 + offset]
+    # 同时出现在多个条带的对只在两者共同的第一个条带中保留
+    unique = slab[start] == np.maximum(first[a], first[b])
+    a, b = a[unique], b[unique]
+    overlap = ((lo[a] <= hi[b]) & (lo[b] <= hi[a])).all(axis=1)
+    return a[overlap], b[overlap]
+
+
+class PhysicsWorld:
+    """
+    场景的刚体世界。刚体可以绑定 Actor（位置读写其世界变换），也可以只存在于数组中（基准测试）。
+    """
+
+    def __init__(self, gravity: Sequence[float] = (0.0, -9.81, 0.0), fixed_dt: float = 1.0 / 60.0,
+                 max_substeps: int = 4, iterations: int = 8, capacity: int = 256):
+        self.gravity = np.asarray(gravity, dtype=np.float64)
+        self.fixed_dt = float(fixed_dt)
+        self.max_substeps = int(max_substeps)
+        self.iterations = int(iterations)
+        self._pos = np.zeros((capacity, 3), dtype=np.float64)
+        self._vel = np.zeros((capacity, 3), dtype=np.float64)
+        # 碰撞体中心相对刚体位置（Actor 世界位置）的偏移
+        self._offset = np.zeros((capacity, 3), dtype=np.float64)
+        self._half = np.zeros((capacity, 3), dtype=np.float64)
+        self._radius = np.zeros(capacity, dtype=np.float64)
+        self._shape = np.zeros(capacity, dtype=np.int8)
+        self._inv_mass = np.zeros(capacity, dtype=np.float64)
+        self._gravity_scale = np.ones(capacity, dtype=np.float64)
+        self._restitution = np.zeros(capacity, dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        # 上次写回引擎的位置，用于只写回变化的刚体
+        self._written = np.zeros((capacity, 3), dtype=np.float64)
+        self._actors: List[Optional[Any]] = [None] * capacity
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        self._accumulator = 0.0
+        self._writing = False
+        self._stats = {"steps": 0, "contacts": 0, "pairs": 0, "written": 0, "step_ms": 0.0, "write_ms": 0.0}
+
+    # ---- 刚体管理 ----
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    def __contains__(self, actor: Any) -> bool:
+        return id(actor) in self._rows
+
+    def _grow(self) -> None:
+        capacity = self._pos.shape[0] * 2
+        for name in ('_pos', '_vel', '_offset', '_half', '_radius', '_shape', '_inv_mass',
+                     '_gravity_scale', '_restitution', '_alive', '_written'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+        self._actors.extend([None] * (capacity - len(self._actors)))
+
+    def add_body(self, position: Sequence[float], shape: str = "sphere", size: Any = 0.5, mass: float = 1.0,
+                 restitution: float = 0.2, gravity_scale: float = 1.0,
+                 offset: Sequence[float] = (0.0, 0.0, 0.0), actor: Any = None) -> int:
+        """
+        添加刚体，返回行号。size 为球半径或盒子半边长（标量或 3 维）；mass <= 0 表示静态刚体。
+        """
+        if shape not in _SHAPES:
+            raise ValueError(f"不支持的碰撞体类型: {shape}")
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._size >= self._pos.shape[0]:
+                self._grow()
+            row = self._size
+            self._size += 1
+        half = np.broadcast_to(np.asarray(size, dtype=np.float64), (3,))
+        self._pos[row] = position
+        self._written[row] = position
+        self._vel[row] = 0.0
+        self._offset[row] = offset
+        self._shape[row] = _SHAPES[shape]
+        self._half[row] = half if shape == "box" else half.max()
+        self._radius[row] = half.max()
+        self._inv_mass[row] = 1.0 / mass if mass > 0 else 0.0
+        self._gravity_scale[row] = gravity_scale
+        self._restitution[row] = restitution
+        self._alive[row] = True
+        self._actors[row] = actor
+        if actor is not None:
+            self._rows[id(actor)] = row
+        return row
+
+    def add(self, actor: Any, shape: str = "sphere", mass: float = 1.0, restitution: float = 0.2,
+            gravity_scale: float = 1.0) -> int:
+        """
+        以 Actor 当前世界包围盒创建刚体：box 取包围盒，sphere 取最长半边为半径。
+        刚体位置即 Actor 的世界位置，外部直接修改 Actor 变换时视为瞬移。
+        """
+        if id(actor) in self._rows:
+            return self._rows[id(actor)]
+        if getattr(actor, '_parent', None) is not None:
+            raise RuntimeError(f"有父节点的 Actor 不能作为刚体: {actor.name}")
+        position = np.asarray(actor.get_world_position(), dtype=np.float64)
+        lo, hi = actor._geometry.get_bounds()
+        matrix = trs_matrices([position], [actor.get_world_rotation()], [actor.get_world_scale()])
+        world_lo, world_hi = transform_aabbs(np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64), matrix)
+        center = (world_lo[0] + world_hi[0]) * 0.5
+        half = np.maximum((world_hi[0] - world_lo[0]) * 0.5, MIN_HALF_EXTENT)
+        row = self.add_body(position, shape, half, mass, restitution, gravity_scale, center - position, actor)
+        actor.add_transform_listener(self._on_transform)
+        return row
+
+    def remove(self, actor: Any) -> bool:
+        row = self._rows.pop(id(actor), None)
+        if row is None:
+            return False
+        actor.remove_transform_listener(self._on_transform)
+        self.remove_body(row)
+        return True
+
+    def remove_body(self, row: int) -> None:
+        if 0 <= row < self._size and self._alive[row]:
+            self._alive[row] = False
+            self._inv_mass[row] = 0.0
+            self._vel[row] = 0.0
+            self._actors[row] = None
+            self._free.append(row)
+
+    def clear(self) -> None:
+        for actor in [a for a in self._actors[:self._size] if a is not None]:
+            self.remove(actor)
+        for row in np.flatnonzero(self._alive[:self._size]):
+            self.remove_body(int(row))
+
+    def _on_transform(self, actor: Any) -> None:
+        """外部修改了 Actor 变换：把刚体瞬移到新位置（写回期间的回调忽略）"""
+        if self._writing:
+            return
+        row = self._rows.get(id(actor))
+        if row is not None:
+            position = actor.get_world_position()
+            self._pos[row] = position
+            self._written[row] = position
+
+    def row_of(self, actor: Any) -> int:
+        row = self._rows.get(id(actor))
+        if row is None:
+            raise KeyError(f"Actor {getattr(actor, 'name', actor)} 不是刚体")
+        return row
+
+    # ---- 刚体属性 ----
+    def set_velocity(self, row: int, velocity: Sequence[float]) -> None:
+        self._vel[row] = velocity
+
+    def get_velocity(self, row: int) -> List[float]:
+        return self._vel[row].tolist()
+
+    def apply_impulse(self, row: int, impulse: Sequence[float]) -> None:
+        self._vel[row] += np.asarray(impulse, dtype=np.float64) * self._inv_mass[row]
+
+    def set_mass(self, row: int, mass: float) -> None:
+        self._inv_mass[row] = 1.0 / mass if mass > 0 else 0.0
+        if mass <= 0:
+            self._vel[row] = 0.0
+
+    def get_mass(self, row: int) -> float:
+        inv = float(self._inv_mass[row])
+        return 1.0 / inv if inv > 0 else 0.0
+
+    def positions(self, rows=None) -> np.ndarray:
+        rows = np.flatnonzero(self._alive[:self._size]) if rows is None else rows
+        return self._pos[rows].copy()
+
+    # ---- 步进 ----
+    def step(self, dt: float) -> int:
+        """累积 dt 并执行整数个固定子步，随后批量写回；返回执行的子步数"""
+        self._accumulator += max(float(dt), 0.0)
+        substeps = min(int(self._accumulator / self.fixed_dt), self.max_substeps)
+        if substeps == 0:
+            return 0
+        self._accumulator = min(self._accumulator - substeps * self.fixed_dt, self.fixed_dt)
+        start_time = time.perf_counter()
+        for _ in range(substeps):
+            self.substep(self.fixed_dt)
+        mid_time = time.perf_counter()
+        self._stats["written"] = self.write_back()
+        self._stats["steps"] += substeps
+        self._stats["step_ms"] = round((mid_time - start_time) * 1000, 3)
+        self._stats["write_ms"] = round((time.perf_counter() - mid_time) * 1000, 3)
+        return substeps
+
+    def substep(self, h: float) -> None:
+        n = self._size
+        if not n:
+            return
+        alive = self._alive[:n]
+        dynamic = alive & (self._inv_mass[:n] > 0)
+        vel = self._vel[:n]
+        pos = self._pos[:n]
+        # 半隐式欧拉：先更新速度再用新速度更新位置
+        vel[dynamic] += self.gravity * (self._gravity_scale[:n, None][dynamic] * h)
+        pos[dynamic] += vel[dynamic] * h
+
+        rows = np.flatnonzero(alive)
+        if rows.size < 2:
+            return
+        center = pos[rows] + self._offset[rows]
+        half = self._half[rows]
+        a, b = sweep_pairs(center - half, center + half)
+        # 两个静态刚体之间无需求解
+        keep = (self._inv_mass[rows[a]] + self._inv_mass[rows[b]]) > 0
+        a, b = rows[a[keep]], rows[b[keep]]
+        self._stats["pairs"] = int(a.size)
+        if not a.size:
+            self._stats["contacts"] = 0
+            return
+        # 接触法线每个子步只算一次；迭代中穿透深度按两刚体沿法线的位移线性更新
+        normal, depth = self._contacts(a, b)
+        touching = depth > 0
+        a, b, normal, depth = a[touching], b[touching], normal[touching], depth[touching]
+        self._stats["contacts"] = int(a.size)
+        if not a.size:
+            return
+        start = self._pos[:n].copy()
+        for _ in range(self.iterations):
+            moved = self._pos[:n] - start
+            current = depth - np.einsum('ij,ij->i', moved[b] - moved[a], normal)
+            if not self._solve(a, b, normal, current):
+                break
+
+    def _contacts(self, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """候选对的接触法线（由 a 指向 b）与穿透深度（<= 0 表示未接触）"""
+        ca = self._pos[a] + self._offset[a]
+        cb = self._pos[b] + self._offset[b]
+        d = cb - ca
+        shape_a = self._shape[a]
+        shape_b = self._shape[b]
+        normal = np.zeros_like(d)
+        depth = np.full(a.shape[0], -1.0)
+
+        # 盒-盒（也用作球心落入盒内时的退化情形）：取重叠最小的轴
+        ha, hb = self._half[a], self._half[b]
+        overlap = np.minimum(ca + ha, cb + hb) - np.maximum(ca - ha, cb - hb)
+        axis = np.argmin(overlap, axis=1)
+        idx = np.arange(a.shape[0])
+        box_depth = overlap[idx, axis]
+        box_normal = np.zeros_like(d)
+        box_normal[idx, axis] = np.where(d[idx, axis] >= 0, 1.0, -1.0)
+        boxes = (shape_a == SHAPE_BOX) & (shape_b == SHAPE_BOX)
+        normal[boxes] = box_normal[boxes]
+        depth[boxes] = box_depth[boxes]
+
+        # 球-球
+        spheres = (shape_a == SHAPE_SPHERE) & (shape_b == SHAPE_SPHERE)
+        if spheres.any():
+            dist = np.linalg.norm(d[spheres], axis=1)
+            safe = np.where(dist > 1e-12, dist, 1.0)
+            n = np.where((dist > 1e-12)[:, None], d[spheres] / safe[:, None], [0.0, 1.0, 0.0])
+            normal[spheres] = n
+            depth[spheres] = self._radius[a[spheres]] + self._radius[b[spheres]] - dist
+
+        # 球-盒：球心到盒上最近点；球心在盒内时退化为盒-盒
+        mixed = ~(boxes | spheres)
+        if mixed.any():
+            sphere_is_a = shape_a[mixed] == SHAPE_SPHERE
+            sc = np.where(sphere_is_a[:, None], ca[mixed], cb[mixed])
+            bc = np.where(sphere_is_a[:, None], cb[mixed], ca[mixed])
+            bh = np.where(sphere_is_a[:, None], hb[mixed], ha[mixed])
+            radius = np.where(sphere_is_a, self._radius[a[mixed]], self._radius[b[mixed]])
+            closest = np.clip(sc, bc - bh, bc + bh)
+            v = closest - sc
+            dist = np.linalg.norm(v, axis=1)
+            outside = dist > 1e-9
+            to_box = np.where(outside[:, None], v / np.where(outside, dist, 1.0)[:, None], 0.0)
+            n = np.where(sphere_is_a[:, None], to_box, -to_box)
+            n = np.where(outside[:, None], n, box_normal[mixed])
+            normal[mixed] = n
+            depth[mixed] = np.where(outside, radius - dist, box_depth[mixed])
+        return normal, depth
+
+    def _solve(self, a: np.ndarray, b: np.ndarray, normal: np.ndarray, depth: np.ndarray) -> int:
+        """一次 Jacobi 迭代：法向冲量 + 穿透修正，冲量按每个刚体的接触数平均；返回仍在接触的数量"""
+        touching = depth > 0
+        if not touching.any():
+            return 0
+        a, b, normal, depth = a[touching], b[touching], normal[touching], depth[touching]
+        inv_a = self._inv_mass[a]
+        inv_b = self._inv_mass[b]
+        weight = inv_a + inv_b
+        n = self._size
+        # 同一刚体的多个接触冲量取平均，避免叠加过冲（穿透修正按方向各自生效，不取平均）
+        share = np.bincount(a, minlength=n) + np.bincount(b, minlength=n)
+        share_a = share[a]
+        share_b = share[b]
+
+        vn = np.einsum('ij,ij->i', self._vel[b] - self._vel[a], normal)
+        bounce = np.where(vn < -RESTITUTION_THRESHOLD, np.minimum(self._restitution[a], self._restitution[b]), 0.0)
+        impulse = np.where(vn < 0, -(1.0 + bounce) * vn / weight, 0.0)
+        correction = np.maximum(depth - PENETRATION_SLOP, 0.0) * CORRECTION_PERCENT / weight
+
+        dv = np.zeros((n, 3))
+        dp = np.zeros((n, 3))
+        for k in range(3):
+            jn = impulse * normal[:, k]
+            cn = correction * normal[:, k]
+            dv[:, k] = (np.bincount(b, jn * inv_b / share_b, minlength=n)
+                        - np.bincount(a, jn * inv_a / share_a, minlength=n))
+            dp[:, k] = np.bincount(b, cn * inv_b, minlength=n) - np.bincount(a, cn * inv_a, minlength=n)
+        self._vel[:n] += dv
+        self._pos[:n] += dp
+        return int(a.size)
+
+    # ---- 写回 ----
+    def write_back(self) -> int:
+        """把位置变化的刚体一次性写回 Geometry，并通知变换监听者；返回写回数量"""
+        n = self._size
+        moved = self._alive[:n] & (np.abs(self._pos[:n] - self._written[:n]).max(axis=1) > WRITE_EPSILON)
+        rows = [row for row in np.flatnonzero(moved) if self._actors[row] is not None]
+        if not rows:
+            return 0
+        rows = np.asarray(rows, dtype=np.intp)
+        actors = [self._actors[row] for row in rows]
+        positions = self._pos[rows]
+        Geometry.set_positions_batch([actor._geometry for actor in actors], positions)
+        self._written[rows] = positions
+        self._writing = True
+        try:
+            for actor in actors:
+                actor._transform_changed()
+        finally:
+            self._writing = False
+        return len(actors)
+
+    def dynamic_count(self) -> int:
+        """参与积分的刚体数（质量为 0 的静态刚体不计）"""
+        return int(np.count_nonzero(self._alive[:self._size] & (self._inv_mass[:self._size] > 0)))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["bodies"] = len(self)
+        stats["dynamic"] = self.dynamic_count()
+        return stats
+
+
+__all__ = ["SHAPE_SPHERE", "SHAPE_BOX", "sweep_pairs", "PhysicsWorld"]
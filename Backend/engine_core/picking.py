@@ -0,0 +1,272 @@
+"""
+CPU 射线拾取
+
+- TriangleBVH：按三角形质心 Morton 码排序后按固定叶大小切分，构建隐式完全二叉树（LBVH），
+  节点包围盒逐层向量化归并，构建为 O(T log T) 的 NumPy 操作
+- 遍历先逐层向量化下降求出射线穿过的叶节点，再按进入距离由近到远分批做向量化 Möller–Trumbore
+  测试（双面），命中后提前结束
+- BVH 按网格数据缓存：共享同一 MeshData 的 Actor 只构建一次，静态场景重复拾取不再构建
+- pick_ray：先用空间索引对 Actor 世界包围盒做宽相测试，再把射线变换到模型局部空间做精确测试
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import math
+import time
+import weakref
+
+import numpy as np
+
+from .obj_loader import MeshData
+from .transform_math import ray_aabbs, trs_matrices
+
+# 叶节点三角形数：越大树越浅，叶内向量化测试摊薄 NumPy 调用开销
+BVH_LEAF_SIZE = 32
+
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """(N, 3) 点 -> 30 位 Morton 码（每轴 10 位）"""
+    lo = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - lo, 1e-12)
+    q = np.clip(((points - lo) / extent * 1023.0).astype(np.uint64), 0, 1023)
+
+    def spread(v: np.ndarray) -> np.ndarray:
+        v = (v | (v << np.uint64(16))) & np.uint64(0x030000FF)
+        v = (v | (v << np.uint64(8))) & np.uint64(0x0300F00F)
+        v = (v | (v << np.uint64(4))) & np.uint64(0x030C30C3)
+        v = (v | (v << np.uint64(2))) & np.uint64(0x09249249)
+        return v
+
+    return (spread(q[:, 0]) << np.uint64(2)) | (spread(q[:, 1]) << np.uint64(1)) | spread(q[:, 2])
+
+
+class TriangleBVH:
+    """单个网格（局部空间）的三角形 BVH"""
+
+    # 宽相每步下降的层数（一次测试 2^n 个后代节点）
+    DESCEND_LEVELS = 4
+    # 窄相首批统一测试的叶节点数（之后逐批加倍）
+    LEAF_BATCH = 8
+
+    def __init__(self, positions: np.ndarray, indices: np.ndarray, leaf_size: int = BVH_LEAF_SIZE):
+        start_time = time.perf_counter()
+        positions = np.asarray(positions, dtype=np.float64)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        self.leaf_size = int(leaf_size)
+        self.triangle_count = int(indices.shape[0])
+
+        v0, v1, v2 = positions[indices[:, 0]], positions[indices[:, 1]], positions[indices[:, 2]]
+        tri_lo = np.minimum(np.minimum(v0, v1), v2)
+        tri_hi = np.maximum(np.maximum(v0, v1), v2)
+        order = np.argsort(_morton_codes((tri_lo + tri_hi) * 0.5), kind='stable') if self.triangle_count else \
+            np.zeros(0, dtype=np.int64)
+        self.order = order
+
+        # 按叶打包的三角形数据 (叶数, leaf_size, 12)：v0 / e1 / e2 / 面法线 N = e1 × e2（float32 存储，
+        # 求交时转 float64）；末叶不足部分补零，其行列式为 0，不会命中
+        leaf_count = max(1, -(-self.triangle_count // self.leaf_size))
+        e1, e2 = v1 - v0, v2 - v0
+        packed = np.zeros((leaf_count * self.leaf_size, 12), dtype=np.float32)
+        packed[:self.triangle_count] = np.hstack([v0, e1, e2, np.cross(e1, e2)])[order]
+        self._packed = packed.reshape(leaf_count, self.leaf_size, 12)
+
+        # 叶包围盒 -> 补齐为 2 的幂后自底向上归并（堆布局：节点 i 的子节点为 2i+1 / 2i+2）
+        padded = 1 << (leaf_count - 1).bit_length()
+        lo = np.full((2 * padded - 1, 3), np.nan)
+        hi = np.full((2 * padded - 1, 3), np.nan)
+        if self.triangle_count:
+            starts = np.arange(leaf_count) * self.leaf_size
+            lo[padded - 1:padded - 1 + leaf_count] = np.minimum.reduceat(tri_lo[order], starts)
+            hi[padded - 1:padded - 1 + leaf_count] = np.maximum.reduceat(tri_hi[order], starts)
+        level_start = padded - 1
+        while level_start > 0:
+            parent_start = (level_start - 1) // 2
+            width = level_start - parent_start
+            children = slice(level_start, level_start + 2 * width)
+            pairs_lo = lo[children].reshape(width, 2, 3)
+            pairs_hi = hi[children].reshape(width, 2, 3)
+            lo[parent_start:level_start] = np.fmin(pairs_lo[:, 0], pairs_lo[:, 1])
+            hi[parent_start:level_start] = np.fmax(pairs_hi[:, 0], pairs_hi[:, 1])
+            level_start = parent_start
+        self.first_leaf = padded - 1
+        self.node_count = 2 * padded - 1
+        self.depth = padded.bit_length() - 1
+        # 补齐的空节点包围盒为 NaN（归并时用 fmin/fmax 忽略），射线测试的比较恒为假，天然不命中
+        self.lo = lo
+        self.hi = hi
+        self.build_seconds = time.perf_counter() - start_time
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.lo.nbytes + self.hi.nbytes + self._packed.nbytes + self.order.nbytes)
+
+    def _leaves_hit(self, leaves: List[int], origin: np.ndarray, direction: np.ndarray,
+                    skew: np.ndarray, t_max: float) -> Tuple[float, int]:
+        """一批叶节点的三角形一次性做 Möller–Trumbore 测试，返回 (最近 t, 原始三角形下标)"""
+        tri = self._packed[leaves].reshape(-1, 12).astype(np.float64)
+        v0, e1, e2, normal = tri[:, 0:3], tri[:, 3:6], tri[:, 6:9], tri[:, 9:12]
+        s = origin - v0
+        # d × e 通过反对称矩阵一次矩阵乘得到；det = e1·(d×e2) = -N·d
+        det = -(normal @ direction)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv_det = 1.0 / det
+            u = np.einsum('ij,ij->i', s, e2 @ skew) * inv_det
+            v = -np.einsum('ij,ij->i', s, e1 @ skew) * inv_det
+            t = np.einsum('ij,ij->i', s, normal) * inv_det
+        hit = (np.abs(det) > 1e-12) & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t > 1e-9) & (t < t_max)
+        if not hit.any():
+            return t_max, -1
+        candidates = np.flatnonzero(hit)
+        best = candidates[np.argmin(t[candidates])]
+        leaf, offset = divmod(int(best), self.leaf_size)
+        return float(t[best]), int(self.order[leaves[leaf] * self.leaf_size + offset])
+
+    def intersect(self, origin: Sequence[float], direction: Sequence[float],
+                  t_max: float = math.inf) -> Optional[Tuple[int, float]]:
+        """最近命中 (原始三角形下标, 射线参数 t)；direction 无需归一化，t 以其长度为单位"""
+        if self.triangle_count == 0:
+            return None
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+
+        # 宽相：逐层向量化下降（每步跨 DESCEND_LEVELS 层），得到射线穿过的全部叶节点
+        frontier = np.zeros(1, dtype=np.int64)
+        depth = 0
+        t_near = np.zeros(1)
+        while depth < self.depth and frontier.size:
+            step = min(self.DESCEND_LEVELS, self.depth - depth)
+            width = 1 << step
+            frontier = ((frontier[:, None] + 1) * width - 1 + np.arange(width)).reshape(-1)
+            hit, t_near = ray_aabbs(origin, direction, self.lo[frontier], self.hi[frontier], t_max)
+            frontier, t_near = frontier[hit], t_near[hit]
+            depth += step
+        if not frontier.size:
+            return None
+        order = np.argsort(t_near, kind='stable')
+        leaves = (frontier[order] - self.first_leaf).tolist()
+        entries = t_near[order].tolist()
+
+        # 窄相：按进入距离由近到远分批测试（批大小逐次加倍），下一批的进入距离超过最近命中即结束
+        dx, dy, dz = direction.tolist()
+        # 行向量 e 右乘 skew 即 d × e
+        skew = np.array([[0.0, dz, -dy], [-dz, 0.0, dx], [dy, -dx, 0.0]])
+        best_t = t_max
+        best_triangle = -1
+        start, batch = 0, self.LEAF_BATCH
+        while start < len(leaves) and entries[start] < best_t:
+            t, triangle = self._leaves_hit(leaves[start:start + batch], origin, direction, skew, best_t)
+            if triangle >= 0:
+                best_t, best_triangle = t, triangle
+            start += batch
+            batch *= 2
+        if best_triangle < 0:
+            return None
+        return best_triangle, best_t
+
+
+# MeshData -> BVH（弱引用键）：网格被资源缓存淘汰或不再被 Geometry 持有时 BVH 随之释放
+_bvh_cache: "weakref.WeakKeyDictionary[MeshData, TriangleBVH]" = weakref.WeakKeyDictionary()
+_bvh_stats = {"hits": 0, "builds": 0, "build_seconds": 0.0}
+
+
+def bvh_for_mesh(mesh: MeshData) -> TriangleBVH:
+    """获取网格的 BVH（按网格数据缓存，首次使用时构建）"""
+    bvh = _bvh_cache.get(mesh)
+    if bvh is not None:
+        _bvh_stats["hits"] += 1
+        return bvh
+    bvh = TriangleBVH(mesh.positions, mesh.indices)
+    _bvh_cache[mesh] = bvh
+    _bvh_stats["builds"] += 1
+    _bvh_stats["build_seconds"] += bvh.build_seconds
+    return bvh
+
+
+def clear_bvh_cache() -> None:
+    _bvh_cache.clear()
+
+
+def bvh_cache_stats() -> Dict[str, Any]:
+    stats = dict(_bvh_stats)
+    stats["build_seconds"] = round(stats["build_seconds"], 4)
+    stats["meshes"] = len(_bvh_cache)
+    stats["bytes"] = sum(bvh.nbytes for bvh in list(_bvh_cache.values()))
+    return stats
+
+
+@dataclass(frozen=True)
+class PickResult:
+    """拾取结果：命中的 Actor（或 InstanceBatch）、网格中的三角形下标、沿射线的世界距离与命中点；
+    命中实例批次时 instance 为实例下标，否则为 -1"""
+    actor: Any
+    triangle: int
+    distance: float
+    position: Tuple[float, float, float]
+    instance: int = -1
+
+
+def closest_hit(origin: np.ndarray, direction: np.ndarray, candidates: Sequence[Tuple[Any, float]],
+                matrices: np.ndarray, mesh_of: Callable[[Any], MeshData],
+                max_distance: float = math.inf) -> Optional[Tuple[Any, int, float]]:
+    """
+    窄相：candidates 为按进入距离升序的 [(key, t_enter)]，matrices 为对应的局部到世界矩阵。
+    逐个把射线变换到局部空间并对网格 BVH 求交，下一个候选的进入距离超过当前最近命中时提前结束。
+    direction 须已归一化。返回 (key, triangle, t)，未命中返回 None。
+    """
+    best = None
+    best_t = max_distance
+    for (key, t_enter), matrix in zip(candidates, matrices):
+        if t_enter >= best_t:
+            break
+        try:
+            inverse = np.linalg.inv(matrix)
+        except np.linalg.LinAlgError:
+            # 零缩放的对象不可见，跳过
+            continue
+        # 仿射变换保持射线参数：局部空间求得的 t 即世界空间距离（direction 已归一化）
+        local_origin = inverse[:3, :3] @ origin + inverse[:3, 3]
+        local_direction = inverse[:3, :3] @ direction
+        hit = bvh_for_mesh(mesh_of(key)).intersect(local_origin, local_direction, best_t)
+        if hit is None:
+            continue
+        best_t = hit[1]
+        best = (key, hit[0], hit[1])
+    return best
+
+
+def pick_ray(spatial_index, origin: Sequence[float], direction: Sequence[float],
+             max_distance: float = math.inf) -> Optional[PickResult]:
+    """
+    世界空间射线拾取。spatial_index 为 ActorSpatialIndex：宽相按 Actor 世界包围盒进入距离排序，
+    当下一个候选的进入距离已超过当前最近命中时提前结束。
+    """
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+    direction = direction / np.linalg.norm(direction)
+    candidates = spatial_index.query_ray(origin, direction, max_distance)
+    if not candidates:
+        return None
+
+    actors = [actor for actor, _ in candidates]
+    matrices = trs_matrices(
+        [actor.get_world_position() for actor in actors],
+        [actor.get_world_rotation() for actor in actors],
+        [actor.get_world_scale() for actor in actors],
+    )
+    hit = closest_hit(origin, direction, candidates, matrices, lambda actor: actor._geometry.get_mesh(), max_distance)
+    if hit is None:
+        return None
+    actor, triangle, t = hit
+    point = origin + direction * t
+    return PickResult(actor, triangle, float(t), (float(point[0]), float(point[1]), float(point[2])))
+
+
+__all__ = [
+    "BVH_LEAF_SIZE",
+    "TriangleBVH",
+    "bvh_for_mesh",
+    "clear_bvh_cache",
+    "bvh_cache_stats",
+    "PickResult",
+    "closest_hit",
+    "pick_ray",
+]
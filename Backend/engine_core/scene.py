@@ -1,8 +1,21 @@
-from typing import List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from .geometry import Geometry
 from .actor import Actor
+from .actor_registry import ActorRegistry
 from .camera import Camera
+from .contact_tracker import ContactTracker
 from .environment import Environment
+from .instance_batch import InstanceBatch
+from .lod import LodSelector
+from .physics import PhysicsWorld
+from .picking import PickResult, pick_ray
+from .scene_graph import SceneGraph
+from .spatial_audio import SpatialAudio
+from .spatial_index import ActorSpatialIndex
+from .transform_math import frustum_planes
 from .viewport import Viewport
 
 from .engine_import import load_corona_engine
@@ -26,12 +39,32 @@ class Scene:
             raise RuntimeError("CoronaEngine 未提供 Scene 构造器")
         self.engine_scene = SceneCtor()
 
-        # 引用列表（Python 层）
-        self._actors: List[Actor] = []
+        # 引用列表（Python 层）；Actor 使用索引表以支持 O(1) 查询
+        self._actors = ActorRegistry()
+        # 父子层级：局部变换修改只标记子树，世界变换每帧批量计算并写回
+        self._graph = SceneGraph()
+        # 世界包围盒空间索引（松散八叉树），Actor 变换变化时增量更新；查询前先同步层级
+        self._spatial_index = ActorSpatialIndex(before_refresh=self._graph.flush)
+        # 逐帧接触对与包围盒中心缓存（侦测积木的碰到/距离与接触事件）
+        self.contacts = ContactTracker(self._spatial_index)
         self._viewports: List[Viewport] = []
+        # 刚体物理（Mechanics 组件的批量固定步长积分），每帧在 update() 中步进
+        self.physics = PhysicsWorld()
+        # 空间音频（以当前相机为听者的距离衰减与声像），每帧在 update() 中计算
+        self.audio = SpatialAudio()
+        # 实例批次（按名称），每个批次在引擎中只有一个 Actor
+        self._batches: Dict[str, InstanceBatch] = {}
+        # 因视锥剔除而在引擎侧隐藏的 Actor：id(actor) -> actor
+        self._culled: Dict[int, Actor] = {}
+        # 相机按名称归属场景，修改后统一在 update() 中推送
+        self._cameras: Dict[str, Camera] = {}
+        # 按当前相机距离切换 Actor 的 LOD Profile
+        self.lod_selector = LodSelector()
+        self.lod_enabled = True
 
         # 环境对象（Python 层）
         self._environment: Optional[Environment] = None
+        self.sun_direction: List[float] = [0.0, -1.0, 0.0]
 
     # Environment
     def set_environment(self, environment: Environment) -> None:
@@ -42,40 +75,355 @@ class Scene:
     def get_environment(self) -> Optional[Environment]:
         return self._environment
 
+    def set_sun_direction(self, direction: List[float]) -> None:
+        """设置太阳方向；场景尚无 Environment 时自动创建"""
+        if self._environment is None:
+            self.set_environment(Environment())
+        self._environment.set_sun_direction(direction)
+        self.sun_direction = list(direction)
+
     # Actor 管理
     def add_actor(self, actor: Actor) -> None:
-        if actor in self._actors:
+        if not self._actors.add(actor):
             return
-        self._actors.append(actor)
+        self._spatial_index.add(actor)
         if hasattr(self.engine_scene, 'add_actor'):
             self.engine_scene.add_actor(actor.engine_obj)
 
     def remove_actor(self, actor: Actor) -> bool:
-        if actor not in self._actors:
+        if not self._actors.remove(actor):
             return False
-        self._actors.remove(actor)
+        self.remove_rigid_body(actor)
+        self.remove_audio_source(actor)
+        self.contacts.forget(actor)
+        self._graph.detach(actor)
+        if self._culled.pop(id(actor), None) is not None:
+            self._set_engine_visible(actor, True)
+        self._spatial_index.remove(actor)
         if hasattr(self.engine_scene, 'remove_actor'):
             self.engine_scene.remove_actor(actor.engine_obj)
         return True
 
     def clear_actors(self) -> None:
-        for actor in self._actors.copy():
+        for actor in self._actors.values():
             self.remove_actor(actor)
 
+    def rename_actor(self, actor: Actor, name: str) -> None:
+        """修改 Actor 名称并同步索引"""
+        actor.name = name
+        self._actors.reindex(actor)
+
+    # 刚体
+    def add_rigid_body(self, actor: Actor, shape: str = "sphere", mass: float = 1.0, restitution: float = 0.2,
+                       gravity_scale: float = 1.0):
+        """把场景中的 Actor 加入物理世界（碰撞体取当前世界包围盒），返回其 Mechanics 组件"""
+        if actor not in self._actors:
+            raise ValueError(f"Actor '{actor.name}' is not in scene '{self.name}'")
+        mechanics = actor.mechanics
+        row = self.physics.add(actor, shape, mass, restitution, gravity_scale)
+        mechanics.attach(self.physics, row)
+        return mechanics
+
+    def remove_rigid_body(self, actor: Actor) -> bool:
+        if not self.physics.remove(actor):
+            return False
+        actor.mechanics.detach()
+        return True
+
+    # 空间音频
+    def add_audio_source(self, actor: Actor, volume: float = 1.0, ref_distance: float = 1.0,
+                         max_distance: float = 100.0, rolloff: float = 1.0):
+        """把场景中的 Actor 作为声源加入空间音频，返回其 Acoustics 组件"""
+        if actor not in self._actors:
+            raise ValueError(f"Actor '{actor.name}' is not in scene '{self.name}'")
+        acoustics = actor.acoustics
+        row = self.audio.add(acoustics, volume, ref_distance, max_distance, rolloff)
+        acoustics.attach(self.audio, row)
+        return acoustics
+
+    def remove_audio_source(self, actor: Actor) -> bool:
+        acoustics = actor._acoustics
+        if acoustics is None or not self.audio.remove(acoustics):
+            return False
+        acoustics.detach()
+        return True
+
+    # 实例批次
+    def add_batch(self, batch: InstanceBatch) -> None:
+        existing = self._batches.get(batch.name)
+        if existing is batch:
+            return
+        if existing is not None:
+            raise ValueError(f"InstanceBatch '{batch.name}' already exists in scene '{self.name}'")
+        self._batches[batch.name] = batch
+        if hasattr(self.engine_scene, 'add_actor'):
+            self.engine_scene.add_actor(batch.engine_obj)
+
+    def remove_batch(self, batch_name: str) -> bool:
+        batch = self._batches.pop(batch_name, None)
+        if batch is None:
+            return False
+        if hasattr(self.engine_scene, 'remove_actor'):
+            self.engine_scene.remove_actor(batch.engine_obj)
+        return True
+
+    def get_batch(self, batch_name: str) -> Optional[InstanceBatch]:
+        return self._batches.get(batch_name)
+
+    def get_batches(self) -> List[InstanceBatch]:
+        return list(self._batches.values())
+
+    def flush_batches(self) -> int:
+        """上传所有 dirty 批次的实例变换，返回上传次数"""
+        return sum(1 for batch in self._batches.values() if batch.flush())
+
+    # 层级
+    @property
+    def scene_graph(self) -> SceneGraph:
+        return self._graph
+
+    def set_parent(self, child: Actor, parent: Optional[Actor], keep_world: bool = True) -> None:
+        """把 child 挂到 parent 下（parent=None 解除）；keep_world 保持 child 当前世界变换"""
+        for actor in (child, parent):
+            if actor is not None and actor not in self._actors:
+                raise ValueError(f"Actor '{actor.name}' 不在场景 '{self.name}' 中")
+        self._graph.set_parent(child, parent, keep_world)
+
+    def get_world_matrix(self, actor: Actor) -> List[List[float]]:
+        """Actor 的局部到世界矩阵（4×4，列向量约定）"""
+        return self._graph.world_matrix(actor).tolist()
+
+    def get_root_actors(self) -> List[Actor]:
+        return [actor for actor in self._actors.values() if actor.parent is None]
+
+    # 空间查询（基于世界包围盒；包围盒中心作为 Actor 的位置参与距离计算）
+    @property
+    def spatial_index(self) -> ActorSpatialIndex:
+        return self._spatial_index
+
+    def get_world_bounds(self, actor: Actor) -> Optional[Tuple[List[float], List[float]]]:
+        bounds = self._spatial_index.world_bounds(actor)
+        return None if bounds is None else (bounds[0].tolist(), bounds[1].tolist())
+
+    def _resolve_point(self, target: Union[Actor, str, Sequence[float]]) -> np.ndarray:
+        """Actor / Actor 名称 / 坐标 -> 世界坐标"""
+        if isinstance(target, str):
+            actor = self.find_actor(target)
+            if actor is None:
+                raise ValueError(f"Actor '{target}' not found in scene '{self.name}'")
+            target = actor
+        if isinstance(target, Actor):
+            center = self._spatial_index.center(target)
+            return center if center is not None else np.asarray(target.get_world_position(), dtype=np.float64)
+        return np.asarray(target, dtype=np.float64)
+
+    def query_aabb(self, lo: Sequence[float], hi: Sequence[float]) -> List[Actor]:
+        """世界包围盒与 [lo, hi] 相交的 Actor"""
+        return self._spatial_index.query_aabb(lo, hi)
+
+    def query_radius(self, center: Union[Actor, str, Sequence[float]], radius: float) -> List[Tuple[Actor, float]]:
+        """中心距 center 不超过 radius 的 Actor，按距离升序 [(actor, distance)]（不含 center 自身）"""
+        point = self._resolve_point(center)
+        return [(a, d) for a, d in self._spatial_index.query_radius(point, radius) if a is not center]
+
+    def query_nearest(self, center: Union[Actor, str, Sequence[float]], k: int = 1) -> List[Tuple[Actor, float]]:
+        """距 center 最近的 k 个 Actor [(actor, distance)]；center 为 Actor 时排除其自身"""
+        if isinstance(center, str):
+            center = self.find_actor(center) or center
+        exclude = (center,) if isinstance(center, Actor) else ()
+        return self._spatial_index.nearest(self._resolve_point(center), k, exclude)
+
+    def query_frustum(self, camera: Optional[Camera] = None, aspect: float = 16.0 / 9.0,
+                      near: float = 0.1, far: float = 1000.0) -> List[Actor]:
+        """与相机视锥相交的 Actor（默认使用场景第一个相机）"""
+        camera = camera or self.get_camera()
+        if camera is None:
+            raise ValueError(f"Scene '{self.name}' has no camera")
+        planes = frustum_planes(camera.get_position(), camera.get_forward(), camera.get_world_up(),
+                                camera.get_fov(), aspect, near, far)
+        return self._spatial_index.query_frustum(planes)
+
+    def pick_ray(self, origin: Sequence[float], direction: Sequence[float],
+                 max_distance: float = float('inf')) -> Optional[PickResult]:
+        """世界空间射线拾取：返回最近命中的 Actor（或实例批次及实例下标）、三角形与距离"""
+        best = pick_ray(self._spatial_index, origin, direction, max_distance)
+        for batch in self._batches.values():
+            hit = batch.pick(origin, direction, best.distance if best is not None else max_distance)
+            if hit is not None:
+                best = hit
+        return best
+
+    def _resolve_actor(self, target: Union[Actor, str]) -> Actor:
+        if isinstance(target, Actor):
+            return target
+        actor = self.find_actor(target)
+        if actor is None:
+            raise ValueError(f"Actor '{target}' not found in scene '{self.name}'")
+        return actor
+
+    def touching(self, a: Union[Actor, str], b: Union[Actor, str]) -> bool:
+        """两个 Actor 的世界包围盒在最近一帧是否相交（读取接触缓存）"""
+        return self.contacts.touching(self._resolve_actor(a), self._resolve_actor(b))
+
+    def distance_between(self, a: Union[Actor, str, Sequence[float]], b: Union[Actor, str, Sequence[float]]) -> float:
+        """两个 Actor（或坐标）世界包围盒中心之间的距离；两个都是 Actor 时优先读取本帧接触缓存"""
+        if isinstance(a, (Actor, str)) and isinstance(b, (Actor, str)):
+            cached = self.contacts.distance(self._resolve_actor(a), self._resolve_actor(b))
+            if cached is not None:
+                return cached
+        return float(np.linalg.norm(self._resolve_point(a) - self._resolve_point(b)))
+
+    # 相机管理
+    def add_camera(self, camera: Camera) -> None:
+        """加入相机：此后其修改由 update() 中的 flush_cameras() 每帧统一推送"""
+        previous = self._cameras.get(camera.name)
+        if previous is camera:
+            return
+        if previous is not None:
+            previous._detach_scene()
+        self._cameras[camera.name] = camera
+        camera._attach_scene()
+
+    def remove_camera(self, camera_name: str) -> bool:
+        camera = self._cameras.pop(camera_name, None)
+        if camera is None:
+            return False
+        camera._detach_scene()
+        return True
+
+    def clear_cameras(self) -> None:
+        for camera_name in list(self._cameras):
+            self.remove_camera(camera_name)
+
+    def get_camera(self, camera_name: Optional[str] = None) -> Optional[Camera]:
+        """按名称获取相机；未指定名称时返回最先加入的相机"""
+        if camera_name is None:
+            return next(iter(self._cameras.values()), None)
+        return self._cameras.get(camera_name)
+
+    def get_cameras(self) -> List[Camera]:
+        return list(self._cameras.values())
+
+    def set_camera(self, position: List[float], forward: List[float], up: List[float], fov: float,
+                   camera_name: Optional[str] = None) -> Camera:
+        """更新相机姿态（仅标记 dirty，下一次 update() 时推送到引擎）"""
+        camera = self.get_camera(camera_name)
+        if camera is None:
+            raise ValueError(f"Camera '{camera_name or '<default>'}' not found in scene '{self.name}'")
+        camera.set(position, forward, up, fov)
+        return camera
+
+    def flush_cameras(self) -> int:
+        """推送所有 dirty 相机，返回推送次数"""
+        return sum(1 for camera in self._cameras.values() if camera.flush())
+
+    def texture_stats(self) -> Dict[str, int]:
+        """场景内 Actor 引用的纹理统计（同一纹理被多个 Actor 共享时只计一次）"""
+        textures: Dict[str, int] = {}
+        for actor in self._actors.values():
+            materials = getattr(actor, 'materials', None)
+            if materials is None:
+                continue
+            for entry in materials.textures.values():
+                textures[entry.key] = entry.byte_size
+        return {"textures": len(textures), "texture_bytes": sum(textures.values())}
+
+    def update_lods(self) -> int:
+        """按默认相机位置为所有带 LOD 的 Actor 选择级别，返回切换数"""
+        camera = self.get_camera()
+        if camera is None or not self.lod_enabled:
+            return 0
+        return self.lod_selector.select(self._actors.values(), camera.get_position())
+
+    # 视锥剔除
+    def update_visibility(self) -> int:
+        """
+        为每个已设置相机的视口计算本帧可见集。
+        对开启 hide_culled 的视口，不在其中任何一个视锥内的 Actor 在引擎侧隐藏，重新进入视锥时恢复；
+        只对可见性发生变化的 Actor 调用引擎。返回本帧可见性变化的 Actor 数。
+        """
+        tree = self._spatial_index.tree
+        shown = None
+        for viewport in self._viewports:
+            if not isinstance(viewport, Viewport) or viewport._camera is None:
+                continue
+            slots, mask = viewport.update_visibility()
+            if viewport.hide_culled:
+                if shown is None:
+                    shown = np.zeros(tree._size, dtype=bool)
+                shown[slots[mask]] = True
+        if shown is None:
+            hidden: Dict[int, Actor] = {}
+        else:
+            slots = np.flatnonzero(tree._alive[:tree._size] & ~shown)
+            hidden = {id(actor): actor for actor in tree.items_at(slots)}
+        if not hidden and not self._culled:
+            return 0
+        changed = 0
+        for key in self._culled.keys() - hidden.keys():
+            self._set_engine_visible(self._culled[key], True)
+            changed += 1
+        for key in hidden.keys() - self._culled.keys():
+            self._set_engine_visible(hidden[key], False)
+            changed += 1
+        self._culled = hidden
+        return changed
+
+    def _set_engine_visible(self, actor: Actor, visible: bool) -> None:
+        """引擎 Actor 提供 set_visible 时直接切换，否则从引擎场景中摘除/重新加入"""
+        if hasattr(actor.engine_obj, 'set_visible'):
+            actor.engine_obj.set_visible(visible)
+        elif visible:
+            if hasattr(self.engine_scene, 'add_actor'):
+                self.engine_scene.add_actor(actor.engine_obj)
+        elif hasattr(self.engine_scene, 'remove_actor'):
+            self.engine_scene.remove_actor(actor.engine_obj)
+
+    def culling_stats(self) -> Dict[str, Any]:
+        """各视口最近一帧的可见/剔除/总数与耗时，以及当前在引擎侧隐藏的 Actor 数"""
+        return {
+            "viewports": [vp.culling_stats() for vp in self._viewports if isinstance(vp, Viewport)],
+            "hidden": len(self._culled),
+        }
+
+    # 帧更新
+    def is_simulating(self) -> bool:
+        """场景是否需要持续逐帧更新：有动态刚体、接触回调或空间音频声源"""
+        return self.physics.dynamic_count() > 0 or self.contacts.has_handlers() or len(self.audio) > 0
+
+    def update(self, dt: float = 0.0) -> None:
+        """每帧调用一次：把本帧累积的修改批量同步到引擎"""
+        self.physics.step(dt)
+        self._graph.flush()
+        self.flush_cameras()
+        self._spatial_index.refresh()
+        self.contacts.update()
+        self.update_lods()
+        self.audio.update(self.get_camera())
+        self.update_visibility()
+        self.flush_batches()
+
     # 视口管理
     def add_viewport(self, viewport: Viewport) -> None:
         if viewport in self._viewports:
             return
         self._viewports.append(viewport)
+        if isinstance(viewport, Viewport):
+            viewport.attach_scene(self)
         self.engine_scene.add_viewport(getattr(viewport, 'engine_obj', viewport))
 
     def remove_viewport(self, viewport: Viewport) -> bool:
         if viewport not in self._viewports:
             return False
         self._viewports.remove(viewport)
+        if isinstance(viewport, Viewport):
+            viewport.attach_scene(None)
         self.engine_scene.remove_viewport(getattr(viewport, 'engine_obj', viewport))
         return True
 
+    def get_viewport(self, viewport_name: str) -> Optional[Viewport]:
+        return next((vp for vp in self._viewports if getattr(vp, 'name', None) == viewport_name), None)
+
     def clear_viewports(self) -> None:
         for vp in self._viewports.copy():
             self.remove_viewport(vp)
@@ -85,13 +433,23 @@ class Scene:
 
     # 查询
     def get_actors(self) -> List[Actor]:
-        return self._actors.copy()
+        return self._actors.values()
+
+    def actor_count(self) -> int:
+        return len(self._actors)
+
+    def has_actor(self, actor: Actor) -> bool:
+        return actor in self._actors
 
     def get_actor(self, actor_name: str) -> Optional[Actor]:
-        for actor in self._actors:
-            if actor.name == actor_name:
-                return actor
-        return None
+        return self._actors.get_by_name(actor_name)
 
+    def get_actor_by_id(self, actor_id: int) -> Optional[Actor]:
+        return self._actors.get_by_id(actor_id)
 
+    def get_actor_by_path(self, path: str) -> Optional[Actor]:
+        return self._actors.get_by_path(path)
 
+    def find_actor(self, key: str) -> Optional[Actor]:
+        """按精确名称 → 规范化名称（忽略大小写/引号/扩展名）→ 资源路径查找"""
+        return self._actors.find(key)
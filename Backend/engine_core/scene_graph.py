@@ -0,0 +1,234 @@
+"""
+场景层级（父子关系）与世界矩阵缓存
+
+- 只有处于层级中的 Actor（有父节点或有子节点）才由 SceneGraph 管理，其余 Actor 不受影响
+- 变换修改只把该 Actor 标记为 dirty（代表整棵子树），不立即计算也不写引擎
+- flush()：每帧一次，从 dirty 子树的根开始按深度逐层批量计算 world = parent_world · local，
+  再把所有受影响子节点的世界 TRS 通过 Geometry.set_transforms_batch 一次性写回引擎
+- 移动一个拥有上万子节点的父节点只是一次标记，刷新时为一次向量化计算与一次批量写回
+"""
+from typing import Dict, List, Optional
+import logging
+import time
+
+import numpy as np
+
+from .actor import Actor
+from .geometry import Geometry
+from .transform_math import matrices_to_trs, trs_matrices
+
+logger = logging.getLogger(__name__)
+
+
+def _world_trs_matrices(actors: List[Actor]) -> np.ndarray:
+    return trs_matrices(
+        [actor.get_world_position() for actor in actors],
+        [actor.get_world_rotation() for actor in actors],
+        [actor.get_world_scale() for actor in actors],
+    )
+
+
+class SceneGraph:
+    def __init__(self):
+        # id(actor) -> actor：层级中的全部 Actor
+        self._members: Dict[int, Actor] = {}
+        # id(actor) -> 缓存的局部到世界矩阵 (4, 4)
+        self._world: Dict[int, np.ndarray] = {}
+        self._dirty: Dict[int, Actor] = {}
+        self._flushing = False
+        self._last_updated = 0
+        self._last_seconds = 0.0
+        self._total_updated = 0
+
+    # ---- 成员 ----
+    def _join(self, actor: Actor) -> None:
+        if id(actor) not in self._members:
+            self._members[id(actor)] = actor
+            actor.add_transform_listener(self.mark_dirty)
+
+    def _leave_if_isolated(self, actor: Actor) -> None:
+        if actor._parent is None and not actor._children and id(actor) in self._members:
+            del self._members[id(actor)]
+            self._world.pop(id(actor), None)
+            self._dirty.pop(id(actor), None)
+            actor.remove_transform_listener(self.mark_dirty)
+
+    def __contains__(self, actor: Actor) -> bool:
+        return id(actor) in self._members
+
+    def mark_dirty(self, actor: Actor) -> None:
+        if not self._flushing and id(actor) in self._members:
+            self._dirty[id(actor)] = actor
+
+    @staticmethod
+    def _is_ancestor(ancestor: Actor, actor: Optional[Actor]) -> bool:
+        while actor is not None:
+            if actor is ancestor:
+                return True
+            actor = actor._parent
+        return False
+
+    def descendants(self, actor: Actor) -> List[Actor]:
+        """按深度顺序返回 actor 的全部后代"""
+        result: List[Actor] = []
+        level = list(actor._children)
+        while level:
+            result.extend(level)
+            level = [child for node in level for child in node._children]
+        return result
+
+    # ---- 世界矩阵 ----
+    def world_matrix(self, actor: Actor) -> np.ndarray:
+        """Actor 当前的局部到世界矩阵（必要时先刷新）"""
+        self.flush()
+        cached = self._world.get(id(actor))
+        if cached is not None:
+            return cached.copy()
+        return _world_trs_matrices([actor])[0]
+
+    def set_parent(self, child: Actor, parent: Optional[Actor], keep_world: bool = True) -> None:
+        """
+        设置父节点（parent=None 表示解除父子关系）。
+        keep_world=True 时保持子节点当前的世界变换不变（换算出新的局部变换），
+        否则保持局部变换不变（世界位置随新父节点变化）。
+        """
+        if not hasattr(child, '_geometry') or (parent is not None and not hasattr(parent, '_geometry')):
+            raise RuntimeError("只有带 Geometry 的 Actor 可以建立父子关系")
+        if parent is child._parent:
+            return
+        if parent is not None and self._is_ancestor(child, parent):
+            raise ValueError(f"不能把 {child.name} 挂到其后代 {parent.name} 下")
+        self.flush()
+
+        child_world = self._world.get(id(child))
+        if child_world is None:
+            child_world = _world_trs_matrices([child])[0]
+        local = [child.get_position(), child.get_rotation(), child.get_scale()]
+
+        old_parent = child._parent
+        if old_parent is not None:
+            old_parent._children.remove(child)
+            self._leave_if_isolated(old_parent)
+        child._parent = parent
+
+        if parent is None:
+            child._local = None
+            if not keep_world:
+                Geometry.set_transforms_batch([child._geometry], [local[0]], [local[1]], [local[2]])
+        else:
+            parent._children.append(child)
+            self._join(parent)
+            if keep_world:
+                parent_world = self._world.get(id(parent))
+                if parent_world is None:
+                    parent_world = _world_trs_matrices([parent])[0]
+                pos, rot, scl = matrices_to_trs(np.linalg.inv(parent_world) @ child_world)
+                local = [pos[0].tolist(), rot[0].tolist(), scl[0].tolist()]
+            child._local = [list(map(float, v)) for v in local]
+        self._join(child)
+        self._leave_if_isolated(child)
+        if id(child) in self._members:
+            self._dirty[id(child)] = child
+        child._transform_changed()
+
+    def detach(self, actor: Actor) -> None:
+        """Actor 离开场景：子节点保持世界变换挂到根下，自身解除与父节点的关系"""
+        for child in list(actor._children):
+            self.set_parent(child, None)
+        if actor._parent is not None:
+            self.set_parent(actor, None)
+        self._leave_if_isolated(actor)
+
+    # ---- 刷新 ----
+    def flush(self) -> int:
+        """批量重算 dirty 子树的世界矩阵并写回引擎，返回写回的 Actor 数"""
+        if not self._dirty:
+            return 0
+        start_time = time.perf_counter()
+        dirty = self._dirty
+        self._dirty = {}
+        # 只从没有 dirty 祖先的节点出发，避免重复计算
+        tops = []
+        for actor in dirty.values():
+            node = actor._parent
+            while node is not None and id(node) not in dirty:
+                node = node._parent
+            if node is None:
+                tops.append(actor)
+
+        updated: List[Actor] = []
+        matrices: List[np.ndarray] = []
+        level = tops
+        while level:
+            roots = [actor for actor in level if actor._parent is None]
+            nodes = [actor for actor in level if actor._parent is not None]
+            if roots:
+                for actor, world in zip(roots, _world_trs_matrices(roots)):
+                    self._world[id(actor)] = world
+            if nodes:
+                local = trs_matrices(
+                    [actor._local[0] for actor in nodes],
+                    [actor._local[1] for actor in nodes],
+                    [actor._local[2] for actor in nodes],
+                )
+                # 同一父节点的兄弟共享一个父矩阵
+                parent_index: Dict[int, int] = {}
+                parents: List[Actor] = []
+                index = np.empty(len(nodes), dtype=np.intp)
+                for i, actor in enumerate(nodes):
+                    key = id(actor._parent)
+                    slot = parent_index.get(key)
+                    if slot is None:
+                        slot = parent_index[key] = len(parents)
+                        parents.append(actor._parent)
+                    index[i] = slot
+                parent_world = np.stack([self._parent_world(parent) for parent in parents])
+                world = parent_world[index] @ local
+                for actor, matrix in zip(nodes, world):
+                    self._world[id(actor)] = matrix
+                updated.extend(nodes)
+                matrices.append(world)
+            level = [child for actor in level for child in actor._children]
+
+        if updated:
+            pos, rot, scl = matrices_to_trs(np.concatenate(matrices))
+            Geometry.set_transforms_batch([actor._geometry for actor in updated], pos, rot, scl)
+            # 通知 LOD 同步与空间索引；刷新期间的回调不会再次标记 dirty
+            self._flushing = True
+            try:
+                for actor in updated:
+                    actor._transform_changed()
+            finally:
+                self._flushing = False
+
+        self._last_updated = len(updated)
+        self._total_updated += len(updated)
+        self._last_seconds = time.perf_counter() - start_time
+        logger.debug("SceneGraph 刷新 %d 个节点，耗时 %.2f ms", len(updated), self._last_seconds * 1000)
+        return len(updated)
+
+    def _parent_world(self, parent: Actor) -> np.ndarray:
+        world = self._world.get(id(parent))
+        if world is None:
+            world = _world_trs_matrices([parent])[0]
+            self._world[id(parent)] = world
+        return world
+
+    def clear(self) -> None:
+        for actor in list(self._members.values()):
+            actor.remove_transform_listener(self.mark_dirty)
+        self._members.clear()
+        self._world.clear()
+        self._dirty.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "nodes": len(self._members),
+            "dirty": len(self._dirty),
+            "last_updated": self._last_updated,
+            "total_updated": self._total_updated,
+            "last_ms": round(self._last_seconds * 1000, 3),
+        }
+
+
+__all__ = ["SceneGraph"]
@@ -1,4 +1,5 @@
 from typing import Dict, Optional, Any
+from .animation_clock import default_animation_clock
 from .scene import Scene
 
 
@@ -25,9 +26,23 @@ class SceneManager:
         """获取场景"""
         return self.scenes.get(scene_name)
 
+    def tick(self, dt: float = 0.0) -> None:
+        """帧驱动：推进共享动画时钟（所有 Kinematics 一次向量化计算），再依次更新所有场景"""
+        default_animation_clock().advance(dt)
+        for scene in list(self.scenes.values()):
+            scene.update(dt)
+
+    def has_active_simulation(self) -> bool:
+        """是否有需要持续推进的模拟：正在播放的动画，或任一场景仍在模拟（见 Scene.is_simulating）"""
+        if default_animation_clock().playing_count() > 0:
+            return True
+        return any(scene.is_simulating() for scene in self.scenes.values())
+
     def delete_scene(self, scene_name: str) -> bool:
         """删除场景"""
-        if scene_name in self.scenes:
-            del self.scenes[scene_name]
+        scene = self.scenes.pop(scene_name, None)
+        if scene is not None:
+            # 相机可能被其他场景或工厂缓存继续使用，离开场景后改为立即推送
+            scene.clear_cameras()
             return True
         return False
@@ -0,0 +1,199 @@
+"""
+空间音频：以当前相机为听者的声源距离衰减与立体声声像
+
+- SpatialAudio 以 SoA 数组保存场景内全部声源（Acoustics 组件）：基础音量、参考距离、最大距离、衰减系数，
+  以及上次推送给引擎的音量与声像
+- update(camera) 每帧一次：从引擎变换表（SoA）批量读取全部声源位置（没有变换表时读 Geometry 缓存），
+  一次 NumPy 运算得到听者距离衰减（反距离钳制模型）与左右声像
+- 只把变化超过阈值的音量/声像推送给引擎；听者与声源都不动时整帧没有引擎调用
+- 声源位置为 Geometry 的世界位置（有父节点的 Actor 由 SceneGraph 写回世界变换）
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import time
+
+import numpy as np
+
+from .geometry import Geometry
+
+logger = logging.getLogger(__name__)
+
+# 音量/声像变化小于该值时不推送给引擎
+PUSH_THRESHOLD = 1e-3
+
+
+def attenuate(positions: np.ndarray, listener: Sequence[float], forward: Sequence[float], up: Sequence[float],
+              ref_distance: np.ndarray, max_distance: np.ndarray, rolloff: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    反距离钳制衰减与声像：gain = ref / (ref + rolloff · (clamp(d, ref, max) - ref))；
+    pan 为声源方向在听者右方向上的投影（-1 左 ~ 1 右，与听者重合时为 0）。
+    """
+    listener = np.asarray(listener, dtype=np.float64)
+    forward = np.asarray(forward, dtype=np.float64)
+    right = np.cross(forward, np.asarray(up, dtype=np.float64))
+    norm = np.linalg.norm(right)
+    right = right / norm if norm > 1e-12 else np.array([1.0, 0.0, 0.0])
+    offset = positions - listener
+    distance = np.linalg.norm(offset, axis=1)
+    clamped = np.clip(distance, ref_distance, np.maximum(max_distance, ref_distance))
+    gain = ref_distance / np.maximum(ref_distance + rolloff * (clamped - ref_distance), 1e-12)
+    pan = np.where(distance > 1e-9, offset @ right / np.maximum(distance, 1e-9), 0.0)
+    return gain, pan
+
+
+class SpatialAudio:
+    def __init__(self, threshold: float = PUSH_THRESHOLD, capacity: int = 64):
+        self.threshold = float(threshold)
+        self.enabled = True
+        self._volume = np.ones(capacity, dtype=np.float64)
+        self._ref = np.ones(capacity, dtype=np.float64)
+        self._max = np.full(capacity, 100.0, dtype=np.float64)
+        self._rolloff = np.ones(capacity, dtype=np.float64)
+        # 上次推送的音量/声像（NaN 表示尚未推送）
+        self._pushed_volume = np.full(capacity, np.nan, dtype=np.float64)
+        self._pushed_pan = np.full(capacity, np.nan, dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._sources: List[Optional[Any]] = [None] * capacity
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        # 按变换表分组的位置读取计划，成员变化时重建
+        self._plan: Optional[Tuple[np.ndarray, list, np.ndarray]] = None
+        self._stats = {"frames": 0, "pushed": 0, "last_pushed": 0, "last_ms": 0.0}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, acoustics: Any) -> bool:
+        return id(acoustics) in self._rows
+
+    def _grow(self) -> None:
+        capacity = self._volume.shape[0] * 2
+        for name, fill in (('_volume', 1.0), ('_ref', 1.0), ('_max', 100.0), ('_rolloff', 1.0),
+                           ('_pushed_volume', np.nan), ('_pushed_pan', np.nan), ('_alive', False)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+        self._sources.extend([None] * (capacity - len(self._sources)))
+
+    # ---- 声源管理 ----
+    def add(self, acoustics: Any, volume: float = 1.0, ref_distance: float = 1.0, max_distance: float = 100.0,
+            rolloff: float = 1.0) -> int:
+        """登记声源（Acoustics 组件），返回行号；已登记时只更新参数"""
+        row = self._rows.get(id(acoustics))
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size >= self._volume.shape[0]:
+                    self._grow()
+                row = self._size
+                self._size += 1
+            self._rows[id(acoustics)] = row
+            self._sources[row] = acoustics
+            self._alive[row] = True
+            self._pushed_volume[row] = np.nan
+            self._pushed_pan[row] = np.nan
+            self._plan = None
+        self._volume[row] = volume
+        self.set_attenuation(row, ref_distance, max_distance, rolloff)
+        return row
+
+    def remove(self, acoustics: Any) -> bool:
+        row = self._rows.pop(id(acoustics), None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._sources[row] = None
+        self._free.append(row)
+        self._plan = None
+        return True
+
+    def clear(self) -> None:
+        for acoustics in [s for s in self._sources[:self._size] if s is not None]:
+            self.remove(acoustics)
+
+    def set_volume(self, row: int, volume: float) -> None:
+        self._volume[row] = max(float(volume), 0.0)
+
+    def get_volume(self, row: int) -> float:
+        return float(self._volume[row])
+
+    def set_attenuation(self, row: int, ref_distance: float, max_distance: float, rolloff: float) -> None:
+        if ref_distance <= 0:
+            raise ValueError("参考距离必须大于 0")
+        self._ref[row] = ref_distance
+        self._max[row] = max(float(max_distance), float(ref_distance))
+        self._rolloff[row] = max(float(rolloff), 0.0)
+
+    def effective(self, row: int) -> Tuple[float, float]:
+        """最近一次推送的 (音量, 声像)"""
+        return float(self._pushed_volume[row]), float(self._pushed_pan[row])
+
+    # ---- 每帧更新 ----
+    def _build_plan(self):
+        rows = np.flatnonzero(self._alive[:self._size])
+        engine_objs = [self._sources[row].geometry.engine_obj for row in rows]
+        groups, single = Geometry._group_by_table(engine_objs)
+        readable = []
+        for table, index in groups:
+            if hasattr(table, 'get_positions'):
+                readable.append((table, np.asarray(index, dtype=np.intp),
+                                 np.asarray([engine_objs[i].row for i in index], dtype=np.intp)))
+            else:
+                single.extend(index)
+        return rows, readable, np.asarray(single, dtype=np.intp)
+
+    def positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(行号, (N, 3) 声源世界位置)：按变换表批量读取，其余读 Geometry 缓存"""
+        if self._plan is None:
+            self._plan = self._build_plan()
+        rows, groups, single = self._plan
+        positions = np.empty((rows.size, 3), dtype=np.float64)
+        for table, index, table_rows in groups:
+            positions[index] = table.get_positions(table_rows)
+        for i in single.tolist():
+            positions[i] = self._sources[rows[i]].geometry.get_position()
+        return rows, positions
+
+    def update(self, camera: Any) -> int:
+        """以 camera 为听者计算全部声源的音量与声像，推送变化超过阈值的声源，返回推送数"""
+        if camera is None or not self.enabled or not self._rows:
+            return 0
+        start_time = time.perf_counter()
+        rows, positions = self.positions()
+        gain, pan = attenuate(positions, camera.get_position(), camera.get_forward(), camera.get_world_up(),
+                              self._ref[rows], self._max[rows], self._rolloff[rows])
+        volume = self._volume[rows] * gain
+        # NaN（从未推送）与任何值比较都不成立，用 ~(<=) 让其必然推送
+        changed = ~(np.abs(volume - self._pushed_volume[rows]) <= self.threshold) \
+            | ~(np.abs(pan - self._pushed_pan[rows]) <= self.threshold)
+        done: List[int] = []
+        for i, vol, p in zip(np.flatnonzero(changed).tolist(), volume[changed].tolist(), pan[changed].tolist()):
+            acoustics = self._sources[rows[i]]
+            try:
+                acoustics.engine_obj.set_volume(vol)
+                if hasattr(acoustics.engine_obj, 'set_pan'):
+                    acoustics.engine_obj.set_pan(p)
+            except Exception as e:
+                logger.warning("推送声源 %s 音量失败: %s", acoustics.name, e)
+                continue
+            done.append(i)
+        pushed = len(done)
+        self._pushed_volume[rows[done]] = volume[done]
+        self._pushed_pan[rows[done]] = pan[done]
+        self._stats["frames"] += 1
+        self._stats["pushed"] += pushed
+        self._stats["last_pushed"] = pushed
+        self._stats["last_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+        return pushed
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["sources"] = len(self)
+        stats["threshold"] = self.threshold
+        return stats
+
+
+__all__ = ["PUSH_THRESHOLD", "attenuate", "SpatialAudio"]
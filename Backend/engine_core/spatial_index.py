@@ -0,0 +1,414 @@
+"""
+场景空间索引（松散八叉树 / 分层松散网格）
+
+- 每个对象按包围盒尺寸放入某一层（单元边长 = leaf_size · 2^level ≥ 最长边），按中心点落入该层的单元；
+  单元的松散边界向外扩展半个单元，因此对象包围盒总在其单元的松散边界内
+- 更新只在对象跨单元/跨层时才改动结构，否则只写包围盒数组：O(1) 增量维护，无需重建
+- 包围盒以 SoA NumPy 数组保存，候选集的精确测试（AABB 相交、视锥、距离）全部向量化
+- ActorSpatialIndex：以 Actor 世界包围盒为键的适配层，变换变化时只标记 dirty，查询前批量刷新
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import math
+
+import numpy as np
+
+from .transform_math import aabbs_in_frustum, ray_aabbs, transform_aabbs, trs_matrices
+
+CellKey = Tuple[int, int, int, int]
+# _cell_arr 中表示“未链接”的占位值
+_NO_CELL = np.iinfo(np.int64).min
+
+
+class LooseOctree:
+    """无界松散八叉树：单元以字典哈希存储，只有被占用的单元才存在"""
+
+    def __init__(self, leaf_size: float = 1.0, capacity: int = 256):
+        self.leaf_size = float(leaf_size)
+        self._lo = np.zeros((capacity, 3), dtype=np.float64)
+        self._hi = np.zeros((capacity, 3), dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._items: List[Any] = [None] * capacity
+        self._cell_of: List[Optional[CellKey]] = [None] * capacity
+        # 与 _cell_of 相同的单元键（数组形式，供批量更新比较）
+        self._cell_arr = np.full((capacity, 4), _NO_CELL, dtype=np.int64)
+        self._free: List[int] = []
+        self._size = 0
+        self._slot: Dict[int, int] = {}
+        self._cells: Dict[CellKey, Set[int]] = {}
+        # level -> 该层被占用的单元
+        self._levels: Dict[int, Set[CellKey]] = {}
+        self._moves = 0
+
+    # ---- 基础 ----
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, item: Any) -> bool:
+        return id(item) in self._slot
+
+    def items(self) -> List[Any]:
+        return [self._items[slot] for slot in self._slot.values()]
+
+    def _grow(self) -> None:
+        capacity = self._lo.shape[0] * 2
+        for name in ('_lo', '_hi'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, 3), dtype=np.float64)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._alive.shape[0]] = self._alive
+        self._alive = alive
+        cells = np.full((capacity, 4), _NO_CELL, dtype=np.int64)
+        cells[:self._cell_arr.shape[0]] = self._cell_arr
+        self._cell_arr = cells
+        extra = capacity - len(self._items)
+        self._items.extend([None] * extra)
+        self._cell_of.extend([None] * extra)
+
+    def _cell_keys(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """(N, 3) 包围盒 -> (N, 4) 单元键 [level, ix, iy, iz]"""
+        extent = (hi - lo).max(axis=1)
+        with np.errstate(divide='ignore'):
+            level = np.where(extent <= self.leaf_size, 0.0,
+                             np.ceil(np.log2(np.maximum(extent, self.leaf_size) / self.leaf_size)))
+        size = self.leaf_size * np.exp2(level)
+        center = (lo + hi) * 0.5
+        keys = np.empty((lo.shape[0], 4), dtype=np.int64)
+        keys[:, 0] = level
+        keys[:, 1:] = np.floor(center / size[:, None])
+        return keys
+
+    def _cell_key(self, lo: np.ndarray, hi: np.ndarray) -> CellKey:
+        level, ix, iy, iz = self._cell_keys(lo.reshape(1, 3), hi.reshape(1, 3))[0].tolist()
+        return level, ix, iy, iz
+
+    def _link(self, slot: int, key: CellKey) -> None:
+        self._cells.setdefault(key, set()).add(slot)
+        self._levels.setdefault(key[0], set()).add(key)
+        self._cell_of[slot] = key
+        self._cell_arr[slot] = key
+
+    def _unlink(self, slot: int) -> None:
+        key = self._cell_of[slot]
+        if key is None:
+            return
+        members = self._cells.get(key)
+        if members is not None:
+            members.discard(slot)
+            if not members:
+                del self._cells[key]
+                level = self._levels[key[0]]
+                level.discard(key)
+                if not level:
+                    del self._levels[key[0]]
+        self._cell_of[slot] = None
+        self._cell_arr[slot] = _NO_CELL
+
+    # ---- 维护 ----
+    def insert(self, item: Any, lo: Sequence[float], hi: Sequence[float]) -> None:
+        if id(item) in self._slot:
+            self.update(item, lo, hi)
+            return
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size == self._lo.shape[0]:
+                self._grow()
+            slot = self._size
+            self._size += 1
+        self._slot[id(item)] = slot
+        self._items[slot] = item
+        self._alive[slot] = True
+        self._lo[slot] = lo
+        self._hi[slot] = hi
+        self._link(slot, self._cell_key(self._lo[slot], self._hi[slot]))
+
+    def update(self, item: Any, lo: Sequence[float], hi: Sequence[float]) -> bool:
+        """更新包围盒；跨单元时返回 True"""
+        slot = self._slot.get(id(item))
+        if slot is None:
+            self.insert(item, lo, hi)
+            return True
+        self._lo[slot] = lo
+        self._hi[slot] = hi
+        key = self._cell_key(self._lo[slot], self._hi[slot])
+        if key == self._cell_of[slot]:
+            return False
+        self._unlink(slot)
+        self._link(slot, key)
+        self._moves += 1
+        return True
+
+    def update_many(self, items: Sequence[Any], lo: np.ndarray, hi: np.ndarray) -> int:
+        """批量更新 (N, 3) 包围盒（未插入的对象会被插入），返回跨单元的数量"""
+        slots = np.fromiter((self._slot.get(id(item), -1) for item in items), dtype=np.intp, count=len(items))
+        missing = np.flatnonzero(slots < 0)
+        for i in missing:
+            self.insert(items[i], lo[i], hi[i])
+        present = np.flatnonzero(slots >= 0)
+        slots = slots[present]
+        self._lo[slots] = lo[present]
+        self._hi[slots] = hi[present]
+        keys = self._cell_keys(self._lo[slots], self._hi[slots])
+        changed = np.flatnonzero((keys != self._cell_arr[slots]).any(axis=1))
+        for i in changed.tolist():
+            slot = int(slots[i])
+            self._unlink(slot)
+            level, ix, iy, iz = keys[i].tolist()
+            self._link(slot, (level, ix, iy, iz))
+        self._moves += int(changed.size)
+        return int(changed.size) + int(missing.size)
+
+    def remove(self, item: Any) -> bool:
+        slot = self._slot.pop(id(item), None)
+        if slot is None:
+            return False
+        self._unlink(slot)
+        self._items[slot] = None
+        self._alive[slot] = False
+        self._free.append(slot)
+        return True
+
+    def clear(self) -> None:
+        for item in self.items():
+            self.remove(item)
+
+    def bounds_of(self, item: Any) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        slot = self._slot.get(id(item))
+        if slot is None:
+            return None
+        return self._lo[slot].copy(), self._hi[slot].copy()
+
+    def world_bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """全部对象的总包围盒"""
+        if not self._slot:
+            return None
+        alive = self._alive[:self._size]
+        return self._lo[:self._size][alive].min(axis=0), self._hi[:self._size][alive].max(axis=0)
+
+    # ---- 查询 ----
+    def _candidate_slots(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """与查询盒的松散单元相交的对象槽位（超集）"""
+        slots: List[int] = []
+        for level, keys in self._levels.items():
+            size = self.leaf_size * (2.0 ** level)
+            # 单元 i 的松散范围为 [(i - 0.5)·size, (i + 1.5)·size]
+            i_min = np.ceil(lo / size - 1.5).astype(np.int64)
+            i_max = np.floor(hi / size + 0.5).astype(np.int64)
+            span = np.maximum(i_max - i_min + 1, 0)
+            if int(np.prod(span)) <= len(keys):
+                for ix in range(i_min[0], i_max[0] + 1):
+                    for iy in range(i_min[1], i_max[1] + 1):
+                        for iz in range(i_min[2], i_max[2] + 1):
+                            members = self._cells.get((level, ix, iy, iz))
+                            if members:
+                                slots.extend(members)
+            else:
+                x0, y0, z0 = i_min.tolist()
+                x1, y1, z1 = i_max.tolist()
+                for key in keys:
+                    _, ix, iy, iz = key
+                    if x0 <= ix <= x1 and y0 <= iy <= y1 and z0 <= iz <= z1:
+                        slots.extend(self._cells[key])
+        return np.fromiter(slots, dtype=np.intp, count=len(slots))
+
+    def query_aabb_slots(self, lo: Sequence[float], hi: Sequence[float]) -> np.ndarray:
+        lo = np.asarray(lo, dtype=np.float64)
+        hi = np.asarray(hi, dtype=np.float64)
+        slots = self._candidate_slots(lo, hi)
+        if slots.size == 0:
+            return slots
+        hit = ((self._lo[slots] <= hi) & (self._hi[slots] >= lo)).all(axis=1)
+        return slots[hit]
+
+    def query_aabb(self, lo: Sequence[float], hi: Sequence[float]) -> List[Any]:
+        """包围盒与 [lo, hi] 相交的对象"""
+        return [self._items[slot] for slot in self.query_aabb_slots(lo, hi)]
+
+    def nearest(self, point: Sequence[float], k: int = 1, exclude: Iterable[Any] = ()) -> List[Tuple[Any, float]]:
+        """
+        按包围盒中心到 point 的距离返回最近的 k 个对象 [(item, distance)]。
+        以逐步倍增的立方体做范围查询，直到半径内的对象数足够。
+        """
+        if k <= 0 or not self._slot:
+            return []
+        point = np.asarray(point, dtype=np.float64)
+        excluded = {self._slot[id(item)] for item in exclude if id(item) in self._slot}
+        wanted = min(k, len(self._slot) - len(excluded))
+        if wanted <= 0:
+            return []
+        world_lo, world_hi = self.world_bounds()
+        reach = float(np.maximum(np.abs(world_lo - point), np.abs(world_hi - point)).max()) * math.sqrt(3.0)
+        radius = self.leaf_size
+        while True:
+            slots = self.query_aabb_slots(point - radius, point + radius)
+            if excluded:
+                slots = slots[~np.isin(slots, list(excluded))]
+            centers = (self._lo[slots] + self._hi[slots]) * 0.5
+            dist = np.linalg.norm(centers - point, axis=1)
+            inside = dist <= radius
+            if int(inside.sum()) >= wanted or radius >= reach:
+                candidates = np.flatnonzero(inside)
+                order = candidates[np.argsort(dist[candidates], kind='stable')[:wanted]]
+                return [(self._items[slots[i]], float(dist[i])) for i in order]
+            radius *= 2.0
+
+    def frustum_mask(self, planes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """全部存活槽位及其与视锥 (6, 4) 相交的掩码（不构造对象列表，供逐帧可见性统计）"""
+        slots = np.flatnonzero(self._alive[:self._size])
+        return slots, aabbs_in_frustum(self._lo[slots], self._hi[slots], planes)
+
+    def items_at(self, slots: Iterable[int]) -> List[Any]:
+        return [self._items[slot] for slot in slots]
+
+    def query_frustum(self, planes: np.ndarray) -> List[Any]:
+        """与视锥 (6, 4) 相交的对象（保守测试）"""
+        if not self._slot:
+            return []
+        slots, hit = self.frustum_mask(planes)
+        return self.items_at(slots[hit])
+
+    def query_ray(self, origin: Sequence[float], direction: Sequence[float],
+                  t_max: float = math.inf) -> List[Tuple[Any, float]]:
+        """包围盒被射线穿过的对象，按进入距离升序 [(item, t_enter)]"""
+        if not self._slot:
+            return []
+        slots = np.flatnonzero(self._alive[:self._size])
+        hit, t_near = ray_aabbs(np.asarray(origin, dtype=np.float64), np.asarray(direction, dtype=np.float64),
+                                self._lo[slots], self._hi[slots], t_max)
+        slots, t_near = slots[hit], t_near[hit]
+        order = np.argsort(t_near, kind='stable')
+        return [(self._items[slots[i]], float(t_near[i])) for i in order]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "objects": len(self._slot),
+            "cells": len(self._cells),
+            "levels": sorted(self._levels),
+            "cell_moves": self._moves,
+        }
+
+
+class ActorSpatialIndex:
+    """
+    以 Actor 世界包围盒为键的空间索引。
+
+    Actor 变换变化时通过监听回调 mark_dirty，下一次查询或 refresh() 时批量（向量化）
+    重新计算 dirty Actor 的世界包围盒并增量更新八叉树。没有几何体的 Actor 不参与索引。
+    """
+
+    def __init__(self, leaf_size: float = 1.0, before_refresh: Optional[Callable[[], Any]] = None):
+        self.tree = LooseOctree(leaf_size)
+        # 刷新前的同步钩子（如场景层级先写回世界变换）
+        self._before_refresh = before_refresh
+        self._actors: Dict[int, Any] = {}
+        self._dirty: Dict[int, Any] = {}
+        self._local_bounds: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._refreshed = 0
+        # 包围盒或成员变化时递增，供可见性等缓存判断是否需要重算
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def add(self, actor) -> None:
+        if getattr(actor, '_geometry', None) is None or id(actor) in self._actors:
+            return
+        self._actors[id(actor)] = actor
+        self._dirty[id(actor)] = actor
+        actor.add_transform_listener(self.mark_dirty)
+
+    def remove(self, actor) -> None:
+        if self._actors.pop(id(actor), None) is None:
+            return
+        self._dirty.pop(id(actor), None)
+        self._local_bounds.pop(id(actor), None)
+        actor.remove_transform_listener(self.mark_dirty)
+        self.tree.remove(actor)
+        self.version += 1
+
+    def clear(self) -> None:
+        for actor in list(self._actors.values()):
+            self.remove(actor)
+
+    def mark_dirty(self, actor) -> None:
+        if id(actor) in self._actors:
+            self._dirty[id(actor)] = actor
+
+    def _local(self, actor) -> Tuple[np.ndarray, np.ndarray]:
+        bounds = self._local_bounds.get(id(actor))
+        if bounds is None:
+            lo, hi = actor._geometry.get_bounds()
+            bounds = (np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64))
+            self._local_bounds[id(actor)] = bounds
+        return bounds
+
+    def refresh(self) -> int:
+        """批量刷新 dirty Actor 的世界包围盒，返回刷新数量"""
+        if self._before_refresh is not None:
+            self._before_refresh()
+        if not self._dirty:
+            return 0
+        actors = list(self._dirty.values())
+        self._dirty.clear()
+        local = [self._local(actor) for actor in actors]
+        lo = np.array([b[0] for b in local])
+        hi = np.array([b[1] for b in local])
+        matrices = trs_matrices(
+            [actor.get_world_position() for actor in actors],
+            [actor.get_world_rotation() for actor in actors],
+            [actor.get_world_scale() for actor in actors],
+        )
+        world_lo, world_hi = transform_aabbs(lo, hi, matrices)
+        self.tree.update_many(actors, world_lo, world_hi)
+        self._refreshed += len(actors)
+        self.version += 1
+        return len(actors)
+
+    def world_bounds(self, actor) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        self.refresh()
+        return self.tree.bounds_of(actor)
+
+    def center(self, actor) -> Optional[np.ndarray]:
+        bounds = self.world_bounds(actor)
+        return None if bounds is None else (bounds[0] + bounds[1]) * 0.5
+
+    def query_aabb(self, lo: Sequence[float], hi: Sequence[float]) -> List[Any]:
+        self.refresh()
+        return self.tree.query_aabb(lo, hi)
+
+    def query_radius(self, point: Sequence[float], radius: float) -> List[Tuple[Any, float]]:
+        """中心在半径内的 Actor，按距离排序"""
+        self.refresh()
+        point = np.asarray(point, dtype=np.float64)
+        slots = self.tree.query_aabb_slots(point - radius, point + radius)
+        centers = (self.tree._lo[slots] + self.tree._hi[slots]) * 0.5
+        dist = np.linalg.norm(centers - point, axis=1)
+        order = np.argsort(dist, kind='stable')
+        return [(self.tree._items[slots[i]], float(dist[i])) for i in order if dist[i] <= radius]
+
+    def nearest(self, point: Sequence[float], k: int = 1, exclude: Iterable[Any] = ()) -> List[Tuple[Any, float]]:
+        self.refresh()
+        return self.tree.nearest(point, k, exclude)
+
+    def query_frustum(self, planes: np.ndarray) -> List[Any]:
+        self.refresh()
+        return self.tree.query_frustum(planes)
+
+    def frustum_mask(self, planes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        self.refresh()
+        return self.tree.frustum_mask(planes)
+
+    def query_ray(self, origin: Sequence[float], direction: Sequence[float],
+                  t_max: float = math.inf) -> List[Tuple[Any, float]]:
+        self.refresh()
+        return self.tree.query_ray(origin, direction, t_max)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.tree.stats()
+        stats.update({"dirty": len(self._dirty), "refreshed": self._refreshed})
+        return stats
+
+
+__all__ = ["LooseOctree", "ActorSpatialIndex"]
@@ -0,0 +1,206 @@
+"""
+变换相关的向量化数学工具（与引擎约定一致）
+
+- 旋转为欧拉角（弧度）[pitch, yaw, roll]，按 ZYX 顺序组合：R = Rz(roll) · Ry(yaw) · Rx(pitch)
+- 局部到世界：M = T · R · S
+- 所有函数均支持批量输入（N, 3）并返回 (N, ...) 数组
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def euler_to_matrices(euler: np.ndarray) -> np.ndarray:
+    """(N, 3) 欧拉角 -> (N, 3, 3) 旋转矩阵"""
+    euler = np.asarray(euler, dtype=np.float64).reshape(-1, 3)
+    cx, cy, cz = np.cos(euler).T
+    sx, sy, sz = np.sin(euler).T
+    m = np.empty((euler.shape[0], 3, 3), dtype=np.float64)
+    m[:, 0, 0] = cz * cy
+    m[:, 0, 1] = cz * sy * sx - sz * cx
+    m[:, 0, 2] = cz * sy * cx + sz * sx
+    m[:, 1, 0] = sz * cy
+    m[:, 1, 1] = sz * sy * sx + cz * cx
+    m[:, 1, 2] = sz * sy * cx - cz * sx
+    m[:, 2, 0] = -sy
+    m[:, 2, 1] = cy * sx
+    m[:, 2, 2] = cy * cx
+    return m
+
+
+def trs_matrices(positions: np.ndarray, euler: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """(N, 3) 位置/欧拉角/缩放 -> (N, 4, 4) 局部到父空间矩阵 T · R · S"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+    m = np.zeros((positions.shape[0], 4, 4), dtype=np.float64)
+    m[:, :3, :3] = euler_to_matrices(euler) * scales[:, None, :]
+    m[:, :3, 3] = positions
+    m[:, 3, 3] = 1.0
+    return m
+
+
+def euler_to_quats(euler: np.ndarray) -> np.ndarray:
+    """(N, 3) 欧拉角 -> (N, 4) 单位四元数 [x, y, z, w]（与 euler_to_matrices 同一旋转）"""
+    half = np.asarray(euler, dtype=np.float64).reshape(-1, 3) * 0.5
+    cx, cy, cz = np.cos(half).T
+    sx, sy, sz = np.sin(half).T
+    return np.stack([
+        sx * cy * cz - cx * sy * sz,
+        cx * sy * cz + sx * cy * sz,
+        cx * cy * sz - sx * sy * cz,
+        cx * cy * cz + sx * sy * sz,
+    ], axis=1)
+
+
+def quats_to_matrices(quats: np.ndarray) -> np.ndarray:
+    """(N, 4) 四元数 [x, y, z, w] -> (N, 3, 3) 旋转矩阵（输入会先归一化）"""
+    q = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    x, y, z, w = q.T
+    m = np.empty((q.shape[0], 3, 3), dtype=np.float64)
+    m[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    m[:, 0, 1] = 2.0 * (x * y - z * w)
+    m[:, 0, 2] = 2.0 * (x * z + y * w)
+    m[:, 1, 0] = 2.0 * (x * y + z * w)
+    m[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    m[:, 1, 2] = 2.0 * (y * z - x * w)
+    m[:, 2, 0] = 2.0 * (x * z - y * w)
+    m[:, 2, 1] = 2.0 * (y * z + x * w)
+    m[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return m
+
+
+def quat_trs_matrices(positions: np.ndarray, quats: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """(N, 3) 位置 / (N, 4) 四元数 / (N, 3) 缩放 -> (N, 4, 4) 矩阵 T · R · S"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+    m = np.zeros((positions.shape[0], 4, 4), dtype=np.float64)
+    m[:, :3, :3] = quats_to_matrices(quats) * scales[:, None, :]
+    m[:, :3, 3] = positions
+    m[:, 3, 3] = 1.0
+    return m
+
+
+def matrices_to_trs(matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (N, 4, 4) 仿射矩阵 -> (位置, 欧拉角, 缩放) 各 (N, 3)，为 trs_matrices 的逆运算。
+    缩放取线性部分的列长度（镜像时 x 轴取负）；含切变的矩阵（非均匀缩放的父节点下旋转的子节点）
+    无法精确表示为 TRS，此时得到最接近的旋转与缩放。
+    """
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    linear = matrices[:, :3, :3]
+    scales = np.linalg.norm(linear, axis=1)
+    scales[np.linalg.det(linear) < 0, 0] *= -1.0
+    rot = linear / np.where(scales == 0.0, 1.0, scales)[:, None, :]
+    sin_yaw = np.clip(-rot[:, 2, 0], -1.0, 1.0)
+    # 万向节锁（yaw = ±90°）时 roll 与 pitch 不可区分，约定 roll = 0
+    locked = np.abs(sin_yaw) > 1.0 - 1e-9
+    euler = np.empty((matrices.shape[0], 3), dtype=np.float64)
+    euler[:, 0] = np.where(locked, np.arctan2(-rot[:, 1, 2], rot[:, 1, 1]), np.arctan2(rot[:, 2, 1], rot[:, 2, 2]))
+    euler[:, 1] = np.arcsin(sin_yaw)
+    euler[:, 2] = np.where(locked, 0.0, np.arctan2(rot[:, 1, 0], rot[:, 0, 0]))
+    return matrices[:, :3, 3].copy(), euler, scales
+
+
+def transform_aabbs(lo: np.ndarray, hi: np.ndarray, matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """把 (N, 3) 局部包围盒经 (N, 4, 4) 仿射矩阵变换为世界空间轴对齐包围盒（Arvo 方法）"""
+    lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+    hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+    center = (lo + hi) * 0.5
+    extent = (hi - lo) * 0.5
+    linear = matrices[:, :3, :3]
+    world_center = np.einsum('nij,nj->ni', linear, center) + matrices[:, :3, 3]
+    world_extent = np.einsum('nij,nj->ni', np.abs(linear), extent)
+    return world_center - world_extent, world_center + world_extent
+
+
+def camera_basis(forward: Sequence[float], up: Sequence[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """由前向与上向量得到正交基 (right, up, forward)，均已归一化"""
+    f = np.asarray(forward, dtype=np.float64)
+    f = f / (np.linalg.norm(f) or 1.0)
+    r = np.cross(f, np.asarray(up, dtype=np.float64))
+    norm = np.linalg.norm(r)
+    if norm < 1e-9:
+        # 前向与上向量平行时任取一个垂直方向
+        r = np.cross(f, [1.0, 0.0, 0.0] if abs(f[0]) < 0.9 else [0.0, 0.0, 1.0])
+        norm = np.linalg.norm(r)
+    r = r / norm
+    u = np.cross(r, f)
+    return r, u, f
+
+
+def frustum_planes(position: Sequence[float], forward: Sequence[float], up: Sequence[float], fov: float,
+                   aspect: float, near: float = 0.1, far: float = 1000.0) -> np.ndarray:
+    """
+    透视相机视锥的 6 个平面 (6, 4)：[nx, ny, nz, d]，法线朝内，点 p 在内侧当 n·p + d >= 0。
+    fov 为垂直视场角（度）。
+    """
+    eye = np.asarray(position, dtype=np.float64)
+    r, u, f = camera_basis(forward, up)
+    half_v = np.tan(np.radians(fov) * 0.5)
+    half_h = half_v * aspect
+    normals = np.array([
+        f,                                   # near
+        -f,                                  # far
+        np.cross(u, f + r * half_h),         # right
+        np.cross(f - r * half_h, u),         # left
+        np.cross(f + u * half_v, r),         # top
+        np.cross(r, f - u * half_v),         # bottom
+    ])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    points = np.array([eye + f * near, eye + f * far, eye, eye, eye, eye])
+    d = -np.einsum('ij,ij->i', normals, points)
+    return np.hstack([normals, d[:, None]])
+
+
+def pixel_ray(position: Sequence[float], forward: Sequence[float], up: Sequence[float], fov: float,
+              x: float, y: float, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    把视口像素 (x, y)（左上角为原点，取像素中心）反投影为世界空间射线 (origin, direction)，
+    direction 已归一化。fov 为垂直视场角（度）。
+    """
+    r, u, f = camera_basis(forward, up)
+    half_v = np.tan(np.radians(fov) * 0.5)
+    half_h = half_v * (width / float(height))
+    ndc_x = 2.0 * (x + 0.5) / width - 1.0
+    ndc_y = 1.0 - 2.0 * (y + 0.5) / height
+    direction = f + r * (ndc_x * half_h) + u * (ndc_y * half_v)
+    return np.asarray(position, dtype=np.float64), direction / np.linalg.norm(direction)
+
+
+def aabbs_in_frustum(lo: np.ndarray, hi: np.ndarray, planes: np.ndarray) -> np.ndarray:
+    """(N, 3) 包围盒与视锥的保守相交测试（p-vertex），返回布尔掩码"""
+    normals = planes[:, :3]
+    # 法线方向上最远角点的有符号距离 = n·center + |n|·extent + d，两次 (N, 3) @ (3, 6) 完成
+    center = (lo + hi) * 0.5
+    extent = (hi - lo) * 0.5
+    dist = center @ normals.T + extent @ np.abs(normals).T + planes[:, 3]
+    return (dist >= 0).all(axis=1)
+
+
+def ray_aabbs(origin: np.ndarray, direction: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+              t_max: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+    """射线与 (N, 3) 包围盒的 slab 测试，返回 (命中掩码, 进入距离)；起点在盒内时进入距离为 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / np.where(direction == 0.0, 1e-30, direction)
+        t1 = (lo - origin) * inv
+        t2 = (hi - origin) * inv
+    t_near = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+    t_far = np.minimum(np.maximum(t1, t2).min(axis=1), t_max)
+    return t_near <= t_far, t_near
+
+
+__all__ = [
+    "euler_to_matrices",
+    "trs_matrices",
+    "euler_to_quats",
+    "quats_to_matrices",
+    "quat_trs_matrices",
+    "matrices_to_trs",
+    "transform_aabbs",
+    "camera_basis",
+    "frustum_planes",
+    "pixel_ray",
+    "aabbs_in_frustum",
+    "ray_aabbs",
+]
@@ -1,6 +1,11 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import time
+import weakref
+
+import numpy as np
 
 from .engine_import import load_corona_engine
+from .transform_math import frustum_planes, pixel_ray
 
 CoronaEngine = load_corona_engine()
 
@@ -15,6 +20,11 @@ class Viewport:
         scene.add_viewport(viewport)
     """
 
+    __slots__ = (
+        'engine_obj', 'name', 'width', 'height', 'x', 'y', '_camera', '_scene_ref', 'near', 'far', 'hide_culled',
+        '_cull_key', '_cull_slots', '_cull_mask', '_cull_stats',
+    )
+
     def __init__(self, width: int = 1920, height: int = 1080, light_field: bool = False, name: str = "Viewport"):
         """
         创建 Viewport 对象
@@ -36,12 +46,36 @@ class Viewport:
         self.name = name
         self.width = width
         self.height = height
+        # 视口矩形偏移（set_viewport_rect），拾取时把窗口像素换算为视口像素
+        self.x = 0
+        self.y = 0
+        # 相机包装器（或原始引擎对象）与所属场景（弱引用），供 CPU 拾取使用
+        self._camera: Optional[Any] = None
+        self._scene_ref = None
+        # 视锥剔除：近/远裁剪面；hide_culled 为 True 时由 Scene 在引擎侧隐藏视锥外的 Actor
+        self.near = 0.1
+        self.far = 1000.0
+        self.hide_culled = False
+        # 最近一次可见集（空间索引槽位 + 可见掩码），相机/尺寸/索引未变化时直接复用
+        self._cull_key = None
+        self._cull_slots = np.empty(0, dtype=np.intp)
+        self._cull_mask = np.empty(0, dtype=bool)
+        self._cull_stats: Dict[str, Any] = {"visible": 0, "culled": 0, "total": 0, "ms": 0.0, "reused": False}
+
+    def attach_scene(self, scene: Optional[Any]):
+        """由 Scene.add_viewport / remove_viewport 调用"""
+        self._scene_ref = weakref.ref(scene) if scene is not None else None
+
+    @property
+    def scene(self) -> Optional[Any]:
+        return self._scene_ref() if self._scene_ref is not None else None
 
     def set_camera(self, camera: Any):
         """设置相机（接受 Camera 包装器或原始引擎对象）"""
         try:
             cam_obj = camera.engine_obj if hasattr(camera, 'engine_obj') else camera
             self.engine_obj.set_camera(cam_obj)
+            self._camera = camera
         except Exception as e:
             raise RuntimeError(f"Viewport.set_camera 失败: {e}") from e
 
@@ -63,6 +97,7 @@ class Viewport:
         """移除相机"""
         try:
             self.engine_obj.remove_camera()
+            self._camera = None
         except Exception as e:
             raise RuntimeError(f"Viewport.remove_camera 失败: {e}") from e
 
@@ -108,16 +143,92 @@ class Viewport:
         """设置视口矩形区域"""
         try:
             self.engine_obj.set_viewport_rect(x, y, width, height)
+            self.x, self.y = x, y
+            self.width, self.height = width, height
         except Exception as e:
             raise RuntimeError(f"Viewport.set_viewport_rect 失败: {e}") from e
 
-    def pick_actor_at_pixel(self, x: int, y: int):
-        """在像素坐标处拾取 Actor"""
+    def pixel_ray(self, x: float, y: float):
+        """窗口像素坐标 -> 世界空间射线 (origin, direction)，经由视口相机反投影"""
+        camera = self._camera
+        if camera is None:
+            raise RuntimeError("Viewport 未设置相机")
+        return pixel_ray(camera.get_position(), camera.get_forward(), camera.get_world_up(), camera.get_fov(),
+                         x - self.x, y - self.y, self.width, self.height)
+
+    def pick_actor_at_pixel(self, x: int, y: int, max_distance: float = float('inf')):
+        """
+        在像素坐标处拾取 Actor（CPU 三角形精确拾取）。
+
+        Returns:
+            PickResult(actor, triangle, distance, position)；未命中时返回 None
+        """
+        scene = self.scene
+        if scene is None:
+            raise RuntimeError("Viewport.pick_actor_at_pixel 失败: 视口未加入场景")
         try:
-            self.engine_obj.pick_actor_at_pixel(x, y)
+            origin, direction = self.pixel_ray(x, y)
+            return scene.pick_ray(origin, direction, max_distance)
         except Exception as e:
             raise RuntimeError(f"Viewport.pick_actor_at_pixel 失败: {e}") from e
 
+    def frustum_planes(self) -> np.ndarray:
+        """视口相机的视锥平面 (6, 4)，纵横比取视口尺寸"""
+        camera = self._camera
+        if camera is None:
+            raise RuntimeError("Viewport 未设置相机")
+        return frustum_planes(camera.get_position(), camera.get_forward(), camera.get_world_up(), camera.get_fov(),
+                              self.width / float(self.height or 1), self.near, self.far)
+
+    def update_visibility(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算本帧可见集：对场景空间索引中全部 Actor 的世界包围盒做一次向量化视锥测试。
+        相机姿态、视口尺寸、裁剪面与空间索引均未变化时复用上一帧结果。
+
+        Returns:
+            (槽位, 可见掩码)，槽位为场景空间索引中的存活槽位
+        """
+        scene = self.scene
+        if scene is None:
+            raise RuntimeError("Viewport.update_visibility 失败: 视口未加入场景")
+        start_time = time.perf_counter()
+        try:
+            index = scene.spatial_index
+            index.refresh()
+            camera = self._camera
+            key = (index.version, tuple(camera.get_position()), tuple(camera.get_forward()),
+                   tuple(camera.get_world_up()), camera.get_fov(), self.width, self.height, self.near, self.far)
+            reused = key == self._cull_key
+            if not reused:
+                self._cull_slots, self._cull_mask = index.tree.frustum_mask(self.frustum_planes())
+                self._cull_key = key
+        except Exception as e:
+            raise RuntimeError(f"Viewport.update_visibility 失败: {e}") from e
+        visible = int(np.count_nonzero(self._cull_mask))
+        total = int(self._cull_slots.shape[0])
+        self._cull_stats = {
+            "visible": visible,
+            "culled": total - visible,
+            "total": total,
+            "ms": round((time.perf_counter() - start_time) * 1000, 3),
+            "reused": reused,
+        }
+        return self._cull_slots, self._cull_mask
+
+    def visible_actors(self) -> List[Any]:
+        """最近一次 update_visibility 得到的可见 Actor"""
+        scene = self.scene
+        if scene is None:
+            return []
+        return scene.spatial_index.tree.items_at(self._cull_slots[self._cull_mask])
+
+    def culling_stats(self) -> Dict[str, Any]:
+        """最近一次可见集统计 {viewport, visible, culled, total, ms, reused, hide_culled}"""
+        stats = {"viewport": self.name}
+        stats.update(self._cull_stats)
+        stats["hide_culled"] = self.hide_culled
+        return stats
+
     def save_screenshot(self, path: str):
         """保存截图到文件"""
         try:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import json
-from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
 
 from Backend.utils.scene_service import SceneApplicationService
 from Backend.utils.bootstrap import bootstrap
@@ -8,6 +8,9 @@ from Backend.utils.container import get_container
 
 bootstrap()
 
+# 帧间隔（毫秒）：滑块等高频输入在此间隔内合并为一次引擎写入
+FRAME_INTERVAL_MS = 16
+
 
 class SceneService(QObject):
     scene_error = Signal(str)
@@ -19,6 +22,30 @@ class SceneService(QObject):
         container = get_container()
         self.scene_service: SceneApplicationService = container.resolve("scene_service")
 
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self._frame_timer.timeout.connect(self._on_frame)
+        # 物理/动画/接触回调开始时由服务层请求帧，保证没有 UI 输入时模拟也能继续推进
+        self.scene_service.set_frame_requester(self._schedule_frame)
+
+    def _schedule_frame(self) -> None:
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def _on_frame(self) -> None:
+        """帧定时器回调：执行合并后的命令并推送结果，队列清空且没有进行中的模拟时停表"""
+        try:
+            frame = self.scene_service.flush_frame()
+            for payload in frame["results"]:
+                self.scene_loaded.emit(json.dumps({"type": "actor_operation", "data": payload}))
+            for error in frame["errors"]:
+                self.scene_error.emit(json.dumps({"type": "error", "message": error["message"]}))
+        except Exception as exc:
+            self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
+        if not self.scene_service.has_pending_updates() and not self.scene_service.has_active_simulation():
+            self._frame_timer.stop()
+            self.scene_service.reset_frame_clock()
+
     @Slot(str, str)
     def create_actor(self, scene_name: str, obj_path: str) -> None:
         try:
@@ -48,7 +75,7 @@ class SceneService(QObject):
     def actor_operation(self, data: str) -> None:
         try:
             actor_data = json.loads(data)
-            payload = self.scene_service.apply_transform(
+            self.scene_service.queue_transform(
                 actor_data.get("sceneName", "MainScene"),
                 actor_data.get("actorName"),
                 actor_data.get("Operation"),
@@ -58,7 +85,28 @@ class SceneService(QObject):
                     float(actor_data.get("z", 0.0)),
                 ],
             )
-            self.scene_loaded.emit(json.dumps({"type": "actor_operation", "data": payload}))
+            self._schedule_frame()
+        except Exception as exc:
+            self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
+
+    @Slot(str)
+    def actor_operations_batch(self, data: str) -> None:
+        try:
+            batch_data = json.loads(data)
+            operations = [
+                (
+                    op.get("actorName"),
+                    op.get("Operation"),
+                    [
+                        float(op.get("x", 0.0)),
+                        float(op.get("y", 0.0)),
+                        float(op.get("z", 0.0)),
+                    ],
+                )
+                for op in batch_data.get("operations", [])
+            ]
+            payload = self.scene_service.apply_transforms(batch_data.get("sceneName", "MainScene"), operations)
+            self.scene_loaded.emit(json.dumps({"type": "actor_operations_batch", "data": payload}))
         except Exception as exc:
             self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
 
@@ -66,13 +114,15 @@ class SceneService(QObject):
     def camera_move(self, data: str) -> None:
         try:
             move_data = json.loads(data)
-            self.scene_service.set_camera(
+            self.scene_service.queue_camera(
                 move_data.get("sceneName", "MainScene"),
                 position=move_data.get("position", [0.0, 5.0, 10.0]),
                 forward=move_data.get("forward", [0.0, 1.5, 0.0]),
                 up=move_data.get("up", [0.0, -1.0, 0.0]),
                 fov=float(move_data.get("fov", 45.0)),
+                camera_name=move_data.get("cameraName"),
             )
+            self._schedule_frame()
         except Exception as exc:
             self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
 
@@ -80,7 +130,7 @@ class SceneService(QObject):
     def sun_direction(self, data: str) -> None:
         try:
             sun_data = json.loads(data)
-            self.scene_service.set_sun(
+            self.scene_service.queue_sun(
                 sun_data.get("sceneName", "MainScene"),
                 [
                     float(sun_data.get("px", 1.0)),
@@ -88,5 +138,44 @@ class SceneService(QObject):
                     float(sun_data.get("pz", 1.0)),
                 ],
             )
+            self._schedule_frame()
+        except Exception as exc:
+            self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
+
+    @Slot()
+    def frame_stats(self) -> None:
+        try:
+            self.scene_loaded.emit(json.dumps({"type": "frame_stats", "data": self.scene_service.frame_stats()}))
+        except Exception as exc:
+            self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
+
+    @Slot(str)
+    def resource_stats(self, data: str) -> None:
+        try:
+            scene_name = json.loads(data).get("sceneName", "MainScene") if data else "MainScene"
+            payload = self.scene_service.resource_stats(scene_name)
+            self.scene_loaded.emit(json.dumps({"type": "resource_stats", "data": payload}))
+        except Exception as exc:
+            self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
+
+    @Slot(str)
+    def culling_stats(self, data: str) -> None:
+        try:
+            scene_name = json.loads(data).get("sceneName", "MainScene") if data else "MainScene"
+            payload = self.scene_service.culling_stats(scene_name)
+            self.scene_loaded.emit(json.dumps({"type": "culling_stats", "data": payload}))
+        except Exception as exc:
+            self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
+
+    @Slot(str)
+    def set_culling(self, data: str) -> None:
+        try:
+            culling_data = json.loads(data)
+            payload = self.scene_service.set_culling(
+                culling_data.get("sceneName", "MainScene"),
+                bool(culling_data.get("hideCulled", False)),
+                culling_data.get("viewportName"),
+            )
+            self.scene_loaded.emit(json.dumps({"type": "culling_stats", "data": payload}))
         except Exception as exc:
             self.scene_error.emit(json.dumps({"type": "error", "message": str(exc)}))
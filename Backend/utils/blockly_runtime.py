@@ -0,0 +1,127 @@
+"""
+Blockly 生成脚本的运行时。
+
+生成的脚本头部为：
+    from Backend.engine_core.engine_import import load_corona_engine
+    from Backend.utils.blockly_runtime import BlocklyRuntime
+    CoronaEngine = load_corona_engine()
+    Runtime = BlocklyRuntime("<场景名>", "<角色名>")
+动画/克隆/侦测积木调用 Runtime.xxx(...)，以脚本所属的角色为主体，通过场景服务访问场景；
+其余积木仍调用引擎模块 CoronaEngine.xxx(...)。
+“当作为克隆体启动时”生成 def clone_start_N(Runtime) 并经 Runtime.onCloneStart 注册，
+Runtime.clone() 创建克隆体后以克隆体的运行时调用这些函数。
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Sequence
+
+from Backend.utils.container import get_container
+from Backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BlocklyRuntime:
+    def __init__(self, scene_name: str, actor_name: str,
+                 clone_handlers: List[Callable[["BlocklyRuntime"], object]] | None = None) -> None:
+        self.scene_name = scene_name
+        self.actor_name = actor_name
+        # 克隆启动函数：与由本脚本派生的克隆体运行时共享同一列表（克隆体再克隆时同样执行）
+        self._clone_handlers = clone_handlers if clone_handlers is not None else []
+
+    @property
+    def scene_service(self):
+        return get_container().resolve("scene_service")
+
+    # ---- 外观：动画 ----
+    def playCartoon(self, speed: float = 1.0) -> None:
+        """播放当前角色的动画（由共享动画时钟逐帧推进）"""
+        self.scene_service.play_animation(self.scene_name, self.actor_name, float(speed))
+
+    def stopCartoon(self) -> None:
+        """停止当前角色的动画，保留播放位置"""
+        self.scene_service.stop_animation(self.scene_name, self.actor_name)
+
+    def resetCartoon(self) -> None:
+        """动画回到开头"""
+        self.scene_service.seek_animation(self.scene_name, self.actor_name, 0.0)
+
+    # ---- 克隆 ----
+    def cloneStart(self) -> bool:
+        """“当作为克隆体启动时”：返回脚本主体是否为克隆体"""
+        return self.scene_service.is_clone(self.scene_name, self.actor_name)
+
+    def onCloneStart(self, handler: Callable[["BlocklyRuntime"], object]) -> Callable[["BlocklyRuntime"], object]:
+        """注册“当作为克隆体启动时”的函数 handler(克隆体运行时)"""
+        if handler not in self._clone_handlers:
+            self._clone_handlers.append(handler)
+        return handler
+
+    def clone(self, target: str | None = None) -> "BlocklyRuntime":
+        """
+        克隆目标角色（缺省为自身），以克隆体为主体依次执行已注册的克隆启动函数（同步执行，
+        单个函数失败只记录日志），返回克隆体的运行时
+        """
+        source = (target or "").strip() or self.actor_name
+        payload = self.scene_service.clone_actor(self.scene_name, source)
+        runtime = BlocklyRuntime(self.scene_name, payload["actor"]["name"], self._clone_handlers)
+        for handler in list(self._clone_handlers):
+            try:
+                handler(runtime)
+            except Exception:
+                logger.exception("克隆体 %s 的启动脚本执行失败", runtime.actor_name)
+        return runtime
+
+    def deleteClone(self) -> None:
+        """删除此克隆体（主体不是克隆体时忽略）"""
+        if not self.scene_service.is_clone(self.scene_name, self.actor_name):
+            logger.debug("%s 不是克隆体，忽略 deleteClone", self.actor_name)
+            return
+        self.scene_service.delete_clone(self.scene_name, self.actor_name)
+
+    # ---- 侦测 ----
+    def distance(self, target: str | Sequence[float]) -> float:
+        """当前角色到目标角色（名称）或坐标的距离（世界包围盒中心距离，角色间距离读取本帧接触缓存）"""
+        if isinstance(target, str):
+            target = target.strip()
+            if target == self.actor_name:
+                return 0.0
+        else:
+            target = list(target)
+        return self.scene_service.actor_distance(self.scene_name, self.actor_name, target)
+
+    def touch(self, target: str) -> bool:
+        """当前角色是否碰到目标角色（世界包围盒相交，读取最近一帧的接触缓存）"""
+        target = (target or "").strip()
+        if not target or target == self.actor_name:
+            return False
+        return self.scene_service.actor_touching(self.scene_name, self.actor_name, target)
+
+    def touching(self) -> List[str]:
+        """当前与该角色接触的全部角色名称"""
+        return self.scene_service.actor_contacts(self.scene_name, self.actor_name)
+
+    def _on_contact(self, event: str, target: str | None, callback: Callable[[str], object]) -> None:
+        target = (target or "").strip() or None
+        self.scene_service.on_contact(self.scene_name, self.actor_name, event, callback, target)
+
+    def onTouch(self, target: str | None, callback: Callable[[str], object]) -> None:
+        """开始碰到目标（缺省为任意角色）时调用 callback(对方名称)，无需逐帧轮询"""
+        self._on_contact("enter", target, callback)
+
+    def onTouching(self, target: str | None, callback: Callable[[str], object]) -> None:
+        """与目标保持接触期间每帧调用 callback(对方名称)"""
+        self._on_contact("stay", target, callback)
+
+    def onTouchEnd(self, target: str | None, callback: Callable[[str], object]) -> None:
+        """与目标分开时调用 callback(对方名称)"""
+        self._on_contact("exit", target, callback)
+
+    def nearest(self, k: int = 1) -> List[str]:
+        """距离当前角色最近的 k 个角色名称"""
+        hits = self.scene_service.nearest_actors(self.scene_name, actor_name=self.actor_name, k=int(k))
+        return [hit["name"] for hit in hits]
+
+
+__all__ = ["BlocklyRuntime"]
@@ -3,6 +3,8 @@ from __future__ import annotations
 from .scene_service import SceneApplicationService
 from .project_service import ProjectApplicationService
 from Backend.engine_core.scene_manager import SceneManager
+from Backend.engine_core.mesh_cache import configure_mesh_cache
+from Backend.artificial_intelligence.config.config import get_app_config
 from Backend.utils.container import get_container
 from Backend.utils.logging import configure_logging
 
@@ -12,9 +14,15 @@ def bootstrap() -> None:
     if container.get_flag("bootstrapped"):
         return
     configure_logging()
+    configure_mesh_cache(get_app_config().paths.cache_dir / "meshes")
 
     container.register("scene_manager", SceneManager)
-    container.register("scene_service", lambda: SceneApplicationService(container.resolve("scene_manager")))
+    container.register(
+        "scene_service",
+        lambda: SceneApplicationService(
+            container.resolve("scene_manager"), enable_lods=get_app_config().runtime.enable_lods
+        ),
+    )
     container.register(
         "project_service",
         lambda: ProjectApplicationService(container.resolve("scene_service")),
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from Backend.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class FrameCommandQueue:
+    """
+    按帧合并的命令队列。
+
+    同一个键（通常是 (scene, actor, property)）在一帧内多次提交时只保留最新的一次，
+    flush() 时按首次提交的顺序依次执行。适用于滑块拖动这类只关心最终值的绝对写入。
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Hashable, Callable[[], Any]] = {}
+        self._totals: Dict[str, int] = {"submitted": 0, "coalesced": 0, "applied": 0, "failed": 0}
+        self._last_frame: Dict[str, int] = {"submitted": 0, "coalesced": 0, "applied": 0, "failed": 0}
+        self._frame_submitted = 0
+        self._frame_coalesced = 0
+
+    def submit(self, key: Hashable, command: Callable[[], Any]) -> bool:
+        """提交命令；若覆盖了同键的待执行命令则返回 True"""
+        coalesced = key in self._pending
+        self._pending[key] = command
+        self._frame_submitted += 1
+        if coalesced:
+            self._frame_coalesced += 1
+        return coalesced
+
+    def discard(self, key: Hashable) -> bool:
+        """丢弃同键的待执行命令（该值已被立即写入时调用，避免下一帧用旧值覆盖）；返回是否存在该命令"""
+        return self._pending.pop(key, None) is not None
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> Tuple[List[Tuple[Hashable, Any]], List[Tuple[Hashable, Exception]]]:
+        """执行本帧所有待处理命令，返回 (成功结果列表, 异常列表)"""
+        pending, self._pending = self._pending, {}
+        results: List[Tuple[Hashable, Any]] = []
+        errors: List[Tuple[Hashable, Exception]] = []
+        for key, command in pending.items():
+            try:
+                results.append((key, command()))
+            except Exception as exc:
+                logger.debug("Queued command %s failed: %s", key, exc)
+                errors.append((key, exc))
+
+        frame = {
+            "submitted": self._frame_submitted,
+            "coalesced": self._frame_coalesced,
+            "applied": len(results),
+            "failed": len(errors),
+        }
+        for name, value in frame.items():
+            self._totals[name] += value
+        self._last_frame = frame
+        self._frame_submitted = 0
+        self._frame_coalesced = 0
+        return results, errors
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._frame_submitted = 0
+        self._frame_coalesced = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"last_frame": dict(self._last_frame), "total": dict(self._totals), "pending": len(self._pending)}
+
+
+__all__ = ["FrameCommandQueue"]
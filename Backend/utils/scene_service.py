@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List
-
-import os
+import time
+from typing import Any, Callable, Dict, List, Tuple
 
 from Backend.engine_core.actor import Actor
+from Backend.engine_core.actor_registry import normalize_actor_name
+from Backend.engine_core.animation_clock import default_animation_clock
+from Backend.engine_core.engine_object_factory import EngineObjectFactory
 from Backend.engine_core.scene_manager import SceneManager
+from Backend.utils.command_queue import FrameCommandQueue
 from Backend.utils.logging import get_logger
 
 
 logger = get_logger(__name__)
 
+# 单帧推进的最大时长（秒）：帧定时器停止或界面卡顿后，避免第一帧把动画/物理一次推进整段空闲时间
+MAX_FRAME_DT = 0.1
+
 
 def _actor_payload(actor: Actor) -> Dict[str, str]:
     _, ext = os.path.splitext(actor.path)
@@ -28,14 +34,32 @@ def _scene_snapshot(scene) -> Dict[str, Any]:
         "name": scene.name,
         "sun_direction": getattr(scene, "sun_direction", [0.0, -1.0, 0.0]),
         "actors": [_actor_payload(actor) for actor in scene.get_actors()],
+        # 实例批次整体为一项，附带实例数
+        "batches": [batch.to_dict() for batch in getattr(scene, "get_batches", list)()],
         "cameras": [{"name": getattr(camera, "name", "")} for camera in scene.get_cameras()],
-        "lights": [{"name": getattr(light, "name", "")} for light in scene.get_lights()],
+        "lights": [{"name": getattr(light, "name", "")} for light in getattr(scene, "get_lights", list)()],
     }
 
 
 class SceneApplicationService:
-    def __init__(self, scene_manager: SceneManager | None = None) -> None:
+    def __init__(self, scene_manager: SceneManager | None = None, enable_lods: bool = False) -> None:
         self.scene_manager = scene_manager or SceneManager()
+        # 新建 Actor（含克隆体）是否挂载 LOD 链，由应用配置 runtime.enable_lods 决定
+        self.enable_lods = enable_lods
+        self.frame_queue = FrameCommandQueue()
+        self._last_frame_time: float | None = None
+        # 克隆体：id(actor) -> (场景名, 源角色名)；克隆体的 Actor 来自工厂对象池
+        self._clones: Dict[int, Tuple[str, str]] = {}
+        self._clone_serial = 0
+        # 帧请求回调（桥接层注册，用于启动帧定时器）；开始持续模拟的操作调用它
+        self._frame_requester: Callable[[], None] | None = None
+
+    def set_frame_requester(self, requester: Callable[[], None] | None) -> None:
+        self._frame_requester = requester
+
+    def _request_frame(self) -> None:
+        if self._frame_requester is not None:
+            self._frame_requester()
 
     def _get_scene(self, scene_name: str):
         scene = self.scene_manager.get_scene(scene_name)
@@ -48,9 +72,11 @@ class SceneApplicationService:
         logger.info("Created scene %s", scene_name)
         return _scene_snapshot(scene)
 
-    def add_actor(self, scene_name: str, asset_path: str) -> Dict:
+    def add_actor(self, scene_name: str, asset_path: str, lods: bool | None = None) -> Dict:
+        """lods 缺省时按 enable_lods 决定是否挂载 LOD 链"""
         scene = self._get_scene(scene_name)
-        actor = Actor(asset_path)
+        # 同一模型的多个 Actor 共享网格数据，仅拥有各自的变换
+        actor = EngineObjectFactory.create_actor(asset_path, lods=self.enable_lods if lods is None else lods)
         scene.add_actor(actor)
         payload = {"scene": scene_name, "actor": _actor_payload(actor)}
         logger.info("Actor %s added to %s", actor.name, scene_name)
@@ -61,15 +87,164 @@ class SceneApplicationService:
         actor = self._find_actor(scene, actor_name)
         if actor is None:
             raise ValueError(f"Actor '{actor_name}' not found")
+        if id(actor) in self._clones:
+            return self.delete_clone(scene_name, actor_name)
         scene.remove_actor(actor)
         logger.info("Actor %s removed from %s", actor_name, scene_name)
         return {"scene": scene_name, "actor": actor_name}
 
+    # 动画（共享动画时钟，SceneManager.tick 每帧统一推进）
+    def _kinematics(self, scene_name: str, actor_name: str):
+        scene = self._get_scene(scene_name)
+        actor = self._find_actor(scene, actor_name)
+        if actor is None:
+            raise ValueError(f"Actor '{actor_name}' not found")
+        return actor.kinematics
+
+    def play_animation(self, scene_name: str, actor_name: str, speed: float = 1.0) -> None:
+        self._kinematics(scene_name, actor_name).play_animation(speed)
+        self._request_frame()
+
+    def stop_animation(self, scene_name: str, actor_name: str) -> None:
+        self._kinematics(scene_name, actor_name).stop_animation()
+
+    def seek_animation(self, scene_name: str, actor_name: str, time: float) -> None:
+        self._kinematics(scene_name, actor_name).seek(time)
+
+    def set_animation_speed(self, scene_name: str, actor_name: str, speed: float) -> None:
+        self._kinematics(scene_name, actor_name).set_speed(speed)
+
+    def set_animation_clip(self, scene_name: str, actor_name: str, length: float, loop: bool = True) -> None:
+        """设置当前片段长度（秒）；引擎不提供片段长度时需要调用，循环播放才会回绕"""
+        self._kinematics(scene_name, actor_name).set_clip_length(length, loop)
+
+    # 刚体（场景 PhysicsWorld 以固定步长批量步进）
+    def add_rigid_body(self, scene_name: str, actor_name: str, shape: str = "sphere", mass: float = 1.0,
+                       restitution: float = 0.2) -> Dict:
+        scene = self._get_scene(scene_name)
+        actor = self._find_actor(scene, actor_name)
+        if actor is None:
+            raise ValueError(f"Actor '{actor_name}' not found")
+        scene.add_rigid_body(actor, shape, mass, restitution)
+        self._request_frame()
+        return {"scene": scene_name, "actor": actor_name, "shape": shape, "mass": mass}
+
+    def remove_rigid_body(self, scene_name: str, actor_name: str) -> bool:
+        scene = self._get_scene(scene_name)
+        actor = self._find_actor(scene, actor_name)
+        if actor is None:
+            raise ValueError(f"Actor '{actor_name}' not found")
+        return scene.remove_rigid_body(actor)
+
+    def apply_impulse(self, scene_name: str, actor_name: str, impulse: List[float]) -> None:
+        scene = self._get_scene(scene_name)
+        actor = self._find_actor(scene, actor_name)
+        if actor is None:
+            raise ValueError(f"Actor '{actor_name}' not found")
+        actor.mechanics.apply_impulse(impulse)
+
+    # 克隆（对象池复用 Actor 与引擎对象）
+    def clone_actor(self, scene_name: str, source_name: str) -> Dict:
+        """克隆角色：从对象池取出同模型的 Actor，复制源角色的世界变换后加入场景"""
+        scene = self._get_scene(scene_name)
+        source = self._find_actor(scene, source_name)
+        if source is None:
+            raise ValueError(f"Actor '{source_name}' not found")
+        if not source.path:
+            raise ValueError(f"Actor '{source_name}' 没有模型，无法克隆")
+        actor = EngineObjectFactory.acquire_pooled_actor(source.path, lods=source.lod_count > 0)
+        try:
+            actor.set_position(source.get_world_position())
+            actor.set_rotation(source.get_world_rotation())
+            actor.set_scale(source.get_world_scale())
+            self._clone_serial += 1
+            actor.name = f"{os.path.splitext(source.name)[0]}_clone{self._clone_serial}"
+            scene.add_actor(actor)
+        except Exception:
+            EngineObjectFactory.release_pooled_actor(actor)
+            raise
+        self._clones[id(actor)] = (scene_name, source.name)
+        return {"scene": scene_name, "actor": _actor_payload(actor), "source": source.name}
+
+    def is_clone(self, scene_name: str, actor_name: str) -> bool:
+        scene = self._get_scene(scene_name)
+        actor = self._find_actor(scene, actor_name)
+        return actor is not None and id(actor) in self._clones
+
+    def delete_clone(self, scene_name: str, actor_name: str) -> Dict:
+        """删除克隆体：移出场景并把 Actor 还回对象池"""
+        scene = self._get_scene(scene_name)
+        actor = self._find_actor(scene, actor_name)
+        if actor is None or id(actor) not in self._clones:
+            raise ValueError(f"Clone '{actor_name}' not found")
+        scene.remove_actor(actor)
+        del self._clones[id(actor)]
+        EngineObjectFactory.release_pooled_actor(actor)
+        return {"scene": scene_name, "actor": actor_name}
+
+    def clone_stats(self, scene_name: str | None = None) -> Dict:
+        """克隆统计：在用克隆体数量（可按场景过滤）与对象池命中/未命中"""
+        live = sum(1 for owner, _ in self._clones.values() if scene_name is None or owner == scene_name)
+        return {"clones": live, "pool": EngineObjectFactory.actor_pool_stats()}
+
+    def add_instance_batch(self, scene_name: str, asset_path: str, transforms: List[List[float]] | None = None,
+                           batch_name: str | None = None) -> Dict:
+        """创建实例批次（transforms 为 N×10 的 [位置, 四元数 xyzw, 缩放]），重名时自动追加序号"""
+        scene = self._get_scene(scene_name)
+        batch = EngineObjectFactory.create_instance_batch(asset_path, name=batch_name)
+        base, index = batch.name, 2
+        while scene.get_batch(batch.name) is not None:
+            batch.name = f"{base}_{index}"
+            index += 1
+        if transforms:
+            batch.add(transforms)
+        scene.add_batch(batch)
+        logger.info("InstanceBatch %s (%d instances) added to %s", batch.name, batch.count, scene_name)
+        return {"scene": scene_name, "batch": batch.to_dict()}
+
+    def remove_instance_batch(self, scene_name: str, batch_name: str) -> Dict:
+        scene = self._get_scene(scene_name)
+        if not scene.remove_batch(batch_name):
+            raise ValueError(f"InstanceBatch '{batch_name}' not found")
+        logger.info("InstanceBatch %s removed from %s", batch_name, scene_name)
+        return {"scene": scene_name, "batch": batch_name}
+
     def apply_transform(self, scene_name: str, actor_name: str, operation: str, vector: List[float]) -> Dict:
         scene = self._get_scene(scene_name)
         actor = self._find_actor(scene, actor_name)
         if actor is None:
             raise ValueError(f"Actor '{actor_name}' not found")
+        self._apply_operation(actor, operation, vector)
+        logger.debug("Applied %s%s to %s", operation, vector, actor_name)
+        return {"scene": scene_name, "actor": actor_name, "operation": operation, "vector": vector}
+
+    def apply_transforms(self, scene_name: str, operations: List[Tuple[str, str, List[float]]]) -> Dict:
+        """
+        批量变换：operations 为 (actor_name, operation, vector) 列表。
+        同名 Actor 只解析一次，单个条目失败不会中断整批，错误汇总在返回值中。
+        批量写入立即生效，因此先丢弃帧队列中同一 (scene, actor, operation) 的待执行命令，避免下一帧被旧值覆盖。
+        """
+        scene = self._get_scene(scene_name)
+        resolved: Dict[str, Any] = {}
+        applied: List[Dict] = []
+        errors: List[Dict] = []
+        for actor_name, operation, vector in operations:
+            self.frame_queue.discard((scene_name, actor_name, operation))
+            if actor_name not in resolved:
+                resolved[actor_name] = self._find_actor(scene, actor_name)
+            actor = resolved[actor_name]
+            try:
+                if actor is None:
+                    raise ValueError(f"Actor '{actor_name}' not found")
+                self._apply_operation(actor, operation, vector)
+                applied.append({"actor": actor_name, "operation": operation, "vector": vector})
+            except Exception as exc:
+                errors.append({"actor": actor_name, "operation": operation, "message": str(exc)})
+        logger.debug("Applied %d/%d batched transforms in %s", len(applied), len(operations), scene_name)
+        return {"scene": scene_name, "applied": applied, "errors": errors}
+
+    @staticmethod
+    def _apply_operation(actor: Actor, operation: str, vector: List[float]) -> None:
         if operation == "Scale":
             actor.set_scale(vector)
         elif operation == "Move":
@@ -78,13 +253,10 @@ class SceneApplicationService:
             actor.set_rotation(vector)
         else:
             raise ValueError(f"Unsupported operation '{operation}'")
-        logger.debug("Applied %s%s to %s", operation, vector, actor_name)
-        return {"scene": scene_name, "actor": actor_name, "operation": operation, "vector": vector}
 
-    def set_camera(self, scene_name: str, *, position, forward, up, fov: float) -> None:
+    def set_camera(self, scene_name: str, *, position, forward, up, fov: float, camera_name: str | None = None) -> None:
         scene = self._get_scene(scene_name)
-        if hasattr(scene, "set_camera"):
-            scene.set_camera(position, forward, up, fov)
+        scene.set_camera(position, forward, up, fov, camera_name)
         logger.debug("Camera updated in %s", scene_name)
 
     def set_sun(self, scene_name: str, direction: List[float]) -> None:
@@ -92,23 +264,156 @@ class SceneApplicationService:
         scene.set_sun_direction(direction)
         logger.debug("Sun direction set for %s", scene_name)
 
+    # 帧合并：高频 UI 输入先入队，同一 (scene, actor, property) 每帧只写一次引擎
+    def queue_transform(self, scene_name: str, actor_name: str, operation: str, vector: List[float]) -> bool:
+        return self.frame_queue.submit(
+            (scene_name, actor_name, operation),
+            lambda: self.apply_transform(scene_name, actor_name, operation, vector),
+        )
+
+    def queue_sun(self, scene_name: str, direction: List[float]) -> bool:
+        return self.frame_queue.submit(
+            (scene_name, None, "sun_direction"),
+            lambda: self.set_sun(scene_name, direction),
+        )
+
+    def queue_camera(self, scene_name: str, *, position, forward, up, fov: float, camera_name: str | None = None) -> bool:
+        return self.frame_queue.submit(
+            (scene_name, camera_name, "camera"),
+            lambda: self.set_camera(
+                scene_name, position=position, forward=forward, up=up, fov=fov, camera_name=camera_name
+            ),
+        )
+
+    def has_pending_updates(self) -> bool:
+        return self.frame_queue.has_pending()
+
+    def has_active_simulation(self) -> bool:
+        """是否有持续进行的模拟（动态刚体、播放中的动画、接触回调、空间音频声源），需要帧定时器保持运行"""
+        return self.scene_manager.has_active_simulation()
+
+    def flush_frame(self) -> Dict:
+        """执行本帧合并后的命令，返回 {results, errors, stats}"""
+        results, errors = self.frame_queue.flush()
+        now = time.perf_counter()
+        dt = 0.0 if self._last_frame_time is None else min(now - self._last_frame_time, MAX_FRAME_DT)
+        self._last_frame_time = now
+        self.scene_manager.tick(dt)
+        return {
+            "results": [result for _, result in results if result is not None],
+            "errors": [{"key": list(key), "message": str(exc)} for key, exc in errors],
+            "stats": self.frame_queue.stats(),
+        }
+
+    def reset_frame_clock(self) -> None:
+        """帧定时器停止时调用：下一帧从 dt=0 开始，空闲时间不计入动画与物理"""
+        self._last_frame_time = None
+
+    def frame_stats(self) -> Dict:
+        return self.frame_queue.stats()
+
+    def resource_stats(self, scene_name: str) -> Dict:
+        """场景纹理占用（共享纹理只计一次）以及进程级纹理/网格缓存统计"""
+        scene = self._get_scene(scene_name)
+        return {
+            "scene": scene_name,
+            "textures": scene.texture_stats(),
+            "texture_cache": EngineObjectFactory.texture_stats(),
+            "meshes": EngineObjectFactory.mesh_stats(),
+            "spatial_index": scene.spatial_index.stats(),
+            "clones": self.clone_stats(scene_name),
+            "animation": default_animation_clock().stats(),
+            "physics": scene.physics.stats(),
+            "contacts": scene.contacts.stats(),
+            "audio": scene.audio.stats(),
+        }
+
+    def culling_stats(self, scene_name: str) -> Dict:
+        """各视口最近一帧的视锥剔除统计（可见/剔除/总数/耗时）"""
+        scene = self._get_scene(scene_name)
+        payload = {"scene": scene_name}
+        payload.update(scene.culling_stats())
+        return payload
+
+    def set_culling(self, scene_name: str, hide_culled: bool, viewport_name: str | None = None) -> Dict:
+        """开关视口的引擎侧剔除（未指定视口时作用于场景全部视口），立即重算一次可见性"""
+        scene = self._get_scene(scene_name)
+        viewports = scene.get_viewports()
+        if viewport_name:
+            viewports = [vp for vp in viewports if getattr(vp, "name", None) == viewport_name]
+            if not viewports:
+                raise ValueError(f"Viewport '{viewport_name}' not found in scene '{scene_name}'")
+        for viewport in viewports:
+            viewport.hide_culled = bool(hide_culled)
+        scene.update_visibility()
+        return self.culling_stats(scene_name)
+
+    # 空间查询（基于场景空间索引，距离为世界包围盒中心距离）
+    def _query_origin(self, scene, actor_name: str | None, position: List[float] | None):
+        if actor_name:
+            actor = self._find_actor(scene, actor_name)
+            if actor is None:
+                raise ValueError(f"Actor '{actor_name}' not found")
+            return actor
+        if position is None:
+            raise ValueError("需要提供 actor_name 或 position")
+        return list(position)
+
+    def nearest_actors(self, scene_name: str, *, actor_name: str | None = None,
+                       position: List[float] | None = None, k: int = 1) -> List[Dict[str, Any]]:
+        scene = self._get_scene(scene_name)
+        origin = self._query_origin(scene, actor_name, position)
+        return [{"name": actor.name, "distance": distance} for actor, distance in scene.query_nearest(origin, k)]
+
+    def actors_in_range(self, scene_name: str, radius: float, *, actor_name: str | None = None,
+                        position: List[float] | None = None) -> List[Dict[str, Any]]:
+        scene = self._get_scene(scene_name)
+        origin = self._query_origin(scene, actor_name, position)
+        return [{"name": actor.name, "distance": distance} for actor, distance in scene.query_radius(origin, radius)]
+
+    def actors_in_view(self, scene_name: str, camera_name: str | None = None) -> List[str]:
+        scene = self._get_scene(scene_name)
+        return [actor.name for actor in scene.query_frustum(scene.get_camera(camera_name))]
+
+    def actor_distance(self, scene_name: str, actor_name: str, target: str | List[float]) -> float:
+        scene = self._get_scene(scene_name)
+        origin = self._query_origin(scene, actor_name, None)
+        if isinstance(target, str):
+            target = self._query_origin(scene, target, None)
+        return scene.distance_between(origin, target)
+
+    # 接触（场景接触缓存每帧更新一次，查询为 O(1)）
+    def actor_touching(self, scene_name: str, actor_name: str, target: str) -> bool:
+        scene = self._get_scene(scene_name)
+        actor = self._query_origin(scene, actor_name, None)
+        return scene.touching(actor, self._query_origin(scene, target, None))
+
+    def actor_contacts(self, scene_name: str, actor_name: str) -> List[str]:
+        scene = self._get_scene(scene_name)
+        actor = self._query_origin(scene, actor_name, None)
+        return [other.name for other in scene.contacts.contacts_of(actor)]
+
+    def on_contact(self, scene_name: str, actor_name: str, event: str, callback,
+                   target: str | None = None) -> None:
+        """注册接触事件回调 callback(other_name)；event 为 enter/stay/exit，target 为空时对任意角色生效"""
+        scene = self._get_scene(scene_name)
+        actor = self._query_origin(scene, actor_name, None)
+        other = self._query_origin(scene, target, None) if target else None
+        scene.contacts.on(actor, event, lambda _event, _actor, hit: callback(hit.name), other)
+        self._request_frame()
+
+    def clear_contact_handlers(self, scene_name: str, actor_name: str) -> int:
+        scene = self._get_scene(scene_name)
+        return scene.contacts.off(self._query_origin(scene, actor_name, None))
+
     def _find_actor(self, scene, actor_name: str | None):
         if not actor_name:
             return None
-        actor = scene.get_actor(actor_name)
-        if actor:
-            return actor
-        normalized = self._normalize_actor_name(actor_name)
-        for candidate in scene.get_actors():
-            if self._normalize_actor_name(candidate.name) == normalized:
-                return candidate
-        return None
+        return scene.find_actor(actor_name)
 
     @staticmethod
     def _normalize_actor_name(name: str) -> str:
-        value = name.strip().strip('"').strip("'")
-        base = os.path.splitext(value.lower())[0]
-        return base
+        return normalize_actor_name(name)
 
     def export_scene(self, scene_name: str) -> str:
         scene = self._get_scene(scene_name)
@@ -41,8 +41,9 @@ class RenderWidget(QWidget):
             self.viewport = Viewport(self.width(), self.height())
             self.viewport.set_camera(self.camera)
 
-            # 通过 Scene 包装器添加视口
+            # 通过 Scene 包装器添加视口；相机归属场景，camera_move 按名称路由到它
             self.scene.add_viewport(self.viewport)
+            self.scene.add_camera(self.camera)
         except Exception as e:
             print(f"[RenderWidget] Failed to create or setup camera/viewport: {e}")
             self.camera = None
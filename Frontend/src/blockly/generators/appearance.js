@@ -12,15 +12,15 @@ export const defineAppearanceGenerators = () => {
   };
 
   pythonGenerator.forBlock['appearance_playCartoon'] = function (block) {
-    return `CoronaEngine.playCartoon()\n`;
+    return `Runtime.playCartoon()\n`;
   };
 
   pythonGenerator.forBlock['appearance_stopCartoon'] = function (block) {
-    return `CoronaEngine.stopCartoon()\n`;
+    return `Runtime.stopCartoon()\n`;
   };
 
   pythonGenerator.forBlock['appearance_resetCartoon'] = function (block) {
-    return `CoronaEngine.resetCartoon()\n`;
+    return `Runtime.resetCartoon()\n`;
   };
 
   pythonGenerator.forBlock['appearance_sizeAdd'] = function (block) {
@@ -68,17 +68,24 @@ export const defineControlGenerators = () => {
         return `CoronaEngine.stop("${stopOption}")\n`;
     };
 
-    pythonGenerator.forBlock['control_cloneStart'] = function () {
-        return `CoronaEngine.cloneStart()\n`;
+    // 帽子块：下方积木只在克隆体上执行。生成守卫并把后续积木缩进到其中（workspaceToCode 以 thisOnly 调用，
+    // 不会再追加一遍后续积木），再由 workspaceToCode 包装为以克隆体运行时为参数的函数，经 Runtime.onCloneStart 注册
+    pythonGenerator.forBlock['control_cloneStart'] = function (block) {
+        const next = block.getNextBlock();
+        let branch = next ? pythonGenerator.blockToCode(next) : '';
+        if (Array.isArray(branch)) branch = branch[0];
+        branch = branch ? pythonGenerator.prefixLines(branch, pythonGenerator.INDENT) : pythonGenerator.INDENT + 'pass\n';
+        return `if Runtime.cloneStart():\n` + branch;
     };
 
     pythonGenerator.forBlock['control_clone'] = function (block) {
         const x = block.getFieldValue('x');
-        return `CoronaEngine.clone(${x})\n`;
+        // 目标角色名作为字符串传入，克隆体由后端对象池分配
+        return `Runtime.clone(${JSON.stringify(x)})\n`;
     };
 
     pythonGenerator.forBlock['control_cloneDEL'] = function () {
-        return `CoronaEngine.deleteClone()\n`;
+        return `Runtime.deleteClone()\n`;
     };
 
     pythonGenerator.forBlock['control_senceSet'] = function (block) {
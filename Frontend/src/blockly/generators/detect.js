@@ -1,14 +1,16 @@
-import { pythonGenerator } from "blockly/python";
+import { pythonGenerator, Order } from "blockly/python";
 
 export const defineDetectGenerators = () => {
   pythonGenerator.forBlock['detect_touch'] = function (block) {
     const x = block.getFieldValue('x');
-    return `CoronaEngine.touch(${x})`;
+    // 布尔表达式积木：目标角色名作为字符串传入
+    return [`Runtime.touch(${JSON.stringify(x)})`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_distance'] = function (block) {
     const x = block.getFieldValue('x');
-    return `CoronaEngine.distance(${x})\n`;
+    // 表达式积木：返回 [代码, 优先级]，目标角色名作为字符串传入
+    return [`Runtime.distance(${JSON.stringify(x)})`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_ask'] = function (block) {
@@ -51,13 +51,22 @@ pythonGenerator.workspaceToCode = function customWorkspaceToCode(workspace) {
     return aXY.y - bXY.y || aXY.x - bXY.x
   })
 
-  // 将按键相关的顶层积木输出到 handler，其余输出到 run
+  // 将按键相关的顶层积木输出到 handler，克隆体帽子块输出为克隆启动函数，其余输出到 run
   const KEYBOARD_BLOCK_TYPES = new Set(['event_keyboard', 'event_keyboard_combo'])
+  const CLONE_START_BLOCK_TYPES = new Set(['control_cloneStart'])
   let mainCode = ''
   let handlerCode = ''
+  const cloneStartDefs = []
 
   for (const block of topBlocks) {
     if (block.disabled) continue
+    if (CLONE_START_BLOCK_TYPES.has(block.type)) {
+      // 帽子块自行生成后续积木，只取本块；函数参数 Runtime 为克隆体的运行时，遮蔽模块级的 Runtime
+      const body = indentBlock(normalizeCode(pythonGenerator.blockToCode(block, true)))
+      const fn = `clone_start_${cloneStartDefs.length + 1}`
+      cloneStartDefs.push(`def ${fn}(Runtime):\n${body}\n\nRuntime.onCloneStart(${fn})`)
+      continue
+    }
     let blockCode = pythonGenerator.blockToCode(block)
     let chunk = normalizeCode(blockCode)
     if (chunk && !chunk.endsWith('\n')) chunk += '\n'
@@ -73,13 +82,17 @@ pythonGenerator.workspaceToCode = function customWorkspaceToCode(workspace) {
   if (mainCode && !mainCode.endsWith('\n')) mainCode += '\n'
   // handlerCode 不需要再次 finish，保持原样
 
-  // 头注释（规范结尾仅 1 个换行）
+  // 头注释（规范结尾仅 1 个换行）；CoronaEngine 为引擎模块，Runtime 为以脚本所属场景/角色为主体的运行时
+  // （动画/克隆/侦测积木使用），场景/角色由调用方通过 scriptContext 指定
+  const context = pythonGenerator.scriptContext || {}
   const timestamp = new Date().toISOString()
   const header = [
     '# -*- coding: utf-8 -*-',
     `# Generated from Blockly by CabbageEditor @ ${timestamp}`,
-    'from Backend.infrastructure.engine.engine_import import load_corona_engine',
-    'CoronaEngine = load_corona_engine()'
+    'from Backend.engine_core.engine_import import load_corona_engine',
+    'from Backend.utils.blockly_runtime import BlocklyRuntime',
+    'CoronaEngine = load_corona_engine()',
+    `Runtime = BlocklyRuntime(${JSON.stringify(context.sceneName || '')}, ${JSON.stringify(context.actorName || '')})`
   ].join('\n')
 
   // 各位置前置片段（已去除尾部多余换行；此处不再额外添加空行）
@@ -92,6 +105,12 @@ pythonGenerator.workspaceToCode = function customWorkspaceToCode(workspace) {
   parts.push(header)
   if (preludeGlobal) parts.push(preludeGlobal.trimEnd())
 
+  // 克隆启动函数（Runtime.clone 创建克隆体后以克隆体的运行时调用）
+  for (const def of cloneStartDefs) {
+    parts.push('')
+    parts.push(def)
+  }
+
   // 如果有 handler 代码，则输出 def handle
   if (handlerCode.trim()) {
     parts.push('') // 空行分隔